@@ -9,7 +9,8 @@ from pathlib import Path
 import logging
 
 from ..database import get_db
-from ..models import Contact, User, Tag, Group, AuditLog
+from ..models import User, Tag, Group, AuditLog
+from ..models.contact import contact_tags, contact_groups
 from .. import schemas
 from ..core import auth as auth_utils
 
@@ -54,77 +55,11 @@ def get_statistics_overview(
 ):
     """
     Get overall statistics and analytics.
-    Uses ContactRepository and UserRepository for counts
+    Served from StatisticsRepository: one aggregate scan of contacts,
+    cached until contacts change.
     """
-    from ..repositories import ContactRepository, UserRepository
-    contact_repo = ContactRepository(db)
-    user_repo = UserRepository(db)
-    
-    # Total counts - using repositories
-    total_contacts = contact_repo.count()
-    total_users = user_repo.count()
-    
-    # Tags and Groups - keeping direct queries for now (no repositories yet)
-    total_tags = db.query(Tag).count()
-    total_groups = db.query(Group).count()
-    
-    # Contacts with contact info - keeping direct queries for complex filters
-    with_email = db.query(Contact).filter(Contact.email.isnot(None), Contact.email != '').count()
-    with_phone = db.query(Contact).filter(Contact.phone.isnot(None), Contact.phone != '').count()
-    with_photo = db.query(Contact).filter(Contact.photo_path.isnot(None), Contact.photo_path != '').count()
-    
-    # Top companies (limit 10)
-    top_companies = db.query(
-        Contact.company,
-        func.count(Contact.id).label('count')
-    ).filter(
-        Contact.company.isnot(None),
-        Contact.company != ''
-    ).group_by(Contact.company).order_by(func.count(Contact.id).desc()).limit(10).all()
-    
-    # Top positions (limit 10)
-    top_positions = db.query(
-        Contact.position,
-        func.count(Contact.id).label('count')
-    ).filter(
-        Contact.position.isnot(None),
-        Contact.position != ''
-    ).group_by(Contact.position).order_by(func.count(Contact.id).desc()).limit(10).all()
-    
-    # Contacts by month (last 12 months)
-    # Use database-agnostic approach
-    if 'sqlite' in str(db.bind.url):
-        # SQLite: use strftime
-        contacts_by_month = db.query(
-            func.strftime('%Y-%m', Contact.created_at).label('month'),
-            func.count(Contact.id).label('count')
-        ).group_by('month').order_by('month').limit(12).all()
-    else:
-        # PostgreSQL: use to_char
-        contacts_by_month = db.query(
-            func.to_char(Contact.created_at, 'YYYY-MM').label('month'),
-            func.count(Contact.id).label('count')
-        ).group_by('month').order_by('month').limit(12).all()
-    
-    return {
-        "totals": {
-            "contacts": total_contacts,
-            "tags": total_tags,
-            "groups": total_groups,
-            "users": total_users,
-        },
-        "completeness": {
-            "with_email": with_email,
-            "with_phone": with_phone,
-            "with_photo": with_photo,
-            "email_percentage": round((with_email / total_contacts * 100) if total_contacts > 0 else 0, 1),
-            "phone_percentage": round((with_phone / total_contacts * 100) if total_contacts > 0 else 0, 1),
-            "photo_percentage": round((with_photo / total_contacts * 100) if total_contacts > 0 else 0, 1),
-        },
-        "top_companies": [{"name": comp, "count": count} for comp, count in top_companies],
-        "top_positions": [{"name": pos, "count": count} for pos, count in top_positions],
-        "contacts_by_month": [{"month": month, "count": count} for month, count in contacts_by_month],
-    }
+    from ..repositories import StatisticsRepository
+    return StatisticsRepository(db).overview()
 
 
 @router.get('/statistics/tags')
@@ -133,15 +68,16 @@ def get_tag_statistics(
     current_user: User = Depends(auth_utils.get_current_active_user)
 ):
     """Get statistics about tags usage."""
-    # Tag usage counts
+    # Tag usage counts (from the association table, contacts are not joined)
+    contact_count = func.count(contact_tags.c.contact_id)
     tags_with_counts = db.query(
         Tag.id,
         Tag.name,
         Tag.color,
-        func.count(Contact.id).label('contact_count')
-    ).outerjoin(Tag.contacts).group_by(Tag.id, Tag.name, Tag.color).order_by(
-        func.count(Contact.id).desc()
-    ).all()
+        contact_count.label('contact_count')
+    ).outerjoin(contact_tags, contact_tags.c.tag_id == Tag.id).group_by(
+        Tag.id, Tag.name, Tag.color
+    ).order_by(contact_count.desc()).all()
     
     return {
         "tags": [
@@ -164,15 +100,16 @@ def get_group_statistics(
     current_user: User = Depends(auth_utils.get_current_active_user)
 ):
     """Get statistics about groups usage."""
-    # Group usage counts
+    # Group usage counts (from the association table, contacts are not joined)
+    contact_count = func.count(contact_groups.c.contact_id)
     groups_with_counts = db.query(
         Group.id,
         Group.name,
         Group.description,
-        func.count(Contact.id).label('contact_count')
-    ).outerjoin(Group.contacts).group_by(Group.id, Group.name, Group.description).order_by(
-        func.count(Contact.id).desc()
-    ).all()
+        contact_count.label('contact_count')
+    ).outerjoin(contact_groups, contact_groups.c.group_id == Group.id).group_by(
+        Group.id, Group.name, Group.description
+    ).order_by(contact_count.desc()).all()
     
     return {
         "groups": [
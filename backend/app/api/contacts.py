@@ -2,6 +2,7 @@
 Contacts API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict
 from datetime import datetime
@@ -15,8 +16,11 @@ from ..core.utils import get_setting
 from .. import schemas
 from ..core import auth as auth_utils
 from ..core.phone import format_phone_number
-from ..core.utils import create_audit_log, get_system_setting
+from ..core.utils import get_system_setting
 from ..services.contact_service import ContactService
+from ..services.duplicate_service import DuplicateService
+from ..repositories.pagination import InvalidCursorError
+from ..repositories.contact_merge import ContactMerger, InvalidMergeError, MergeContactsNotFoundError
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -24,14 +28,6 @@ logger = logging.getLogger(__name__)
 # Router
 router = APIRouter()
 
-# Prometheus metrics
-from ..core.metrics import (
-    contacts_created_counter,
-    contacts_updated_counter,
-    contacts_deleted_counter,
-    contacts_total
-)
-
 
 @router.get('/', response_model=schemas.PaginatedContactsResponse)
 def list_contacts(
@@ -40,26 +36,38 @@ def list_contacts(
     position: str = Query(None, description="Filter by position"),
     tags: str = Query(None, description="Filter by tag names (comma-separated)"),
     groups: str = Query(None, description="Filter by group names (comma-separated)"),
-    sort_by: str = Query('id', description="Sort field: id, full_name, company, position"),
+    sort_by: str = Query('id', description="Sort field: id, full_name, company, position, relevance (with q)"),
     sort_order: str = Query('desc', description="Sort order: asc, desc"),
     page: int = Query(1, ge=1, description="Page number (starts from 1)"),
     limit: int = Query(20, ge=1, le=100, description="Items per page (1-100)"),
+    pagination: str = Query('offset', pattern='^(offset|cursor)$', description="Pagination mode: offset, cursor"),
+    cursor: str = Query(None, description="next_cursor of the previous page (cursor mode)"),
+    exact_total: bool = Query(False, description="Cursor mode: exact total instead of an estimate"),
     db: Session = Depends(get_db),
     current_user: User = Depends(auth_utils.get_current_active_user)
 ):
     """
     Get paginated list of contacts with advanced search and filtering.
     
+    ``pagination=cursor`` (or passing ``cursor``) switches to keyset
+    pagination: follow ``next_cursor`` until it is null; ``page``/``pages``
+    are not returned and ``total`` is an estimate unless ``exact_total``.
+    
     All business logic is delegated to ContactService.
     Роутер только валидирует параметры и вызывает сервис.
     """
     service = ContactService(db)
-    return service.list_contacts(
-        q=q, company=company, position=position,
-        tags=tags, groups=groups,
-        sort_by=sort_by, sort_order=sort_order,
-        page=page, limit=limit
-    )
+    try:
+        return service.list_contacts(
+            q=q, company=company, position=position,
+            tags=tags, groups=groups,
+            sort_by=sort_by, sort_order=sort_order,
+            page=page, limit=limit,
+            cursor=cursor, use_cursor=(pagination == 'cursor'),
+            exact_total=exact_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get('/search/')
@@ -71,29 +79,41 @@ def search_contacts(
 ):
     """
     Fast global search for SearchOverlay (Ctrl+K).
-    Searches across names, company, position, email, phone.
+    Searches across names, company, position, email, phone, website, address
+    using the contact search index; best matches first.
     Returns minimal data for quick results.
     """
-    search_term = f"%{q}%"
+    service = ContactService(db)
+    return service.search_contacts(q, limit=limit)
+
+
+@router.get('/duplicates')
+def find_duplicates(
+    threshold: Optional[float] = Query(None, ge=0, le=1, description="Minimum score (default: duplicate_similarity_threshold setting)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of pairs to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_utils.get_current_active_user)
+):
+    """
+    Sweep all contacts for likely duplicate pairs (blocking keys + MinHash/LSH).
+    
+    The sweep reads the whole table, so it runs in the background; returns a
+    task ID whose result holds the pairs, best first.
+    """
+    from ..tasks import find_duplicate_pairs
     
-    # Search with relevance ranking
-    contacts = db.query(Contact).filter(
-        (Contact.full_name.ilike(search_term)) |
-        (Contact.company.ilike(search_term)) |
-        (Contact.position.ilike(search_term)) |
-        (Contact.email.ilike(search_term)) |
-        (Contact.phone.ilike(search_term))
-    ).limit(limit).all()
+    if not DuplicateService(db).enabled:
+        return {'enabled': False, 'total': 0, 'pairs': []}
     
-    # Return simplified data
-    return [{
-        'id': c.id,
-        'full_name': c.full_name,
-        'company': c.company,
-        'position': c.position,
-        'email': c.email,
-        'phone': c.phone
-    } for c in contacts]
+    task = find_duplicate_pairs.delay(threshold=threshold, limit=limit)
+    logger.info(f"Duplicate sweep queued: {task.id} by user {current_user.username}")
+    
+    return {
+        "enabled": True,
+        "task_id": task.id,
+        "status": "queued",
+        "message": "Duplicate search started. Use /ocr/batch-status/{task_id} to get the pairs."
+    }
 
 
 @router.get('/{contact_id}')
@@ -103,13 +123,13 @@ def get_contact_by_id(
     current_user: User = Depends(auth_utils.get_current_active_user)
 ):
     """
-    Get a single contact by ID.
+    Get a single contact by ID (including the OCR payload, for the editor).
     Requires valid JWT token.
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    contact = db.query(Contact).options(joinedload(Contact.ocr_result)).filter(Contact.id == contact_id).first()
     if not contact:
         raise HTTPException(status_code=404, detail='Contact not found')
-    return contact
+    return _with_ocr_raw(contact)
 
 
 @router.get('/uid/{uid}')
@@ -119,13 +139,20 @@ def get_contact_by_uid(
     current_user: User = Depends(auth_utils.get_current_active_user)
 ):
     """
-    Get a single contact by UID.
+    Get a single contact by UID (including the OCR payload).
     Requires valid JWT token.
     """
-    contact = db.query(Contact).filter(Contact.uid == uid).first()
+    contact = db.query(Contact).options(joinedload(Contact.ocr_result)).filter(Contact.uid == uid).first()
     if not contact:
         raise HTTPException(status_code=404, detail='Contact not found')
-    return contact
+    return _with_ocr_raw(contact)
+
+
+def _with_ocr_raw(contact: Contact) -> dict:
+    """Contact columns plus ocr_raw (a property backed by contact_ocr_results)"""
+    data = jsonable_encoder(contact, exclude={'ocr_result'})
+    data['ocr_raw'] = contact.ocr_raw
+    return data
 
 
 @router.post('/')
@@ -206,6 +233,25 @@ def get_contact_history(
     return logs
 
 
+@router.get('/{contact_id}/duplicates')
+def find_contact_duplicates(
+    contact_id: int,
+    threshold: Optional[float] = Query(None, ge=0, le=1, description="Minimum score (default: duplicate_similarity_threshold setting)"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of matches to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_utils.get_current_active_user)
+):
+    """Find contacts that are likely duplicates of one contact, best first."""
+    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    if not contact:
+        raise HTTPException(status_code=404, detail='Contact not found')
+    
+    service = DuplicateService(db)
+    if not service.enabled:
+        return []
+    return service.find_duplicates_for(contact, threshold=threshold, limit=limit)
+
+
 @router.get('/{contact_id}/ocr-blocks')
 def get_contact_ocr_blocks(
     contact_id: int,
@@ -218,7 +264,7 @@ def get_contact_ocr_blocks(
     """
     from ..integrations.ocr import tesseract_boxes
     
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    contact = db.query(Contact).options(joinedload(Contact.ocr_result)).filter(Contact.id == contact_id).first()
     if not contact:
         raise HTTPException(status_code=404, detail='Contact not found')
     
@@ -666,21 +712,31 @@ def rerun_contact_ocr(
         
         # Import OCR managers
         from ..integrations.ocr.providers import OCRManager
-        from ..integrations.ocr.providers_v2 import OCRManagerV2
+        from ..integrations.ocr.inference_client import get_ocr_manager_v2
         from ..services.validator_service import ValidatorService
-        from ..integrations.ocr.image_utils import downscale_image_bytes
+        from ..core.card_image import CardImage
+        from ..integrations.ocr import result_cache
         from ..core.utils import get_setting
         
         # Check OCR version setting
         ocr_version = get_setting(db, "ocr_version", "v2.0")
         
         # Prepare image (increased limit for high-res business cards)
-        ocr_input = downscale_image_bytes(image_bytes, max_side=6000)
+        image = CardImage.from_bytes(image_bytes)
+        ocr_input = image.downscale(max_side=6000)
+        
+        # Same image + same settings/model as a previous run: reuse its result
+        cache_key, cached = result_cache.lookup(image, None, ocr_version)
         
         # Run OCR based on version
-        if ocr_version == "v2.0":
+        if cached and cached.get('ocr_result'):
+            logger.info("✅ Reusing cached OCR result (image and pipeline unchanged)")
+            ocr_result = cached['ocr_result']
+            if ocr_version == "v2.0":
+                ocr_result = ValidatorService(db).validate_ocr_result(ocr_result, auto_correct=True) or ocr_result
+        elif ocr_version == "v2.0":
             logger.info("🚀 Using OCR v2.0 (PaddleOCR + LayoutLMv3)...")
-            ocr_manager_v2 = OCRManagerV2(enable_layoutlm=True)
+            ocr_manager_v2 = get_ocr_manager_v2()
             
             try:
                 ocr_result = ocr_manager_v2.recognize(
@@ -690,6 +746,7 @@ def rerun_contact_ocr(
                     filename=contact.photo_path
                 )
                 logger.info(f"✅ OCR v2.0 successful")
+                result_cache.store(cache_key, ocr_result=ocr_result)
                 
                 # Validate and auto-correct
                 validator = ValidatorService(db)
@@ -704,7 +761,7 @@ def rerun_contact_ocr(
                 logger.warning(f"⚠️ OCR v2.0 failed: {v2_error}, falling back to v1.0...")
                 ocr_manager_v1 = OCRManager()
                 ocr_result = ocr_manager_v1.recognize(
-                    ocr_input,
+                    ocr_input.encode(),
                     filename=contact.photo_path,
                     preferred_provider=None
                 )
@@ -713,10 +770,11 @@ def rerun_contact_ocr(
             logger.info("🔧 Using OCR v1.0 (Tesseract)...")
             ocr_manager_v1 = OCRManager()
             ocr_result = ocr_manager_v1.recognize(
-                ocr_input,
+                ocr_input.encode(),
                 filename=contact.photo_path,
                 preferred_provider=None
             )
+            result_cache.store(cache_key, ocr_result=ocr_result)
         
         # Extract data
         data = ocr_result.get('data', {})
@@ -799,6 +857,10 @@ def merge_contacts(
     """
     Merge multiple contacts into one master contact.
     
+    Empty master fields are filled from the slaves, their tags, groups,
+    history and OCR corrections move to the master, and the slaves are
+    deleted (see repositories/contact_merge.py).
+    
     Request body:
     {
         "master_id": int,  # ID контакта-мастера (основного)
@@ -814,134 +876,58 @@ def merge_contacts(
     if not master_id or not slave_ids:
         raise HTTPException(status_code=400, detail='master_id and slave_ids are required')
     
-    # CRITICAL VALIDATION: Master ID must NOT be in slave_ids!
-    if master_id in slave_ids:
-        logger.error(f"CRITICAL ERROR: master_id={master_id} is in slave_ids! This would delete the master contact!")
-        raise HTTPException(
-            status_code=400, 
-            detail=f'Master contact (ID: {master_id}) cannot be in the list of contacts to delete! This is a critical error.'
-        )
+    merged = _run_merge(db, current_user, [(master_id, slave_ids)])
+    logger.info(f"Merged contacts {slave_ids} into {master_id}")
+    
+    return {
+        'success': True,
+        'master_id': master_id,
+        'merged_count': merged,
+        'message': f'Successfully merged {merged} contacts into master contact'
+    }
+
+
+@router.post('/merge/batch')
+def merge_contacts_batch(
+    payload: Dict = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_utils.get_current_active_user)
+):
+    """
+    Merge many groups of contacts (e.g. pairs from /contacts/duplicates).
     
-    # Get master contact
-    master = db.query(Contact).filter(Contact.id == master_id).first()
-    if not master:
-        raise HTTPException(status_code=404, detail='Master contact not found')
+    Groups are merged in batches, one transaction per batch; a contact may
+    appear in only one group.
     
-    # Get slave contacts
-    slaves = db.query(Contact).filter(Contact.id.in_(slave_ids)).all()
-    if len(slaves) != len(slave_ids):
-        raise HTTPException(status_code=404, detail='Some slave contacts not found')
+    Request body:
+    {
+        "groups": [{"master_id": int, "slave_ids": [int, ...]}, ...]
+    }
+    """
+    groups = payload.get('groups') or []
+    if not groups or any(not g.get('master_id') or not g.get('slave_ids') for g in groups):
+        raise HTTPException(status_code=400, detail='groups with master_id and slave_ids are required')
+    
+    merged = _run_merge(db, current_user, [(g['master_id'], g['slave_ids']) for g in groups])
     
+    return {
+        'success': True,
+        'merged_groups': len(groups),
+        'merged_count': merged,
+        'message': f'Successfully merged {merged} contacts into {len(groups)} master contacts'
+    }
+
+
+def _run_merge(db: Session, user: User, groups) -> int:
+    """Run ContactMerger, mapping its errors to HTTP errors"""
     try:
-        # Merge data from slaves to master - ALL fields
-        for slave in slaves:
-            # Merge fields if master field is empty
-            # Name fields
-            if not master.full_name and slave.full_name:
-                master.full_name = slave.full_name
-            if not master.first_name and slave.first_name:
-                master.first_name = slave.first_name
-            if not master.last_name and slave.last_name:
-                master.last_name = slave.last_name
-            if not master.middle_name and slave.middle_name:
-                master.middle_name = slave.middle_name
-            
-            # Company fields
-            if not master.company and slave.company:
-                master.company = slave.company
-            if not master.position and slave.position:
-                master.position = slave.position
-            if not master.department and slave.department:
-                master.department = slave.department
-            
-            # Contact fields
-            if not master.email and slave.email:
-                master.email = slave.email
-            if not master.phone and slave.phone:
-                master.phone = slave.phone
-            if not master.phone_mobile and slave.phone_mobile:
-                master.phone_mobile = slave.phone_mobile
-            if not master.phone_work and slave.phone_work:
-                master.phone_work = slave.phone_work
-            if not master.phone_additional and slave.phone_additional:
-                master.phone_additional = slave.phone_additional
-            if not master.fax and slave.fax:
-                master.fax = slave.fax
-            
-            # Address fields
-            if not master.address and slave.address:
-                master.address = slave.address
-            if not master.address_additional and slave.address_additional:
-                master.address_additional = slave.address_additional
-            
-            # Other fields
-            if not master.website and slave.website:
-                master.website = slave.website
-            if not master.birthday and slave.birthday:
-                master.birthday = slave.birthday
-            if not master.source and slave.source:
-                master.source = slave.source
-            if not master.status and slave.status:
-                master.status = slave.status
-            if not master.priority and slave.priority:
-                master.priority = slave.priority
-            if not master.comment and slave.comment:
-                master.comment = slave.comment
-            if not master.qr_data and slave.qr_data:
-                master.qr_data = slave.qr_data
-                master.has_qr_code = slave.has_qr_code
-            
-            # Merge tags (add unique tags from slaves)
-            if slave.tags:
-                master_tag_names = {tag.name for tag in master.tags}
-                for tag in slave.tags:
-                    if tag.name not in master_tag_names:
-                        master.tags.append(tag)
-            
-            # Merge groups (add unique groups from slaves)
-            if slave.groups:
-                master_group_names = {group.name for group in master.groups}
-                for group in slave.groups:
-                    if group.name not in master_group_names:
-                        master.groups.append(group)
-            
-            # Use photo from slave if master has none
-            if not master.photo_path and slave.photo_path:
-                master.photo_path = slave.photo_path
-                master.thumbnail_path = slave.thumbnail_path
-        
-        # Delete slave contacts
-        for slave in slaves:
-            db.delete(slave)
-        
-        # Commit changes
-        db.commit()
-        db.refresh(master)
-        
-        # Update contact counter
-        contacts_deleted_counter.inc(len(slave_ids))
-        
-        # Log the merge
-        create_audit_log(
-            db,
-            contact_id=master_id,
-            user=current_user,
-            action='merge_contacts',
-            entity_type='contact',
-            changes={'merged_contacts': slave_ids, 'master_id': master_id}
-        )
-        
-        logger.info(f"Merged contacts {slave_ids} into {master_id}")
-        
-        return {
-            'success': True,
-            'master_id': master_id,
-            'merged_count': len(slave_ids),
-            'message': f'Successfully merged {len(slave_ids)} contacts into master contact'
-        }
-        
+        return ContactMerger(db, user=user).merge_groups(groups)
+    except InvalidMergeError as e:
+        logger.error(f"Invalid merge request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except MergeContactsNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
         logger.error(f"Error merging contacts: {e}")
         raise HTTPException(status_code=500, detail=f'Failed to merge contacts: {str(e)}')
 
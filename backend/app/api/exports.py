@@ -4,10 +4,11 @@ Export and Import API endpoints
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Body
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional
 import io
 import csv
-import pandas as pd
+import shutil
+import tempfile
 import uuid
 import os
 import logging
@@ -21,45 +22,96 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+# Columns written by the CSV/XLSX exports (in this order)
+EXPORT_FIELDS = ['id', 'uid', 'full_name', 'company', 'position', 'email', 'phone', 'address', 'comment', 'website', 'photo_path']
+
+# Rows fetched per round trip (server-side cursor on PostgreSQL)
+EXPORT_BATCH_SIZE = 1000
+
+# Bytes per chunk sent to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+XLSX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    if not ids:
+        return None
+    return [int(x) for x in ids.split(',') if x.strip().isdigit()] or None
+
+
+def _iter_export_rows(bind, id_list: Optional[List[int]] = None) -> Iterator[tuple]:
+    """
+    Yield contact rows (EXPORT_FIELDS tuples) in id order, batch by batch.
+
+    Plain column tuples rather than ORM objects, so nothing accumulates in
+    the identity map. Opens its own session on ``bind``: the request's
+    session is closed before a StreamingResponse body is sent.
+    """
+    db = Session(bind=bind)
+    try:
+        q = db.query(*[getattr(Contact, field) for field in EXPORT_FIELDS])
+        if id_list:
+            q = q.filter(Contact.id.in_(id_list))
+        q = q.order_by(Contact.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        for row in q:
+            yield tuple(row)
+    finally:
+        db.close()
+
+
+def _iter_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    """Encode rows as CSV, yielding ~STREAM_CHUNK_SIZE chunks (header first)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for row in rows:
+        writer.writerow(['' if value is None else value for value in row])
+        if buffer.tell() >= STREAM_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _iter_xlsx(rows: Iterable[tuple], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Build the workbook with openpyxl's write-only mode (rows go straight to
+    a temp file) and stream the finished file.
+
+    XLSX is a zip whose directory is written last, so the body can only
+    start once every row has been written; memory stays constant.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(EXPORT_FIELDS)
+    for row in rows:
+        sheet.append(list(row))
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as output:
+        workbook.save(output)
+        output.seek(0)
+        while chunk := output.read(chunk_size):
+            yield chunk
+
+
 @router.get('/contacts/export')
 def export_csv(
     ids: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Export contacts to CSV"""
-    q = db.query(Contact)
-    if ids:
-        try:
-            id_list = [int(x) for x in ids.split(',') if x.strip().isdigit()]
-            if id_list:
-                q = q.filter(Contact.id.in_(id_list))
-        except Exception:
-            pass
-    
-    contacts = q.all()
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['id', 'uid', 'full_name', 'company', 'position', 'email', 'phone', 'address', 'comment', 'website', 'photo_path'])
-    
-    for c in contacts:
-        writer.writerow([
-            c.id,
-            c.uid or '',
-            c.full_name or '',
-            c.company or '',
-            c.position or '',
-            c.email or '',
-            c.phone or '',
-            c.address or '',
-            c.comment or '',
-            c.website or '',
-            c.photo_path or ''
-        ])
-    
-    output.seek(0)
+    """Export contacts to CSV (streamed)"""
     return StreamingResponse(
-        output,
+        _iter_csv(_iter_export_rows(db.get_bind(), _parse_ids(ids))),
         media_type='text/csv',
         headers={'Content-Disposition': 'attachment; filename=contacts.csv'}
     )
@@ -72,38 +124,10 @@ def export_xlsx(
     current_user: User = Depends(get_current_active_user)
 ):
     """Export contacts to Excel (XLSX)"""
-    q = db.query(Contact)
-    if ids:
-        try:
-            id_list = [int(x) for x in ids.split(',') if x.strip().isdigit()]
-            if id_list:
-                q = q.filter(Contact.id.in_(id_list))
-        except Exception:
-            pass
-    
-    contacts = q.all()
-    df = pd.DataFrame([{
-        'id': c.id,
-        'uid': c.uid,
-        'full_name': c.full_name,
-        'company': c.company,
-        'position': c.position,
-        'email': c.email,
-        'phone': c.phone,
-        'address': c.address,
-        'comment': c.comment,
-        'website': c.website,
-        'photo_path': c.photo_path,
-    } for c in contacts])
-    
-    buffer = io.BytesIO()
-    df.to_excel(buffer, index=False)
-    buffer.seek(0)
-    
     headers = {'Content-Disposition': 'attachment; filename=contacts.xlsx'}
     return StreamingResponse(
-        buffer,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        _iter_xlsx(_iter_export_rows(db.get_bind(), _parse_ids(ids))),
+        media_type=XLSX_MEDIA_TYPE,
         headers=headers
     )
 
@@ -205,33 +229,33 @@ def export_contact_pdf(
 @router.post('/contacts/import')
 def import_contacts(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Import contacts from CSV or Excel file"""
-    ext = (file.filename or '').split('.')[-1].lower()
+    """
+    Import contacts from CSV or Excel file.
     
-    if ext == 'csv':
-        df = pd.read_csv(file.file)
-    elif ext in ('xls', 'xlsx'):
-        df = pd.read_excel(file.file)
-    else:
+    The file is imported in the background (chunked, deduplicated, COPY on
+    PostgreSQL); returns a task ID for tracking progress.
+    """
+    from ..services.import_service import SUPPORTED_EXTENSIONS
+    from ..tasks import import_contacts_file
+    
+    ext = (file.filename or '').split('.')[-1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
         raise HTTPException(status_code=400, detail='Unsupported file format')
     
-    added = 0
-    for _, row in df.iterrows():
-        obj = {}
-        for k in ['full_name', 'company', 'position', 'email', 'phone', 'address', 'comment']:
-            val = row.get(k)
-            if pd.isna(val):
-                val = None
-            obj[k] = val
-        
-        db.add(Contact(**obj))
-        added += 1
+    path = os.path.join('uploads', f"{uuid.uuid4().hex}_import.{ext}")
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(file.file, f, length=1024 * 1024)
     
-    db.commit()
-    return {'imported': added}
+    task = import_contacts_file.delay(path=path, filename=file.filename, user_id=current_user.id)
+    logger.info(f"Contact import queued: {task.id} ({file.filename}) by user {current_user.username}")
+    
+    return {
+        "task_id": task.id,
+        "status": "queued",
+        "message": "Import started. Use /ocr/batch-status/{task_id} to track progress."
+    }
 
 
 @router.post('/contacts/delete_bulk')
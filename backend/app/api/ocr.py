@@ -4,6 +4,9 @@ OCR Processing API endpoints (upload, batch upload, providers)
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request, status
 from sqlalchemy.orm import Session
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
 import os
 import uuid
 import json
@@ -11,27 +14,29 @@ import time
 import logging
 
 from ..database import get_db
+from ..core.config import settings
 from ..models import Contact, User
 from ..core import auth as auth_utils
 from ..integrations.ocr.providers import OCRManager  # OCR v1.0 (fallback)
-from ..integrations.ocr.providers_v2 import OCRManagerV2  # OCR v2.0 (primary)
+from ..integrations.ocr.inference_client import get_ocr_manager_v2  # OCR v2.0 (primary)
 
 # Initialize OCR Managers
 ocr_manager_v1 = OCRManager()  # Fallback to Tesseract if v2 fails
-ocr_manager_v2 = OCRManagerV2(enable_layoutlm=True)  # Primary: PaddleOCR + LayoutLMv3
-ocr_manager = ocr_manager_v2  # Use v2.0 by default
+# OCR v2.0 (PaddleOCR + LayoutLMv3) comes from get_ocr_manager_v2(): shared inference
+# server if configured, otherwise loaded in-process on first use
 from ..integrations.ocr import utils as ocr_utils
 from ..core import qr as qr_utils
 from ..integrations.ocr import image_processing
-from ..integrations.ocr.image_utils import create_thumbnail, downscale_image_bytes
+from ..integrations.ocr import result_cache
+from ..integrations.ocr.image_utils import create_thumbnail
+from ..core.card_image import CardImage
 from ..core.file_security import validate_and_secure_file, sanitize_filename
 from ..services.storage_service import StorageService
 from ..services.validator_service import ValidatorService
+from ..services.duplicate_service import DuplicateService
 
 # Prometheus metrics
 from ..core.metrics import (
-    contacts_created_counter,
-    contacts_total,
     qr_scan_counter,
     ocr_processing_time,
     ocr_processing_counter
@@ -50,20 +55,28 @@ logger = logging.getLogger(__name__)
 # Router
 router = APIRouter()
 
+# Blocking upload work runs here, bounded so a burst of uploads cannot take
+# over the shared threadpool that serves the sync (CRUD) endpoints
+upload_executor = ThreadPoolExecutor(
+    max_workers=settings.OCR_UPLOAD_CONCURRENCY,
+    thread_name_prefix="ocr-upload"
+)
+
 
 @router.get('/providers')
 def get_ocr_providers():
     """Получить информацию о доступных OCR провайдерах"""
     return {
-        'available': ocr_manager.get_available_providers(),
-        'details': ocr_manager.get_provider_info()
+        'available': get_ocr_manager_v2().get_available_providers(),
+        'details': get_ocr_manager_v2().get_provider_info()
     }
 
 
-def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str, 
+def process_single_card(card_image: CardImage, safe_name: str, thumbnail_name: str, 
                        provider: str, filename: str, db: Session, user_id: int = None) -> Optional[dict]:
     """
     Process a single business card image (QR + OCR).
+    The decoded image is reused for QR, OCR and storage (no re-decode).
     Returns contact data dict or None on failure.
     """
     try:
@@ -73,8 +86,19 @@ def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str,
         raw_text = ""
         recognition_method = None
         
-        logger.info("Attempting QR code scan...")
-        qr_data = qr_utils.process_image_with_qr(card_bytes)
+        # Check OCR version setting
+        from ..core.utils import get_setting
+        ocr_version = get_setting(db, "ocr_version", "v2.0")
+        preferred = None if provider == 'auto' else provider
+        
+        # Identical image seen before with the same pipeline: skip QR and OCR
+        cache_key, cached = result_cache.lookup(card_image, preferred, ocr_version)
+        
+        if cached:
+            qr_data = cached['qr_data']
+        else:
+            logger.info("Attempting QR code scan...")
+            qr_data = qr_utils.process_image_with_qr(card_image)
         
         if qr_data and any(qr_data.values()):
             # QR code found
@@ -86,36 +110,37 @@ def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str,
             }, ensure_ascii=False)
             qr_scan_counter.labels(status='success').inc()
             logger.info("QR code extracted successfully")
+            if not cached:
+                result_cache.store(cache_key, qr_data=qr_data)
         else:
             # No QR code - fallback to OCR
             qr_scan_counter.labels(status='not_found').inc()
             logger.info("No QR code found, falling back to OCR...")
             
             # Prepare for OCR (increased limit for high-res business cards)
-            ocr_input = downscale_image_bytes(card_bytes, max_side=6000)
-            preferred = None if provider == 'auto' else provider
+            ocr_input = card_image.downscale(max_side=6000)
             
             try:
                 start_time = time.time()
                 
-                # Check OCR version setting
-                from ..core.utils import get_setting
-                ocr_version = get_setting(db, "ocr_version", "v2.0")
-                
+                if cached and cached.get('ocr_result'):
+                    ocr_result = cached['ocr_result']
+                    logger.info(f"✅ Reusing cached OCR result: {ocr_result.get('provider', 'unknown')}")
                 # OCR v2.0: PaddleOCR + LayoutLMv3 with fallback to v1.0
-                if ocr_version == "v2.0":
+                elif ocr_version == "v2.0":
                     try:
                         logger.info("🚀 Using OCR v2.0 (PaddleOCR + LayoutLMv3)...")
-                        ocr_result = ocr_manager_v2.recognize(
+                        ocr_result = get_ocr_manager_v2().recognize(
                             image_data=ocr_input,
                             provider_name=preferred if preferred != 'auto' else None,
                             use_layout=True  # Enable LayoutLMv3 classification
                         )
                         logger.info(f"✅ OCR v2.0 successful: {ocr_result.get('provider', 'PaddleOCR')}")
+                        result_cache.store(cache_key, ocr_result=ocr_result)
                     except Exception as v2_error:
                         logger.warning(f"⚠️ OCR v2.0 failed: {v2_error}, falling back to v1.0...")
                         ocr_result = ocr_manager_v1.recognize(
-                            ocr_input,
+                            ocr_input.encode(),
                             filename=filename,
                             preferred_provider=preferred
                         )
@@ -124,11 +149,12 @@ def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str,
                     # Use v1.0 directly
                     logger.info("🔧 Using OCR v1.0 (Tesseract) by settings...")
                     ocr_result = ocr_manager_v1.recognize(
-                        ocr_input,
+                        ocr_input.encode(),
                         filename=filename,
                         preferred_provider=preferred
                     )
                     logger.info(f"✅ OCR v1.0 successful: Tesseract")
+                    result_cache.store(cache_key, ocr_result=ocr_result)
                 
                 processing_time = time.time() - start_time
                 
@@ -213,7 +239,7 @@ def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str,
             storage_service = StorageService(db)
             minio_path = storage_service.save_business_card_image(
                 contact_id=contact.id,
-                image_data=card_bytes,
+                image_data=card_image.encode(),
                 filename=filename,
                 metadata={
                     'original_filename': filename,
@@ -260,6 +286,14 @@ def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str,
             "recognition_method": recognition_method,
         }
         
+        # Flag likely duplicates of the new card (not critical)
+        try:
+            duplicate_service = DuplicateService(db)
+            if duplicate_service.auto_detect:
+                contact_dict["duplicates"] = duplicate_service.find_duplicates_for(contact)
+        except Exception as duplicate_error:
+            logger.error(f"❌ Duplicate detection error: {duplicate_error}")
+        
         return contact_dict
         
     except Exception as e:
@@ -267,6 +301,109 @@ def process_single_card(card_bytes: bytes, safe_name: str, thumbnail_name: str,
         return None
 
 
+def _process_upload(
+    content: bytes,
+    filename: Optional[str],
+    provider: str,
+    auto_crop: bool,
+    detect_multi: bool,
+    db: Session,
+    user_id: int
+):
+    """
+    Synchronous part of an upload: decode, crop, save, thumbnail, recognize
+    and store each card. Runs on ``upload_executor``, never on the event loop.
+    """
+    # Decode once; the same pixel buffer is reused by every step below
+    try:
+        image = CardImage.from_bytes(content)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Could not decode image")
+    
+    # STEP 0: Image preprocessing - crop and detect multiple cards
+    logger.info(f"Processing image with auto_crop={auto_crop}, detect_multi={detect_multi}")
+    processed_cards = image_processing.process_card_image(
+        image, 
+        auto_crop=auto_crop,
+        detect_multi=detect_multi,
+        enhance=False
+    )
+    
+    logger.info(f"Image processing complete: {len(processed_cards)} card(s) detected")
+    
+    # If multiple cards detected, handle each one
+    if len(processed_cards) > 1:
+        logger.info(f"Multiple cards detected ({len(processed_cards)}), processing each separately")
+        created_contacts = []
+        
+        for idx, card_image in enumerate(processed_cards[:5]):  # Limit to 5 cards
+            logger.info(f"Processing card {idx + 1}/{len(processed_cards)}")
+            
+            # Save card to disk
+            card_safe_name = f"{uuid.uuid4().hex}_card{idx+1}_{os.path.basename(filename or 'upload')}"
+            card_save_path = os.path.join('uploads', card_safe_name)
+            card_image.save(card_save_path)
+            
+            # Create thumbnail
+            card_thumbnail_path = create_thumbnail(card_save_path, size=(200, 200), quality=85, image=card_image)
+            card_thumbnail_name = os.path.basename(card_thumbnail_path)
+            
+            # Process card (QR + OCR)
+            try:
+                card_data = process_single_card(
+                    card_image, 
+                    card_safe_name, 
+                    card_thumbnail_name,
+                    provider, 
+                    filename,
+                    db,
+                    user_id=user_id
+                )
+                
+                if card_data:
+                    created_contacts.append(card_data)
+                    logger.info(f"Successfully processed card {idx + 1}: Contact ID {card_data.get('id')}")
+                else:
+                    logger.warning(f"Card {idx + 1} processing returned no data")
+            except Exception as card_error:
+                logger.error(f"Error processing card {idx + 1}: {card_error}")
+                # Continue with other cards even if one fails
+                continue
+        
+        return {
+            "message": f"{len(created_contacts)} business cards detected and processed",
+            "contacts": created_contacts
+        }
+    
+    # Single card - use processed image
+    card_image = processed_cards[0]
+    
+    # Save processed file to disk
+    safe_name = f"{uuid.uuid4().hex}_{os.path.basename(filename or 'upload')}"
+    save_path = os.path.join('uploads', safe_name)
+    card_image.save(save_path)
+    
+    # Create thumbnail (200x200, quality 85%)
+    thumbnail_full_path = create_thumbnail(save_path, size=(200, 200), quality=85, image=card_image)
+    thumbnail_name = os.path.basename(thumbnail_full_path)
+    
+    # Process single card (QR + OCR)
+    contact_dict = process_single_card(
+        card_image,
+        safe_name,
+        thumbnail_name,
+        provider,
+        filename,
+        db,
+        user_id=user_id
+    )
+    
+    if not contact_dict:
+        raise HTTPException(status_code=400, detail="No text could be extracted from the image")
+    
+    return contact_dict
+
+
 @router.post('/upload')
 @limiter.limit("60/minute")
 async def upload_card(
@@ -286,112 +423,22 @@ async def upload_card(
         
         # Check file size (20MB max)
         limit_size = 20 * 1024 * 1024
-        head = file.file.read(limit_size + 1)
-        if len(head) > limit_size:
+        content = await file.read(limit_size + 1)
+        if len(content) > limit_size:
             raise HTTPException(status_code=400, detail="File too large. Maximum size is 20MB")
-        file.file.seek(0)
-        
-        # Read image content
-        content = file.file.read()
-        file.file.seek(0)
         
-        # STEP 0: Image preprocessing - crop and detect multiple cards
-        logger.info(f"Processing image with auto_crop={auto_crop}, detect_multi={detect_multi}")
-        processed_cards = image_processing.process_business_card_image(
-            content, 
-            auto_crop=auto_crop,
-            detect_multi=detect_multi,
-            enhance=False
-        )
-        
-        logger.info(f"Image processing complete: {len(processed_cards)} card(s) detected")
-        
-        # If multiple cards detected, handle each one
-        if len(processed_cards) > 1:
-            logger.info(f"Multiple cards detected ({len(processed_cards)}), processing each separately")
-            created_contacts = []
-            
-            for idx, card_bytes in enumerate(processed_cards[:5]):  # Limit to 5 cards
-                logger.info(f"Processing card {idx + 1}/{len(processed_cards)}")
-                
-                # Save card to disk
-                card_safe_name = f"{uuid.uuid4().hex}_card{idx+1}_{os.path.basename(file.filename or 'upload')}"
-                card_save_path = os.path.join('uploads', card_safe_name)
-                with open(card_save_path, 'wb') as f:
-                    f.write(card_bytes)
-                
-                # Create thumbnail
-                card_thumbnail_path = create_thumbnail(card_save_path, size=(200, 200), quality=85)
-                card_thumbnail_name = os.path.basename(card_thumbnail_path)
-                
-                # Process card (QR + OCR)
-                try:
-                    card_data = process_single_card(
-                        card_bytes, 
-                        card_safe_name, 
-                        card_thumbnail_name,
-                        provider, 
-                        file.filename,
-                        db,
-                        user_id=current_user.id
-                    )
-                    
-                    if card_data:
-                        created_contacts.append(card_data)
-                        logger.info(f"Successfully processed card {idx + 1}: Contact ID {card_data.get('id')}")
-                    else:
-                        logger.warning(f"Card {idx + 1} processing returned no data")
-                except Exception as card_error:
-                    logger.error(f"Error processing card {idx + 1}: {card_error}")
-                    # Continue with other cards even if one fails
-                    continue
-            
-            # Update metrics
-            contacts_created_counter.inc(len(created_contacts))
-            from ..repositories import ContactRepository
-            contact_repo = ContactRepository(db)
-            contacts_total.set(contact_repo.count())
-            
-            return {
-                "message": f"{len(created_contacts)} business cards detected and processed",
-                "contacts": created_contacts
-            }
-        
-        # Single card - use processed image
-        content = processed_cards[0]
-        
-        # Save processed file to disk
-        safe_name = f"{uuid.uuid4().hex}_{os.path.basename(file.filename or 'upload')}"
-        save_path = os.path.join('uploads', safe_name)
-        with open(save_path, 'wb') as f:
-            f.write(content)
-        
-        # Create thumbnail (200x200, quality 85%)
-        thumbnail_full_path = create_thumbnail(save_path, size=(200, 200), quality=85)
-        thumbnail_name = os.path.basename(thumbnail_full_path)
-        
-        # Process single card (QR + OCR)
-        contact_dict = process_single_card(
-            content,
-            safe_name,
-            thumbnail_name,
-            provider,
-            file.filename,
-            db,
-            user_id=current_user.id
+        # Image processing, OCR and DB writes are blocking; the loop keeps
+        # serving other requests while this upload is recognized
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            upload_executor,
+            functools.partial(
+                _process_upload,
+                content, file.filename, provider, auto_crop, detect_multi,
+                db, current_user.id
+            )
         )
         
-        if not contact_dict:
-            raise HTTPException(status_code=400, detail="No text could be extracted from the image")
-        
-        # Update metrics
-        contacts_created_counter.inc()
-        from ..repositories import ContactRepository
-        contact_repo = ContactRepository(db)
-        contacts_total.set(contact_repo.count())
-        
-        return contact_dict
-        
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -419,7 +466,7 @@ async def batch_upload(
         
         # Check file size (100MB max for ZIP)
         limit_size = 100 * 1024 * 1024
-        content = file.file.read(limit_size + 1)
+        content = await file.read(limit_size + 1)
         if len(content) > limit_size:
             raise HTTPException(status_code=400, detail="ZIP file too large. Maximum size is 100MB")
         
@@ -479,9 +526,13 @@ def get_batch_status(
                 'state': task.state,
                 'status': task.info.get('status', 'Processing...'),
                 'progress': task.info.get('progress', 0),
-                'current': task.info.get('current', 0),
+                'processed': task.info.get('processed', 0),
                 'total': task.info.get('total', 0)
             }
+            if task.info.get('batch_id'):
+                # Fanned-out batch: progress from the finished chunk subtasks
+                from ..tasks import batch_progress
+                response.update(batch_progress(task.info))
         elif task.state == 'SUCCESS':
             response = {
                 'task_id': task_id,
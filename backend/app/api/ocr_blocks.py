@@ -77,7 +77,7 @@ def rerecognize_block(
         img_bytes = img_byte_arr.getvalue()
         
         # Run OCR on cropped region
-        from ..settings import get_setting
+        from ..core.utils import get_setting
         tesseract_langs = get_setting(db, 'TESSERACT_LANGS', 'rus+eng')
         result = tesseract_boxes.get_text_blocks(img_bytes, lang=tesseract_langs)
         
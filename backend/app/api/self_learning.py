@@ -8,7 +8,7 @@ from typing import Dict, Any, List
 import logging
 
 from ..database import get_db
-from ..models import Contact, User
+from ..models import Contact, ContactOCRResult, User
 from ..core import auth as auth_utils
 from ..integrations.label_studio import (
     LabelStudioService,
@@ -163,23 +163,20 @@ async def get_annotation_recommendations(
     Get recommendations for which contacts to annotate (active learning)
     """
     try:
-        import json
-        
         # Get recent contacts with OCR data
-        contacts = db.query(Contact)\
-            .filter(Contact.ocr_raw.isnot(None))\
+        results = db.query(ContactOCRResult)\
+            .join(Contact, Contact.id == ContactOCRResult.contact_id)\
             .order_by(Contact.created_at.desc())\
             .limit(100)\
             .all()
         
         # Prepare cards for analysis
         cards = []
-        for contact in contacts:
+        for result in results:
             try:
-                ocr_result = json.loads(contact.ocr_raw)
                 cards.append({
-                    'contact_id': contact.id,
-                    'ocr_result': ocr_result
+                    'contact_id': result.contact_id,
+                    'ocr_result': result.data
                 })
             except:
                 continue
@@ -83,15 +83,11 @@ async def get_editable_settings(
 ):
     """
     Get editable settings (admin only).
-    Returns current environment variables and database settings.
-    Uses SettingsRepository
+    Returns current environment variables and database settings
+    (served from the settings cache).
     """
-    from ..repositories import SettingsRepository
-    settings_repo = SettingsRepository(db)
-    
     def get_db_setting(key: str, default: str = ""):
-        setting = settings_repo.get_app_setting(key)
-        return setting.value if setting else default
+        return get_setting(db, key, default)
     
     return {
         "ocr": {
@@ -237,14 +233,10 @@ async def get_integrations_status(
     """
     Get status of all integrations (admin only).
     Returns enabled/disabled status and health check for each integration.
-    Uses SettingsRepository
+    Settings are served from the settings cache.
     """
-    from ..repositories import SettingsRepository
-    settings_repo = SettingsRepository(db)
-    
     def get_integration_setting(key: str, default: str = "false"):
-        setting = settings_repo.get_app_setting(key)
-        return setting.value if setting else default
+        return get_setting(db, key, default)
     
     # Check Redis connection
     redis_configured = False
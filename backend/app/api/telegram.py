@@ -10,8 +10,9 @@ import uuid
 import logging
 
 from ..database import get_db
-from ..models import User, AppSetting
+from ..models import User
 from ..core.auth import get_current_active_user, get_current_admin_user
+from ..core.utils import get_setting, set_setting
 from ..integrations.ocr import image_processing
 
 router = APIRouter()
@@ -25,23 +26,6 @@ class TelegramSettings(BaseModel):
     provider: str = 'auto'
 
 
-def get_setting(db: Session, key: str, default: str | None = None) -> str | None:
-    """Get a setting value from database"""
-    setting = db.query(AppSetting).filter(AppSetting.key == key).first()
-    return setting.value if setting else default
-
-
-def set_setting(db: Session, key: str, value: str | None):
-    """Set a setting value in database"""
-    setting = db.query(AppSetting).filter(AppSetting.key == key).first()
-    if setting:
-        setting.value = value
-    else:
-        setting = AppSetting(key=key, value=value)
-        db.add(setting)
-    db.commit()
-
-
 @router.get('/settings/telegram')
 def get_telegram_settings(
     db: Session = Depends(get_db),
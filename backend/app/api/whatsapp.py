@@ -2,6 +2,7 @@
 WhatsApp integration API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import logging
 import json
@@ -51,6 +52,7 @@ async def whatsapp_webhook_receive(
     Automatically processes business card images sent via WhatsApp.
     """
     from ..integrations import whatsapp as whatsapp_utils
+    from ..core.task_blobs import put_blob
     from ..tasks import process_single_card
     
     try:
@@ -71,9 +73,12 @@ async def whatsapp_webhook_receive(
             image_data = whatsapp_utils.download_media(media_id)
             
             if image_data:
+                # Blob write is file I/O: keep it off the event loop
+                image_key = await run_in_threadpool(put_blob, image_data)
+                
                 # Queue processing task
                 task = process_single_card.delay(
-                    image_data=image_data,
+                    image_key=image_key,
                     filename=f"whatsapp_{message_data['id']}.jpg",
                     provider='auto',
                     user_id=None  # WhatsApp messages don't have associated user
@@ -1,11 +1,21 @@
 """
 Redis caching utilities
+
+Two tiers: a per-process LRU (L1, bounded by bytes and a short TTL) in front
+of Redis (L2). Values are serialized with core.cache_codec (typed JSON,
+compressed, schema-versioned) instead of pickle.
 """
 import redis
 import hashlib
-import pickle
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .core import cache_codec
 
 logger = logging.getLogger(__name__)
 
@@ -13,10 +23,17 @@ logger = logging.getLogger(__name__)
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 redis_client = None
 
+# L1 (in-process) tier
+CACHE_L1_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_L1_TTL = int(os.getenv("CACHE_L1_TTL", "30"))  # Bounds staleness across processes
+
+# Keys examined per SCAN call / removed per UNLINK during invalidation
+SCAN_BATCH_SIZE = 1000
+
 try:
     redis_client = redis.Redis.from_url(
         REDIS_URL,
-        decode_responses=False,  # We'll use pickle for serialization
+        decode_responses=False,  # Values are binary (cache_codec)
         socket_connect_timeout=5,
         socket_timeout=5
     )
@@ -27,15 +44,96 @@ except Exception as e:
     redis_client = None
 
 
+class LocalCache:
+    """
+    Thread-safe LRU of encoded cache entries with per-entry expiry.
+
+    Entries are kept encoded, so the byte bound is exact and callers that
+    mutate a returned value never corrupt the cached copy.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def set(self, key: str, data: bytes, ttl: int):
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + min(ttl, self.ttl)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self, pattern: str = "*") -> int:
+        with self._lock:
+            keys = [k for k in self._entries if fnmatchcase(k, pattern)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "items": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+local_cache = LocalCache(CACHE_L1_MAX_BYTES, CACHE_L1_TTL)
+
+
 def get_cache_key(prefix: str, data: bytes, extra: str = "") -> str:
     """
     Generate a cache key from image bytes and extra parameters.
-    
+
     Args:
         prefix: Cache key prefix (e.g., 'ocr', 'qr')
         data: Image bytes to hash
         extra: Extra parameters to include in key (e.g., provider name)
-    
+
     Returns:
         Cache key string
     """
@@ -46,65 +144,175 @@ def get_cache_key(prefix: str, data: bytes, extra: str = "") -> str:
     return f"{prefix}:{hash_value}"
 
 
-def get_from_cache(key: str):
+def _decode(key: str, data: bytes):
+    """Decode an entry; undecodable entries (old schema, pickle) count as misses"""
+    try:
+        return cache_codec.loads(data)
+    except cache_codec.CacheDecodeError as e:
+        logger.debug(f"Cache entry ignored ({e}): {key[:50]}...")
+        return None
+
+
+def get_from_cache(key: str, l1_ttl: Optional[int] = None):
     """
-    Get value from Redis cache.
-    
+    Get value from cache (L1, then Redis).
+
     Args:
         key: Cache key
-    
+        l1_ttl: Seconds a Redis hit is kept in L1 (default CACHE_L1_TTL; 0 skips L1)
+
     Returns:
         Cached value or None if not found/unavailable
     """
+    l1_ttl = CACHE_L1_TTL if l1_ttl is None else l1_ttl
+    data = local_cache.get(key) if l1_ttl > 0 else None
+    if data is not None:
+        return _decode(key, data)
+
     if not redis_client:
         return None
-    
+
     try:
-        cached = redis_client.get(key)
-        if cached:
-            logger.info(f"Cache HIT: {key[:50]}...")
-            # Using pickle for internal cache only (trusted data)
-            # For untrusted data, use JSON serialization instead
-            return pickle.loads(cached)  # nosec B301
-        logger.debug(f"Cache MISS: {key[:50]}...")
-        return None
+        data = redis_client.get(key)
+        if data is None:
+            logger.debug(f"Cache MISS: {key[:50]}...")
+            return None
+
+        logger.debug(f"Cache HIT: {key[:50]}...")
+        value = _decode(key, data)
+        if value is not None and l1_ttl > 0:
+            # Repopulate L1 for at most its own TTL
+            local_cache.set(key, data, l1_ttl)
+        return value
     except Exception as e:
         logger.error(f"Cache get error: {e}")
         return None
 
 
-def set_to_cache(key: str, value, ttl: int = 86400):
+def get_many(keys: Iterable[str], l1_ttl: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get several values with one Redis round trip.
+
+    Args:
+        keys: Cache keys
+        l1_ttl: Seconds a Redis hit is kept in L1 (default CACHE_L1_TTL; 0 skips L1)
+
+    Returns:
+        Dict of key -> value for the keys that were found
+    """
+    l1_ttl = CACHE_L1_TTL if l1_ttl is None else l1_ttl
+    found: Dict[str, Any] = {}
+    missing: List[str] = []
+
+    for key in keys:
+        data = local_cache.get(key) if l1_ttl > 0 else None
+        value = _decode(key, data) if data is not None else None
+        if value is not None:
+            found[key] = value
+        else:
+            missing.append(key)
+
+    if not missing or not redis_client:
+        return found
+
+    try:
+        for key, data in zip(missing, redis_client.mget(missing)):
+            if data is None:
+                continue
+            value = _decode(key, data)
+            if value is not None:
+                found[key] = value
+                if l1_ttl > 0:
+                    local_cache.set(key, data, l1_ttl)
+    except Exception as e:
+        logger.error(f"Cache get_many error: {e}")
+
+    return found
+
+
+def set_to_cache(key: str, value, ttl: int = 86400, l1_ttl: Optional[int] = None):
     """
-    Set value to Redis cache.
-    
+    Set value to cache (L1 and Redis).
+
     Args:
         key: Cache key
-        value: Value to cache (will be pickled)
+        value: Value to cache (see core.cache_codec for supported types)
         ttl: Time to live in seconds (default: 24 hours)
+        l1_ttl: Upper bound for the L1 copy (default CACHE_L1_TTL; 0 skips L1)
     """
+    try:
+        data = cache_codec.dumps(value)
+    except Exception as e:
+        logger.error(f"Cache set error: {e}")
+        return False
+
+    l1_ttl = CACHE_L1_TTL if l1_ttl is None else l1_ttl
+    if l1_ttl > 0:
+        local_cache.set(key, data, min(ttl, l1_ttl))
+
     if not redis_client:
         return False
-    
+
     try:
-        serialized = pickle.dumps(value)
-        redis_client.setex(key, ttl, serialized)
-        logger.debug(f"Cache SET: {key[:50]}... (TTL: {ttl}s)")
+        redis_client.setex(key, ttl, data)
+        logger.debug(f"Cache SET: {key[:50]}... ({len(data)} bytes, TTL: {ttl}s)")
         return True
     except Exception as e:
         logger.error(f"Cache set error: {e}")
         return False
 
 
+def set_many(mapping: Dict[str, Any], ttl: int = 86400, l1_ttl: Optional[int] = None):
+    """
+    Set several values with one Redis round trip (pipeline).
+
+    Args:
+        mapping: Dict of key -> value
+        ttl: Time to live in seconds (default: 24 hours)
+        l1_ttl: Upper bound for the L1 copies (default CACHE_L1_TTL; 0 skips L1)
+    """
+    encoded: Dict[str, bytes] = {}
+    for key, value in mapping.items():
+        try:
+            encoded[key] = cache_codec.dumps(value)
+        except Exception as e:
+            logger.error(f"Cache set error for {key[:50]}: {e}")
+
+    l1_ttl = CACHE_L1_TTL if l1_ttl is None else l1_ttl
+    if l1_ttl > 0:
+        for key, data in encoded.items():
+            local_cache.set(key, data, min(ttl, l1_ttl))
+
+    if not redis_client or not encoded:
+        return False
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, data in encoded.items():
+            pipe.setex(key, ttl, data)
+        pipe.execute()
+        logger.debug(f"Cache SET: {len(encoded)} keys (TTL: {ttl}s)")
+        return True
+    except Exception as e:
+        logger.error(f"Cache set_many error: {e}")
+        return False
+
+
 def delete_from_cache(key: str):
     """
-    Delete value from Redis cache.
-    
+    Delete value from cache.
+
+    Only this process's L1 is cleared; other processes drop their copy
+    within CACHE_L1_TTL seconds.
+
     Args:
         key: Cache key
     """
+    local_cache.delete(key)
+
     if not redis_client:
         return False
-    
+
     try:
         redis_client.delete(key)
         logger.debug(f"Cache DELETE: {key[:50]}...")
@@ -114,41 +322,186 @@ def delete_from_cache(key: str):
         return False
 
 
+def iter_key_batches(pattern: str, batch_size: int = SCAN_BATCH_SIZE, client=None) -> Iterator[List[bytes]]:
+    """
+    Iterate over keys matching ``pattern`` in batches, using cursor-based SCAN.
+
+    Unlike KEYS, each SCAN call touches only ~``batch_size`` keys, so Redis
+    (also the Celery broker) keeps serving other clients in between.
+
+    Args:
+        pattern: Redis key pattern
+        batch_size: SCAN COUNT hint and maximum batch length
+        client: Redis client (default: the cache client)
+    """
+    client = client or redis_client
+    if not client:
+        return
+
+    batch: List[bytes] = []
+    for key in client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def unlink_keys(keys: List[bytes], client=None) -> int:
+    """
+    Remove keys with UNLINK (memory is reclaimed in a background thread).
+
+    Args:
+        keys: Keys to remove
+        client: Redis client (default: the cache client)
+
+    Returns:
+        Number of keys removed
+    """
+    client = client or redis_client
+    if not client or not keys:
+        return 0
+    return client.unlink(*keys)
+
+
 def clear_cache(pattern: str = "*"):
     """
-    Clear all keys matching pattern.
-    
+    Clear all keys matching pattern, incrementally (SCAN + UNLINK in batches).
+
+    Prefer CacheNamespace.invalidate() for application caches: it is O(1).
+
     Args:
         pattern: Redis key pattern (default: all keys)
-    
+
     Warning:
         Use with caution! This will delete all matching keys.
     """
+    local_cache.clear(pattern)
+
     if not redis_client:
         return 0
-    
+
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
-            logger.info(f"Cache cleared: {len(keys)} keys matching '{pattern}'")
-            return len(keys)
-        return 0
+        removed = 0
+        for batch in iter_key_batches(pattern):
+            removed += unlink_keys(batch)
+        if removed:
+            logger.info(f"Cache cleared: {removed} keys matching '{pattern}'")
+        return removed
     except Exception as e:
         logger.error(f"Cache clear error: {e}")
         return 0
 
 
+class CacheNamespace:
+    """
+    Group of cache keys that can be invalidated in O(1).
+
+    Keys are stored as ``<name>:<generation>:<key>``. ``invalidate()`` bumps
+    the namespace's generation counter in Redis, so every existing entry
+    becomes unreachable at once and simply expires through its TTL; nothing
+    is scanned or deleted. Other processes pick up the new generation within
+    ``l1_ttl`` seconds (the same bound as for L1 entries; default CACHE_L1_TTL).
+    Namespaces whose changes must reach every process quickly use a shorter
+    ``l1_ttl``; 0 skips L1 and reads Redis every time.
+    """
+
+    GENERATION_KEY = "cache:generation:{name}"
+
+    def __init__(self, name: str, l1_ttl: Optional[int] = None):
+        self.name = name
+        self.l1_ttl = CACHE_L1_TTL if l1_ttl is None else l1_ttl
+        self._generation_key = self.GENERATION_KEY.format(name=name)
+        self._generation = 0
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        """Current generation (re-read from Redis at most every ``l1_ttl`` seconds)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.l1_ttl:
+                return self._generation
+            if redis_client:
+                try:
+                    value = redis_client.get(self._generation_key)
+                    self._generation = int(value) if value else 0
+                except Exception as e:
+                    logger.error(f"Cache generation read error ({self.name}): {e}")
+            self._checked_at = now
+            return self._generation
+
+    def key(self, key: str) -> str:
+        """Full Redis key for ``key`` in the current generation"""
+        return f"{self.name}:{self.generation()}:{key}"
+
+    def get(self, key: str):
+        return get_from_cache(self.key(key), l1_ttl=self.l1_ttl)
+
+    def set(self, key: str, value, ttl: int = 86400):
+        return set_to_cache(self.key(key), value, ttl=ttl, l1_ttl=self.l1_ttl)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        full_keys = {self.key(key): key for key in keys}
+        return {full_keys[k]: v for k, v in get_many(full_keys, l1_ttl=self.l1_ttl).items()}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = 86400):
+        return set_many({self.key(key): value for key, value in mapping.items()}, ttl=ttl, l1_ttl=self.l1_ttl)
+
+    def delete(self, key: str):
+        return delete_from_cache(self.key(key))
+
+    def invalidate(self) -> int:
+        """
+        Drop every entry of the namespace in O(1).
+
+        Returns:
+            The new generation
+        """
+        with self._lock:
+            if redis_client:
+                try:
+                    self._generation = int(redis_client.incr(self._generation_key))
+                except Exception as e:
+                    logger.error(f"Cache invalidate error ({self.name}): {e}")
+                    self._generation += 1
+            else:
+                self._generation += 1
+            self._checked_at = time.monotonic()
+        local_cache.clear(f"{self.name}:*")
+        logger.info(f"Cache namespace '{self.name}' invalidated (generation {self._generation})")
+        return self._generation
+
+
+_namespaces: Dict[str, CacheNamespace] = {}
+_namespaces_lock = threading.Lock()
+
+
+def cache_namespace(name: str, l1_ttl: Optional[int] = None) -> CacheNamespace:
+    """
+    Get the process-wide CacheNamespace for ``name``.
+
+    Args:
+        name: Namespace (key prefix), e.g. 'settings'
+        l1_ttl: L1 bound of the namespace when it is first created (default CACHE_L1_TTL)
+    """
+    with _namespaces_lock:
+        if name not in _namespaces:
+            _namespaces[name] = CacheNamespace(name, l1_ttl=l1_ttl)
+        return _namespaces[name]
+
+
 def get_cache_stats() -> dict:
     """
-    Get Redis cache statistics.
-    
+    Get cache statistics.
+
     Returns:
-        Dictionary with cache stats (or empty dict if unavailable)
+        Dictionary with Redis and L1 stats (or available=False if Redis is down)
     """
     if not redis_client:
-        return {"available": False}
-    
+        return {"available": False, "local": local_cache.stats()}
+
     try:
         info = redis_client.info()
         return {
@@ -156,9 +509,9 @@ def get_cache_stats() -> dict:
             "used_memory": info.get("used_memory_human", "N/A"),
             "connected_clients": info.get("connected_clients", 0),
             "total_keys": redis_client.dbsize(),
-            "uptime_seconds": info.get("uptime_in_seconds", 0)
+            "uptime_seconds": info.get("uptime_in_seconds", 0),
+            "local": local_cache.stats(),
         }
     except Exception as e:
         logger.error(f"Cache stats error: {e}")
-        return {"available": False, "error": str(e)}
-
+        return {"available": False, "error": str(e), "local": local_cache.stats()}
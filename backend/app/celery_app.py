@@ -2,7 +2,12 @@
 Celery configuration for async task processing
 """
 import os
+import time
+
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import before_task_publish
+from kombu import Queue
 
 # Get Celery broker URL from environment
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
@@ -16,11 +21,29 @@ celery_app = Celery(
     include=['app.tasks']
 )
 
+# Queues, each consumed by its own worker pool (see docker-compose.yml), so a
+# single-card upload never waits behind a ZIP batch, an import or training
+QUEUE_INTERACTIVE = 'interactive'
+QUEUE_BULK = 'bulk'
+QUEUE_TRAINING = 'training'
+QUEUE_MAINTENANCE = 'maintenance'
+TASK_QUEUES = (QUEUE_INTERACTIVE, QUEUE_BULK, QUEUE_TRAINING, QUEUE_MAINTENANCE)
+
+# Priorities within a queue (Redis transport: 0 is served first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+PRIORITY_STEPS = list(range(10))
+# Redis list of a queue for one priority: "<queue>" for 0, "<queue>:<priority>" otherwise
+PRIORITY_SEPARATOR = ':'
+
 # Configure Celery
 celery_app.conf.update(
-    task_serializer='pickle',  # Use pickle to support bytes data
-    accept_content=['json', 'pickle'],  # Accept both for compatibility
-    result_serializer='pickle',
+    # JSON only: images go through core.task_blobs (tasks carry the blob key)
+    task_serializer='json',
+    accept_content=['json'],
+    result_serializer='json',
+    result_accept_content=['json'],
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
@@ -31,13 +54,36 @@ celery_app.conf.update(
     task_acks_late=True,  # Acknowledge task after completion
     task_reject_on_worker_lost=True,  # Reject task if worker is lost
     result_expires=3600,  # Results expire after 1 hour
+    task_queues=[Queue(name, routing_key=name) for name in TASK_QUEUES],
+    task_default_queue=QUEUE_BULK,
+    task_inherit_parent_priority=True,  # Subtasks keep the priority of the task that queued them
+    broker_transport_options={
+        'priority_steps': PRIORITY_STEPS,
+        'sep': PRIORITY_SEPARATOR,
+        'queue_order_strategy': 'priority',
+    },
 )
 
-# Task routing - Disabled for now, using default queue
-# celery_app.conf.task_routes = {
-#     'app.tasks.process_batch_upload': {'queue': 'batch_processing'},
-#     'app.tasks.process_single_card': {'queue': 'card_processing'},
-# }
+# Task routing (no task_default_priority: it would override the route priorities)
+celery_app.conf.task_routes = {
+    'app.tasks.process_single_card': {'queue': QUEUE_INTERACTIVE, 'priority': PRIORITY_HIGH},
+    'app.tasks.process_batch_upload': {'queue': QUEUE_BULK, 'priority': PRIORITY_NORMAL},
+    'app.tasks.process_batch_chunk': {'queue': QUEUE_BULK, 'priority': PRIORITY_NORMAL},
+    'app.tasks.finish_batch_upload': {'queue': QUEUE_BULK, 'priority': PRIORITY_NORMAL},
+    'app.tasks.import_contacts_file': {'queue': QUEUE_BULK, 'priority': PRIORITY_NORMAL},
+    'app.tasks.find_duplicate_pairs': {'queue': QUEUE_BULK, 'priority': PRIORITY_NORMAL},
+    'app.tasks.train_ocr_models': {'queue': QUEUE_TRAINING, 'priority': PRIORITY_LOW},
+    'app.tasks.sync_feedback_to_label_studio': {'queue': QUEUE_TRAINING, 'priority': PRIORITY_NORMAL},
+    'app.tasks.cleanup_old_results': {'queue': QUEUE_MAINTENANCE, 'priority': PRIORITY_NORMAL},
+}
+
+
+@before_task_publish.connect
+def _stamp_sent_at(headers=None, **kwargs):
+    """Publish time in the message headers (queue wait shown on the monitoring dashboard)"""
+    if headers is not None:
+        headers.setdefault('sent_at', time.time())
+
 
 # Beat schedule (for periodic tasks, if needed)
 celery_app.conf.beat_schedule = {
@@ -54,11 +100,7 @@ celery_app.conf.beat_schedule = {
     # Train models weekly (on Sunday at 3 AM)
     'train-models': {
         'task': 'app.tasks.train_ocr_models',
-        'schedule': {
-            'hour': 3,
-            'minute': 0,
-            'day_of_week': 0,  # Sunday
-        },
+        'schedule': crontab(hour=3, minute=0, day_of_week=0),  # Sunday
     },
 }
 
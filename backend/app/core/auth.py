@@ -137,7 +137,9 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
     
-    user = get_user_by_username(db, username)
+    # Served from the principal cache; a query only on a miss
+    from ..repositories.principal_cache import principal_cache
+    user = principal_cache.get_user(db, username)
     if user is None:
         raise credentials_exception
     
@@ -0,0 +1,192 @@
+"""
+Cache value codec
+Typed, compact serialization for Redis cache entries (replaces pickle)
+
+Wire format: 1 byte schema version + 1 byte compression codec + payload,
+where the payload is compact JSON with tagged non-JSON types. Only types
+registered via ``register_type`` are reconstructed, so a cache entry can
+never instantiate arbitrary classes the way ``pickle.loads`` can.
+"""
+import base64
+import dataclasses
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump when the payload layout changes; entries with another version read as misses
+SCHEMA_VERSION = 1
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+# Payloads smaller than this are stored uncompressed (settings, flags, small dicts)
+COMPRESS_MIN_BYTES = 512
+
+_TAG = "__t"
+
+# name -> (class, to_dict, from_dict)
+_registry: Dict[str, Tuple[type, Callable[[Any], Dict[str, Any]], Callable[[Dict[str, Any]], Any]]] = {}
+
+if ZSTD_AVAILABLE:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+class CacheDecodeError(ValueError):
+    """Entry cannot be decoded (other schema version, unknown type, corrupt data)"""
+
+
+def register_type(
+    cls: Optional[type] = None,
+    *,
+    name: Optional[str] = None,
+    to_dict: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    from_dict: Optional[Callable[[Dict[str, Any]], Any]] = None
+):
+    """
+    Allow instances of ``cls`` to be stored in the cache.
+
+    Dataclasses work without arguments (fields are encoded recursively);
+    other classes need ``to_dict``/``from_dict``. Usable as a decorator.
+    """
+    def wrap(klass: type) -> type:
+        type_name = name or klass.__name__
+        if to_dict is None and not dataclasses.is_dataclass(klass):
+            raise TypeError(f"{klass.__name__} is not a dataclass; pass to_dict/from_dict")
+        encode = to_dict or (lambda obj: {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)})
+        decode = from_dict or (lambda fields: klass(**fields))
+        _registry[type_name] = (klass, encode, decode)
+        return klass
+
+    return wrap(cls) if cls is not None else wrap
+
+
+def _type_name(obj: Any) -> Optional[str]:
+    for type_name, (klass, _, _) in _registry.items():
+        if type(obj) is klass:
+            return type_name
+    return None
+
+
+def _to_json(obj: Any) -> Any:
+    """Convert a value into JSON-safe structures, tagging non-JSON types"""
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) for k in obj):
+            if _TAG in obj:
+                return {_TAG: "dict", "v": [[k, _to_json(v)] for k, v in obj.items()]}
+            return {k: _to_json(v) for k, v in obj.items()}
+        return {_TAG: "dict", "v": [[_to_json(k), _to_json(v)] for k, v in obj.items()]}
+    if isinstance(obj, list):
+        return [_to_json(v) for v in obj]
+    if isinstance(obj, tuple):
+        return {_TAG: "tuple", "v": [_to_json(v) for v in obj]}
+    if isinstance(obj, (set, frozenset)):
+        return {_TAG: "set", "v": [_to_json(v) for v in obj]}
+    if isinstance(obj, bytes):
+        return {_TAG: "bytes", "v": base64.b64encode(obj).decode("ascii")}
+    if isinstance(obj, datetime):
+        return {_TAG: "datetime", "v": obj.isoformat()}
+    if isinstance(obj, date):
+        return {_TAG: "date", "v": obj.isoformat()}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+
+    type_name = _type_name(obj)
+    if type_name is None:
+        raise TypeError(f"Type {type(obj).__name__} is not cacheable; register it with register_type()")
+    _, encode, _ = _registry[type_name]
+    return {_TAG: type_name, "v": _to_json(encode(obj))}
+
+
+def _from_json(obj: Any) -> Any:
+    if isinstance(obj, list):
+        return [_from_json(v) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+
+    tag = obj.get(_TAG)
+    if tag is None:
+        return {k: _from_json(v) for k, v in obj.items()}
+
+    value = obj["v"]
+    if tag == "dict":
+        return {_from_json(k): _from_json(v) for k, v in value}
+    if tag == "tuple":
+        return tuple(_from_json(v) for v in value)
+    if tag == "set":
+        return {_from_json(v) for v in value}
+    if tag == "bytes":
+        return base64.b64decode(value)
+    if tag == "datetime":
+        return datetime.fromisoformat(value)
+    if tag == "date":
+        return date.fromisoformat(value)
+
+    if tag not in _registry:
+        raise CacheDecodeError(f"Unknown cached type: {tag}")
+    _, _, decode = _registry[tag]
+    return decode(_from_json(value))
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a cache value.
+
+    Raises:
+        TypeError: If the value contains an unregistered type
+    """
+    payload = json.dumps(_to_json(value), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    codec = CODEC_NONE
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        if ZSTD_AVAILABLE:
+            payload, codec = _zstd_compressor.compress(payload), CODEC_ZSTD
+        else:
+            payload, codec = zlib.compress(payload, 6), CODEC_ZLIB
+
+    return bytes((SCHEMA_VERSION, codec)) + payload
+
+
+def loads(data: bytes) -> Any:
+    """
+    Deserialize a cache value.
+
+    Raises:
+        CacheDecodeError: Other schema version, unsupported codec or corrupt data
+    """
+    if len(data) < 2 or data[0] != SCHEMA_VERSION:
+        raise CacheDecodeError("Cache entry has a different schema version")
+
+    codec, payload = data[1], data[2:]
+    try:
+        if codec == CODEC_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise CacheDecodeError("zstandard is not installed")
+            payload = _zstd_decompressor.decompress(payload)
+        elif codec == CODEC_ZLIB:
+            payload = zlib.decompress(payload)
+        elif codec != CODEC_NONE:
+            raise CacheDecodeError(f"Unknown cache codec: {codec}")
+        return _from_json(json.loads(payload))
+    except CacheDecodeError:
+        raise
+    except Exception as e:
+        raise CacheDecodeError(f"Corrupt cache entry: {e}")
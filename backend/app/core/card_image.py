@@ -0,0 +1,180 @@
+"""
+Decoded business card image shared across the upload pipeline.
+
+An uploaded photo is decoded once into a pixel buffer and the same object is
+passed through crop, multi-card split, thumbnail, QR scan, downscale and OCR.
+Re-encoding to JPEG happens only when the image is written to storage.
+"""
+import hashlib
+import logging
+import mmap
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class CardImage:
+    """
+    Decoded image (BGR pixel buffer, OpenCV layout) plus metadata.
+
+    Derived representations (grayscale, RGB, encoded bytes) are computed
+    lazily and memoized, so each one is produced at most once per image.
+    """
+
+    def __init__(
+        self,
+        pixels: np.ndarray,
+        source_bytes: Optional[bytes] = None,
+        jpeg_quality: int = 95,
+        source_path: Optional[str] = None
+    ):
+        """
+        Args:
+            pixels: Decoded BGR image array
+            source_bytes: Original encoded bytes if pixels are unmodified
+            jpeg_quality: JPEG quality used when the image has to be re-encoded
+            source_path: File holding the original encoded bytes (read on first ``encode``)
+        """
+        self.pixels = pixels
+        self.jpeg_quality = jpeg_quality
+        self._encoded = source_bytes
+        self._source_path = source_path
+        self._gray = None
+        self._rgb = None
+        self._digest = None
+
+    @classmethod
+    def from_bytes(cls, image_bytes: bytes) -> "CardImage":
+        """
+        Decode image bytes.
+
+        Raises:
+            ValueError: If the bytes cannot be decoded as an image
+        """
+        nparr = np.frombuffer(image_bytes, np.uint8)
+        pixels = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        if pixels is None:
+            raise ValueError("Failed to decode image")
+        return cls(pixels, source_bytes=image_bytes)
+
+    @classmethod
+    def from_file(cls, path: str) -> "CardImage":
+        """
+        Decode an image file through a read-only memory map, so the encoded
+        bytes are never copied into the Python heap.
+
+        Raises:
+            ValueError: If the file is empty or cannot be decoded as an image
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            buffer = np.frombuffer(mapped, np.uint8)
+            pixels = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+            del buffer  # release the export before closing the map
+        finally:
+            mapped.close()
+        if pixels is None:
+            raise ValueError("Failed to decode image")
+        return cls(pixels, source_path=path)
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height), same convention as PIL"""
+        return (self.width, self.height)
+
+    def content_hash(self) -> str:
+        """
+        SHA-256 of the decoded pixels (and shape), independent of file encoding.
+
+        Identical crops of identical uploads hash the same, so this is the
+        key used by the OCR result cache.
+        """
+        if self._digest is None:
+            digest = hashlib.sha256(str(self.pixels.shape).encode())
+            digest.update(np.ascontiguousarray(self.pixels).data)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def gray(self) -> np.ndarray:
+        """Grayscale view (used by contour detection and QR scanning)"""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.pixels, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def rgb(self) -> np.ndarray:
+        """RGB array (PIL / PaddleOCR channel order)"""
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.pixels, cv2.COLOR_BGR2RGB)
+        return self._rgb
+
+    def to_pil(self) -> Image.Image:
+        """PIL image backed by the memoized RGB array"""
+        return Image.fromarray(self.rgb())
+
+    def crop(self, x: int, y: int, w: int, h: int) -> "CardImage":
+        """Crop without re-decoding (the result is encoded on first write)"""
+        return CardImage(self.pixels[y:y + h, x:x + w], jpeg_quality=self.jpeg_quality)
+
+    def downscale(self, max_side: int) -> "CardImage":
+        """
+        Return image whose longest side is at most ``max_side``.
+
+        Returns ``self`` when no resize is needed.
+        """
+        longest = max(self.width, self.height)
+        if longest <= max_side:
+            return self
+
+        scale = max_side / float(longest)
+        new_size = (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+        resized = cv2.resize(self.pixels, new_size, interpolation=cv2.INTER_AREA)
+        return CardImage(resized, jpeg_quality=self.jpeg_quality)
+
+    def thumbnail(self, size: Tuple[int, int] = (200, 200)) -> Image.Image:
+        """PIL thumbnail fitting into ``size`` while preserving aspect ratio"""
+        scale = min(size[0] / float(self.width), size[1] / float(self.height), 1.0)
+        if scale < 1.0:
+            new_size = (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+            small = cv2.resize(self.pixels, new_size, interpolation=cv2.INTER_AREA)
+        else:
+            small = self.pixels
+        return Image.fromarray(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+
+    def encode(self) -> bytes:
+        """
+        Encoded bytes for storage.
+
+        Unmodified images return their original bytes (read from the source
+        file for ``from_file`` images); crops and resizes are encoded to JPEG
+        once and cached.
+        """
+        if self._encoded is None and self._source_path is not None:
+            with open(self._source_path, 'rb') as f:
+                self._encoded = f.read()
+        if self._encoded is None:
+            success, encoded = cv2.imencode(
+                '.jpg', self.pixels, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality]
+            )
+            if not success:
+                raise ValueError("Failed to encode image")
+            self._encoded = encoded.tobytes()
+        return self._encoded
+
+    def save(self, path: str) -> str:
+        """Write encoded image to ``path``"""
+        with open(path, 'wb') as f:
+            f.write(self.encode())
+        return path
@@ -36,6 +36,40 @@ class Settings:
     # OCR Settings
     TESSERACT_CMD: Optional[str] = os.getenv("TESSERACT_CMD")
     OCR_LANGUAGES: str = "rus+eng"
+    OCR_BATCH_SIZE: int = int(os.getenv("OCR_BATCH_SIZE", "8"))  # Cards per batched inference call
+    OCR_BATCH_MAX_PIXELS: int = int(os.getenv("OCR_BATCH_MAX_PIXELS", "48000000"))  # Decoded pixels per batched call (~3 bytes each)
+    OCR_RESULT_CACHE_TTL: int = int(os.getenv("OCR_RESULT_CACHE_TTL", str(7 * 86400)))  # 0 disables the cache
+    OCR_UPLOAD_CONCURRENCY: int = int(os.getenv("OCR_UPLOAD_CONCURRENCY", "2"))  # Uploads recognized at once per API process
+    
+    # Images handed to Celery tasks (claim check: tasks carry only the content hash)
+    TASK_BLOB_DIR: str = os.getenv("TASK_BLOB_DIR", "uploads/task_blobs")  # Shared by API and workers
+    TASK_BLOB_TTL: int = int(os.getenv("TASK_BLOB_TTL", "86400"))  # Unclaimed blobs are removed after this many seconds
+    
+    # OCR inference server (empty address = load models in-process)
+    OCR_INFERENCE_ADDRESS: str = os.getenv("OCR_INFERENCE_ADDRESS", "")  # unix socket path or internal host:port
+    OCR_INFERENCE_WORKERS: int = int(os.getenv("OCR_INFERENCE_WORKERS", "2"))
+    OCR_INFERENCE_AUTHKEY: str = os.getenv("OCR_INFERENCE_AUTHKEY", "")  # required with OCR_INFERENCE_ADDRESS
+    OCR_INFERENCE_TIMEOUT: float = float(os.getenv("OCR_INFERENCE_TIMEOUT", "120"))
+    
+    # Admin statistics overview cache (also invalidated on every contact change)
+    STATISTICS_CACHE_TTL: int = int(os.getenv("STATISTICS_CACHE_TTL", "3600"))
+    
+    # App/system settings are served from memory; reloaded after every settings change
+    # (any process, within CACHE_L1_TTL) and at the latest after this many seconds
+    SETTINGS_CACHE_TTL: float = float(os.getenv("SETTINGS_CACHE_TTL", "300"))
+    
+    # Authenticated users (principals) are cached this long in Redis; dropped on user/2FA changes
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+    # ...and this long in each process's L1, which bounds how late other processes see a
+    # deactivation, role or 2FA change (0 = read Redis on every request)
+    PRINCIPAL_CACHE_L1_TTL: int = int(os.getenv("PRINCIPAL_CACHE_L1_TTL", "1"))
+    
+    # Contact gauges are maintained incrementally and reconciled with COUNT(*) this often
+    CONTACT_METRICS_RECONCILE_INTERVAL: float = float(os.getenv("CONTACT_METRICS_RECONCILE_INTERVAL", "300"))
+    
+    # Monitoring dashboard (background sampler)
+    MONITORING_SAMPLE_INTERVAL: float = float(os.getenv("MONITORING_SAMPLE_INTERVAL", "15"))  # Seconds between samples
+    MONITORING_PROBE_TIMEOUT: float = float(os.getenv("MONITORING_PROBE_TIMEOUT", "5"))  # Per-probe timeout
     
     # Security
     CORS_ORIGINS: list = [
@@ -0,0 +1,265 @@
+"""
+Duplicate contact matching.
+
+Candidates are found through blocking keys and MinHash/LSH instead of
+comparing every pair of contacts:
+- blocking keys: phone digits, email address, email local part, corporate
+  email domain + name token, normalized (transliterated) full name
+- MinHash signatures over character 3-grams of name + company, split into
+  LSH bands; contacts sharing a band are candidates
+
+Only candidates are scored, so a full sweep stays near-linear in the number
+of contacts.
+"""
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+
+# Contact columns a fingerprint is built from
+FINGERPRINT_FIELDS = (
+    'full_name', 'first_name', 'last_name', 'middle_name', 'company', 'email',
+    'phone', 'phone_mobile', 'phone_work', 'phone_additional',
+)
+PHONE_FIELDS = ('phone', 'phone_mobile', 'phone_work', 'phone_additional')
+
+# Field weights of the similarity score (fields missing on either side are left out)
+FIELD_WEIGHTS = {'name': 0.4, 'company': 0.2, 'email': 0.2, 'phone': 0.2}
+
+# A field similarity at least this high is reported as matched
+MATCHED_FIELD_SIMILARITY = 0.8
+
+# MinHash/LSH: 16 bands x 4 rows -> pairs above ~0.5 Jaccard become candidates
+NUM_PERM = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 3
+
+# Larger blocks (shared office phone, common name) are not expanded into pairs
+MAX_BLOCK_SIZE = 50
+
+# Universal hashing (a * h + b) mod p; with p < 2**32 the products fit in uint64
+_PRIME = np.uint64(4294967291)
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+_TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'iu', 'я': 'ia',
+})
+
+# Legal forms dropped from company names
+COMPANY_STOPWORDS = {
+    'ooo', 'oao', 'zao', 'pao', 'ao', 'ip', 'nko', 'gk',
+    'llc', 'inc', 'ltd', 'gmbh', 'co', 'corp', 'company', 'group',
+}
+
+# Personal mailboxes: the domain says nothing about the company
+FREE_MAIL_DOMAINS = {
+    'gmail.com', 'mail.ru', 'yandex.ru', 'ya.ru', 'bk.ru', 'list.ru', 'inbox.ru',
+    'rambler.ru', 'outlook.com', 'hotmail.com', 'yahoo.com', 'icloud.com', 'me.com',
+}
+
+# Shared mailboxes: the local part says nothing about the person
+GENERIC_LOCAL_PARTS = {
+    'info', 'sales', 'office', 'mail', 'contact', 'contacts', 'support',
+    'hello', 'admin', 'hr', 'reception', 'secretary', 'post',
+}
+
+
+def normalize_tokens(text: Optional[str]) -> List[str]:
+    """Lower-case, transliterate Cyrillic to Latin and split into alphanumeric tokens"""
+    if not text:
+        return []
+    return re.findall(r'[a-z0-9]+', str(text).lower().translate(_TRANSLIT))
+
+
+def phone_key(phone: Optional[str]) -> Optional[str]:
+    """Last 10 digits of a phone number (drops the country prefix / trunk 8), None if too short"""
+    digits = re.sub(r'\D', '', str(phone or ''))
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+@dataclass
+class ContactFingerprint:
+    """Normalized view of a contact used for blocking and scoring"""
+    id: int
+    name_tokens: FrozenSet[str] = frozenset()
+    name_key: str = ''
+    company_key: str = ''
+    email: str = ''
+    phones: FrozenSet[str] = frozenset()
+    signature: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @classmethod
+    def from_fields(cls, contact_id: int, fields: Mapping[str, Optional[str]]) -> 'ContactFingerprint':
+        """
+        Build a fingerprint from contact column values.
+
+        Args:
+            contact_id: Contact ID (any unique value for a contact not saved yet)
+            fields: Values keyed by FINGERPRINT_FIELDS (missing keys are treated as empty)
+        """
+        name_tokens = normalize_tokens(fields.get('full_name'))
+        if not name_tokens:
+            name_tokens = normalize_tokens(' '.join(
+                fields.get(f) or '' for f in ('last_name', 'first_name', 'middle_name')
+            ))
+        company_tokens = [t for t in normalize_tokens(fields.get('company')) if t not in COMPANY_STOPWORDS]
+
+        name_key = ' '.join(sorted(name_tokens))
+        company_key = ' '.join(company_tokens)
+        return cls(
+            id=contact_id,
+            name_tokens=frozenset(name_tokens),
+            name_key=name_key,
+            company_key=company_key,
+            email=(fields.get('email') or '').strip().lower(),
+            phones=frozenset(p for p in (phone_key(fields.get(f)) for f in PHONE_FIELDS) if p),
+            signature=minhash_signature(f"{name_key} {company_key}".strip()),
+        )
+
+    def blocking_keys(self) -> Set[Hashable]:
+        """Exact-match keys; contacts sharing any key are candidates"""
+        keys: Set[Hashable] = {('phone', p) for p in self.phones}
+
+        if '@' in self.email:
+            local, domain = self.email.rsplit('@', 1)
+            keys.add(('email', self.email))
+            if local not in GENERIC_LOCAL_PARTS and len(local) >= 4:
+                keys.add(('email_local', local))
+            if domain not in FREE_MAIL_DOMAINS:
+                keys.update(('domain_name', domain, t) for t in self.name_tokens if len(t) >= 3)
+
+        if len(self.name_tokens) >= 2:
+            keys.add(('name', self.name_key))
+        return keys
+
+    def lsh_keys(self) -> Set[Hashable]:
+        """One key per LSH band of the MinHash signature"""
+        if self.signature is None:
+            return set()
+        rows = NUM_PERM // LSH_BANDS
+        return {
+            ('band', band, self.signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(LSH_BANDS)
+        }
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of the character shingles of ``text`` (None for empty text)"""
+    if not text:
+        return None
+    padded = f" {text} "
+    shingles = {padded[i:i + SHINGLE_SIZE] for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles)) % _PRIME
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _PRIME
+    return permuted.min(axis=0)
+
+
+def _text_similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def similarity(a: ContactFingerprint, b: ContactFingerprint) -> Tuple[float, List[str]]:
+    """
+    Weighted similarity of two contacts.
+
+    Returns:
+        (score 0..1, names of the fields that matched)
+    """
+    scores: Dict[str, float] = {}
+    if a.name_tokens and b.name_tokens:
+        token_overlap = len(a.name_tokens & b.name_tokens) / len(a.name_tokens | b.name_tokens)
+        scores['name'] = max(token_overlap, _text_similarity(a.name_key, b.name_key))
+    if a.company_key and b.company_key:
+        scores['company'] = _text_similarity(a.company_key, b.company_key)
+    if a.email and b.email:
+        scores['email'] = 1.0 if a.email == b.email else 0.0
+    if a.phones and b.phones:
+        scores['phone'] = 1.0 if a.phones & b.phones else 0.0
+
+    if not scores:
+        return 0.0, []
+    total_weight = sum(FIELD_WEIGHTS[f] for f in scores)
+    score = sum(FIELD_WEIGHTS[f] * s for f, s in scores.items()) / total_weight
+    return score, [f for f, s in scores.items() if s >= MATCHED_FIELD_SIMILARITY]
+
+
+@dataclass
+class DuplicateMatch:
+    """A scored candidate pair (contact_id < duplicate_id for sweep results)"""
+    contact_id: int
+    duplicate_id: int
+    score: float
+    matched_fields: List[str]
+
+
+class DuplicateIndex:
+    """
+    In-memory blocking/LSH index over contact fingerprints.
+
+    ``add`` all contacts, then ``find_pairs`` for a sweep or ``find_matches``
+    for one contact.
+    """
+
+    def __init__(self, max_block_size: int = MAX_BLOCK_SIZE):
+        self.max_block_size = max_block_size
+        self._fingerprints: Dict[int, ContactFingerprint] = {}
+        self._blocks: Dict[Hashable, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, fingerprint: ContactFingerprint):
+        self._fingerprints[fingerprint.id] = fingerprint
+        for key in fingerprint.blocking_keys() | fingerprint.lsh_keys():
+            self._blocks[key].append(fingerprint.id)
+
+    def add_all(self, fingerprints: Iterable[ContactFingerprint]):
+        for fingerprint in fingerprints:
+            self.add(fingerprint)
+
+    def candidate_pairs(self) -> Set[Tuple[int, int]]:
+        """Pairs of contact IDs sharing at least one (not oversized) block"""
+        pairs: Set[Tuple[int, int]] = set()
+        for ids in self._blocks.values():
+            if len(ids) < 2 or len(ids) > self.max_block_size:
+                continue
+            ordered = sorted(ids)
+            for i, first in enumerate(ordered):
+                for second in ordered[i + 1:]:
+                    pairs.add((first, second))
+        return pairs
+
+    def find_pairs(self, threshold: float) -> List[DuplicateMatch]:
+        """All candidate pairs scoring at least ``threshold``, best first"""
+        matches = []
+        for first, second in self.candidate_pairs():
+            score, matched = similarity(self._fingerprints[first], self._fingerprints[second])
+            if score >= threshold:
+                matches.append(DuplicateMatch(first, second, round(score, 3), matched))
+        return sorted(matches, key=lambda m: (-m.score, m.contact_id, m.duplicate_id))
+
+    def find_matches(self, fingerprint: ContactFingerprint, threshold: float) -> List[DuplicateMatch]:
+        """Indexed contacts similar to ``fingerprint`` (which need not be indexed), best first"""
+        candidates: Set[int] = set()
+        for key in fingerprint.blocking_keys() | fingerprint.lsh_keys():
+            ids = self._blocks.get(key, ())
+            if len(ids) <= self.max_block_size:
+                candidates.update(ids)
+        candidates.discard(fingerprint.id)
+
+        matches = []
+        for candidate_id in candidates:
+            score, matched = similarity(fingerprint, self._fingerprints[candidate_id])
+            if score >= threshold:
+                matches.append(DuplicateMatch(fingerprint.id, candidate_id, round(score, 3), matched))
+        return sorted(matches, key=lambda m: (-m.score, m.duplicate_id))
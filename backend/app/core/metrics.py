@@ -25,6 +25,12 @@ qr_scan_counter = Counter(
     ['status']
 )
 
+ocr_result_cache_counter = Counter(
+    'ocr_result_cache_total',
+    'Content-addressed OCR result cache lookups',
+    ['result']  # hit, miss
+)
+
 
 # ==============================================================================
 # CONTACT MANAGEMENT METRICS
@@ -90,3 +90,52 @@ def normalize_phone_for_search(phone: str) -> str:
     
     return clean
 
+
+
+def format_phone_series(phones):
+    """
+    Vectorized ``format_phone_number`` for a pandas Series (bulk import).
+    
+    Applies the same rules column-wise with pandas string operations
+    instead of one Python call per row.
+    
+    Args:
+        phones: pandas Series of phone strings (NaN/None allowed)
+    
+    Returns:
+        Series of formatted numbers ('' where the input was empty)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    raw = pd.Series(phones, dtype=object).fillna('').astype(str)
+    clean = raw.str.replace(r'[^\d+]', '', regex=True)
+    has_plus = clean.str.startswith('+')
+    digits = clean.str.lstrip('+')
+    length = digits.str.len()
+    first = digits.str[:1]
+    
+    # +7 (XXX) XXX-XX-XX from the 10 national digits
+    def russian(national):
+        return '+7 (' + national.str[0:3] + ') ' + national.str[3:6] + '-' + national.str[6:8] + '-' + national.str[8:10]
+    
+    rest = digits.str[-10:]
+    conditions = [
+        (clean == '') | (clean == '+'),
+        first.isin(['7', '8']) & (length == 11),
+        ~has_plus & (length == 10),
+        (length == 11) & (first == '1'),
+        length >= 11,
+        length >= 10,
+        has_plus,
+    ]
+    choices = [
+        '',
+        russian(digits.str[1:]),
+        russian(digits),
+        '+1 (' + digits.str[1:4] + ') ' + digits.str[4:7] + '-' + digits.str[7:11],
+        '+' + digits.str[:-10] + ' (' + rest.str[0:3] + ') ' + rest.str[3:6] + '-' + rest.str[6:10],
+        '+' + digits,
+        '+' + digits,
+    ]
+    return pd.Series(np.select(conditions, choices, default=digits), index=raw.index, dtype=object)
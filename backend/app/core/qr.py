@@ -4,30 +4,36 @@ QR Code scanning and vCard/MeCard parsing utilities.
 import io
 import re
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from PIL import Image
 import cv2
 import numpy as np
 from pyzbar.pyzbar import decode
 
+from .card_image import CardImage
+
 logger = logging.getLogger(__name__)
 
 
-def scan_qr_code(image_bytes: bytes) -> Optional[str]:
+def scan_qr_code(image_bytes: Union[bytes, CardImage]) -> Optional[str]:
     """
-    Scan QR code from image bytes.
+    Scan QR code from image bytes or an already decoded CardImage.
     Returns decoded string or None if no QR code found.
     """
     try:
-        # Convert bytes to PIL Image
-        img = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert to RGB if needed
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # Convert PIL Image to numpy array for pyzbar
-        img_array = np.array(img)
+        if isinstance(image_bytes, CardImage):
+            # Decoded CardImage: reuse its grayscale buffer (pyzbar works on 8-bit)
+            img_array = image_bytes.gray()
+        else:
+            # Convert bytes to PIL Image
+            img = Image.open(io.BytesIO(image_bytes))
+            
+            # Convert to RGB if needed
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # Convert PIL Image to numpy array for pyzbar
+            img_array = np.array(img)
         
         # Decode QR codes
         decoded_objects = decode(img_array)
@@ -283,9 +289,10 @@ def extract_contact_from_qr(qr_data: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def process_image_with_qr(image_bytes: bytes) -> Optional[Dict[str, Any]]:
+def process_image_with_qr(image_bytes: Union[bytes, CardImage]) -> Optional[Dict[str, Any]]:
     """
     Main function: scan QR code and extract contact data.
+    Accepts image bytes or a decoded CardImage.
     Returns dict with contact fields or None if no valid QR found.
     """
     try:
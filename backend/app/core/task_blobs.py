@@ -0,0 +1,92 @@
+"""
+Task blobs (claim check for Celery payloads)
+
+Images handed to a Celery task are written once to a shared directory,
+named by their SHA-256, and the task message carries only that key. The
+broker and result backend never see the image bytes; the worker opens the
+file directly (memory-mapped, see CardImage.from_file).
+
+Identical uploads share one blob. Blobs are not deleted by the task that
+used them (another queued task may hold the same key); the periodic
+cleanup removes those older than TASK_BLOB_TTL.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def blob_path(key: str) -> str:
+    """
+    Path of the blob stored under ``key``.
+
+    Raises:
+        ValueError: ``key`` is not a SHA-256 hex digest
+    """
+    if not _KEY_RE.match(key or ''):
+        raise ValueError(f"Invalid blob key: {key!r}")
+    return os.path.join(settings.TASK_BLOB_DIR, key[:2], key)
+
+
+def put_blob(data: bytes) -> str:
+    """
+    Store ``data`` (once per content) and return its key.
+
+    A re-upload of existing content refreshes the blob's age.
+    """
+    key = hashlib.sha256(data).hexdigest()
+    path = blob_path(key)
+    if os.path.exists(path):
+        os.utime(path)
+        return key
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temp file and rename, so a worker never sees a partial blob
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return key
+
+
+def delete_expired_blobs(max_age: Optional[float] = None) -> int:
+    """
+    Remove blobs (and stale temp files) older than ``max_age`` seconds.
+
+    Returns:
+        Number of files removed
+    """
+    max_age = settings.TASK_BLOB_TTL if max_age is None else max_age
+    if not os.path.isdir(settings.TASK_BLOB_DIR):
+        return 0
+
+    cutoff = time.time() - max_age
+    removed = 0
+    for shard in os.scandir(settings.TASK_BLOB_DIR):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+    if removed:
+        logger.info(f"✅ Removed {removed} expired task blobs")
+    return removed
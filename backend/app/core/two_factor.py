@@ -341,8 +341,10 @@ def is_2fa_enabled(db: Session, user: User) -> bool:
     Returns:
         True if 2FA is enabled, False otherwise
     """
-    two_fa = db.query(TwoFactorAuth).filter(TwoFactorAuth.user_id == user.id).first()
-    return two_fa is not None and two_fa.is_enabled
+    from ..repositories.principal_cache import principal_cache
+    
+    principal = principal_cache.principal(db, user.username)
+    return principal is not None and principal['two_factor_enabled']
 
 
 def get_unused_backup_codes_count(db: Session, user: User) -> int:
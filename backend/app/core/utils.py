@@ -32,11 +32,10 @@ def create_audit_log(
 
 
 def get_setting(db: Session, key: str, default: Optional[str] = None) -> Optional[str]:
-    """Get an app setting value."""
-    from ..models import AppSetting
+    """Get an app setting value (served from the in-memory settings cache)."""
+    from ..repositories.settings_cache import settings_cache
     
-    row = db.query(AppSetting).filter(AppSetting.key == key).first()
-    return row.value if row else default
+    return settings_cache.get(db, key, default)
 
 
 def set_setting(db: Session, key: str, value: Optional[str]):
@@ -53,11 +52,10 @@ def set_setting(db: Session, key: str, value: Optional[str]):
 
 
 def get_system_setting(db: Session, key: str, default: Optional[str] = None) -> Optional[str]:
-    """Get a system setting value."""
-    from ..models import SystemSettings
+    """Get a system setting value (served from the in-memory settings cache)."""
+    from ..repositories.settings_cache import settings_cache
     
-    row = db.query(SystemSettings).filter(SystemSettings.key == key).first()
-    return row.value if row else default
+    return settings_cache.get_system(db, key, default)
 
 
 def set_system_setting(db: Session, key: str, value: Optional[str]):
@@ -4,10 +4,14 @@ Document understanding with layout and visual features
 """
 from .classifier import LayoutLMv3Classifier
 from .config import LayoutLMConfig, BUSINESS_CARD_LABELS
+from .batching import LayoutLMMicroBatcher, bucket_by_length, word_level_predictions
 
 __all__ = [
     'LayoutLMv3Classifier',
     'LayoutLMConfig',
     'BUSINESS_CARD_LABELS',
+    'LayoutLMMicroBatcher',
+    'bucket_by_length',
+    'word_level_predictions',
 ]
 
@@ -0,0 +1,146 @@
+"""
+LayoutLMv3 batching helpers
+Padding-aware bucketing, token-to-word label mapping and worker-side
+micro-batching of classification requests
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def bucket_by_length(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    """
+    Group item indices into buckets of similar token length.
+
+    Items are sorted by length and cut into buckets of at most ``batch_size``,
+    so every bucket is padded only to its own longest item instead of the
+    model's ``max_length``.
+
+    Args:
+        lengths: Token length per item
+        batch_size: Maximum items per bucket
+
+    Returns:
+        List of buckets, each a list of indices into ``lengths``
+    """
+    batch_size = max(1, batch_size)
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def word_level_predictions(
+    word_ids: Sequence[Optional[int]],
+    predictions: Sequence[int],
+    num_words: int,
+    confidences: Optional[Sequence[float]] = None,
+    outside_label: int = 0
+) -> Tuple[List[int], List[float]]:
+    """
+    Map token-level predictions of one encoded item back to its words.
+
+    The first sub-token of a word wins. Words cut off by truncation get
+    ``outside_label`` with zero confidence.
+
+    Args:
+        word_ids: ``encoding.word_ids(row)`` (None for special/padding tokens)
+        predictions: Label id per token
+        num_words: Number of words of the item
+        confidences: Confidence per token (all zero if not given)
+        outside_label: Label id of 'O'
+
+    Returns:
+        (label id per word, confidence per word)
+    """
+    word_predictions = [outside_label] * num_words
+    word_confidences = [0.0] * num_words
+    seen = set()
+    for token_idx, word_id in enumerate(word_ids):
+        if word_id is None or word_id in seen or word_id >= num_words:
+            continue
+        seen.add(word_id)
+        word_predictions[word_id] = predictions[token_idx]
+        if confidences is not None:
+            word_confidences[word_id] = confidences[token_idx]
+    return word_predictions, word_confidences
+
+
+class LayoutLMMicroBatcher:
+    """
+    Collects concurrent classification requests into one batched forward pass.
+
+    Callers block in :meth:`classify` while a single background thread waits
+    up to ``max_wait_ms`` for more requests (or until ``max_batch_size`` is
+    reached) and then runs ``classify_batch`` over all of them.
+    """
+
+    def __init__(
+        self,
+        classify_batch: Callable[[List[Tuple[Any, Any]]], List[Dict[str, Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            classify_batch: Function taking ``[(text_blocks, image), ...]`` and
+                returning one result per item (e.g. LayoutLMv3Classifier.classify_batch)
+            max_batch_size: Maximum requests per forward pass
+            max_wait_ms: How long to wait for more requests after the first one
+        """
+        self._classify_batch = classify_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[Tuple[Tuple[Any, Any], Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def classify(self, text_blocks: Any, image: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Classify one card, sharing the forward pass with concurrent callers."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put(((text_blocks, image), future))
+        return future.result(timeout=timeout)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="layoutlm-microbatch", daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self) -> List[Tuple[Tuple[Any, Any], Future]]:
+        """Block for the first request, then gather more within the wait window."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self._classify_batch(items)
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"classify_batch returned {len(results)} results for {len(batch)} items"
+                    )
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"LayoutLMv3 micro-batch of {len(batch)} failed: {e}", exc_info=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
@@ -3,13 +3,14 @@ LayoutLMv3 Classifier
 Classifies OCR text blocks into business card fields using layout understanding
 """
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from PIL import Image
 import torch
 from transformers import AutoProcessor, AutoModelForTokenClassification
 import numpy as np
 
 from .config import LayoutLMConfig, BUSINESS_CARD_LABELS, LABEL_TO_NAME, FIELD_AGGREGATION
+from .batching import bucket_by_length, word_level_predictions
 from ..ocr.providers_v2.base import TextBlock, BoundingBox
 
 logger = logging.getLogger(__name__)
@@ -81,56 +82,110 @@ class LayoutLMv3Classifier:
         Returns:
             Dictionary with classified fields and confidence scores
         """
+        return self.classify_batch([(text_blocks, image)])[0]
+    
+    def classify_batch(
+        self,
+        items: List[Tuple[List[TextBlock], Image.Image]],
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Classifies several cards with batched forward passes.
+        
+        Cards are grouped into buckets of similar token length, each bucket is
+        padded once to its own longest card and run through the model together.
+        
+        Args:
+            items: List of (text_blocks, image) pairs, one per card
+            batch_size: Cards per forward pass (default: config.inference_batch_size)
+        
+        Returns:
+            One classification result per card, in input order
+        """
+        if not items:
+            return []
+        
         if not self.is_available():
             logger.warning("LayoutLMv3 model not available, using fallback classification")
-            return self._fallback_classification(text_blocks)
+            return [self._fallback_classification(blocks) for blocks, _ in items]
+        
+        batch_size = batch_size or self.config.inference_batch_size
         
         try:
-            # Prepare input for LayoutLMv3
-            words = [block.text for block in text_blocks]
-            boxes = [
-                [block.bbox.x, block.bbox.y, block.bbox.x2, block.bbox.y2]
-                for block in text_blocks
-            ]
+            results: List[Optional[Dict[str, Any]]] = [None] * len(items)
             
-            # Normalize boxes to [0, 1000] range as required by LayoutLMv3
-            img_width, img_height = image.size
-            normalized_boxes = self._normalize_boxes(boxes, img_width, img_height)
+            # Prepare words and normalized boxes (LayoutLMv3 expects [0, 1000] range)
+            prepared = {}
+            for idx, (text_blocks, image) in enumerate(items):
+                if not text_blocks:
+                    results[idx] = self._fallback_classification(text_blocks)
+                    continue
+                words = [block.text for block in text_blocks]
+                boxes = [
+                    [block.bbox.x, block.bbox.y, block.bbox.x2, block.bbox.y2]
+                    for block in text_blocks
+                ]
+                img_width, img_height = image.size
+                prepared[idx] = (words, self._normalize_boxes(boxes, img_width, img_height))
             
-            # Prepare encoding
-            encoding = self.processor(
-                image,
-                words,
-                boxes=normalized_boxes,
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=self.config.max_length
-            )
-            
-            # Move to device
-            encoding = {k: v.to(self.device) for k, v in encoding.items()}
+            # Token length per card (text only, cheap) for padding-aware bucketing
+            indices = list(prepared.keys())
+            lengths = [
+                len(self.processor.tokenizer(
+                    prepared[idx][0],
+                    boxes=prepared[idx][1],
+                    truncation=True,
+                    max_length=self.config.max_length
+                )['input_ids'])
+                for idx in indices
+            ]
             
-            # Inference
-            with torch.no_grad():
-                outputs = self.model(**encoding)
-                predictions = outputs.logits.argmax(-1).squeeze().tolist()
+            buckets = bucket_by_length(lengths, batch_size)
+            for bucket in buckets:
+                bucket_indices = [indices[i] for i in bucket]
                 
-                # Get confidence scores
-                probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                confidences = probabilities.max(-1).values.squeeze().tolist()
+                # Pad once per bucket (to the longest card in it, not max_length)
+                encoding = self.processor(
+                    [items[idx][1].convert('RGB') for idx in bucket_indices],
+                    [prepared[idx][0] for idx in bucket_indices],
+                    boxes=[prepared[idx][1] for idx in bucket_indices],
+                    return_tensors="pt",
+                    padding="longest",
+                    truncation=True,
+                    max_length=self.config.max_length
+                )
+                
+                # Move to device
+                inputs = {k: v.to(self.device) for k, v in encoding.items()}
+                
+                # Inference
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                    probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
+                    confidences, predictions = probabilities.max(-1)
+                
+                for row, idx in enumerate(bucket_indices):
+                    words = prepared[idx][0]
+                    word_predictions, word_confidences = word_level_predictions(
+                        encoding.word_ids(row),
+                        predictions[row].tolist(),
+                        len(words),
+                        confidences=confidences[row].tolist(),
+                        outside_label=BUSINESS_CARD_LABELS['O']
+                    )
+                    results[idx] = self._aggregate_predictions(
+                        words, word_predictions, word_confidences, items[idx][0]
+                    )
             
-            # Convert predictions to field names
-            classified_fields = self._aggregate_predictions(
-                words, predictions, confidences, text_blocks
+            logger.info(
+                f"LayoutLMv3 classification completed for {len(items)} card(s) "
+                f"in {len(buckets)} batch(es)"
             )
-            
-            logger.info(f"LayoutLMv3 classification completed for {len(text_blocks)} blocks")
-            return classified_fields
+            return results
             
         except Exception as e:
             logger.error(f"LayoutLMv3 classification failed: {e}", exc_info=True)
-            return self._fallback_classification(text_blocks)
+            return [self._fallback_classification(blocks) for blocks, _ in items]
     
     def _normalize_boxes(
         self,
@@ -57,6 +57,10 @@ class LayoutLMConfig:
     confidence_threshold: float = 0.7
     use_gpu: bool = False  # Set to True if GPU available
     
+    # Batched inference settings
+    inference_batch_size: int = 8  # Cards per forward pass (bucketed by token length)
+    max_batch_wait_ms: float = 5.0  # Micro-batching window for concurrent requests
+    
     # Fine-tuned model path (if available)
     fine_tuned_path: str = None
     
@@ -5,6 +5,7 @@ Functions:
 - auto_crop_card: Automatically detect and crop business card from image
 - detect_multiple_cards: Detect and extract multiple business cards from single image
 - enhance_image: Pre-process image for better OCR results
+- process_card_image: Same pipeline on a decoded CardImage (decode-once upload path)
 """
 
 import cv2
@@ -14,6 +15,8 @@ import io
 from typing import List, Tuple, Optional
 import logging
 
+from ...core.card_image import CardImage
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +41,56 @@ def cv2_to_bytes(img: np.ndarray, format: str = '.jpg', quality: int = 95) -> by
         raise Exception("Failed to encode image")
 
 
+def _find_card_rect(img: np.ndarray, margin: int = 10) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Find bounding rectangle (x, y, w, h) of the card in a decoded image.
+    
+    Returns None if no sufficiently large contour is found.
+    """
+    original_height, original_width = img.shape[:2]
+    
+    # Convert to grayscale
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    
+    # Apply Gaussian blur to reduce noise
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    
+    # Edge detection
+    edges = cv2.Canny(blurred, 50, 150)
+    
+    # Dilate edges to connect nearby contours
+    kernel = np.ones((5, 5), np.uint8)
+    dilated = cv2.dilate(edges, kernel, iterations=2)
+    
+    # Find contours
+    contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    if not contours:
+        logger.warning("No contours found, returning original image")
+        return None
+    
+    # Find the largest contour (likely the card)
+    largest_contour = max(contours, key=cv2.contourArea)
+    contour_area = cv2.contourArea(largest_contour)
+    
+    # If contour is too small (< 10% of image), don't crop
+    min_area = original_width * original_height * 0.1
+    if contour_area < min_area:
+        logger.warning(f"Largest contour too small ({contour_area} < {min_area}), returning original")
+        return None
+    
+    # Get bounding rectangle
+    x, y, w, h = cv2.boundingRect(largest_contour)
+    
+    # Add margin
+    x = max(0, x - margin)
+    y = max(0, y - margin)
+    w = min(original_width - x, w + 2 * margin)
+    h = min(original_height - y, h + 2 * margin)
+    
+    return x, y, w, h
+
+
 def auto_crop_card(image_bytes: bytes, margin: int = 10) -> bytes:
     """
     Automatically detect and crop business card boundaries.
@@ -64,44 +117,10 @@ def auto_crop_card(image_bytes: bytes, margin: int = 10) -> bytes:
         
         original_height, original_width = img.shape[:2]
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        
-        # Edge detection
-        edges = cv2.Canny(blurred, 50, 150)
-        
-        # Dilate edges to connect nearby contours
-        kernel = np.ones((5, 5), np.uint8)
-        dilated = cv2.dilate(edges, kernel, iterations=2)
-        
-        # Find contours
-        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if not contours:
-            logger.warning("No contours found, returning original image")
-            return image_bytes
-        
-        # Find the largest contour (likely the card)
-        largest_contour = max(contours, key=cv2.contourArea)
-        contour_area = cv2.contourArea(largest_contour)
-        
-        # If contour is too small (< 10% of image), don't crop
-        min_area = original_width * original_height * 0.1
-        if contour_area < min_area:
-            logger.warning(f"Largest contour too small ({contour_area} < {min_area}), returning original")
+        rect = _find_card_rect(img, margin=margin)
+        if rect is None:
             return image_bytes
-        
-        # Get bounding rectangle
-        x, y, w, h = cv2.boundingRect(largest_contour)
-        
-        # Add margin
-        x = max(0, x - margin)
-        y = max(0, y - margin)
-        w = min(original_width - x, w + 2 * margin)
-        h = min(original_height - y, h + 2 * margin)
+        x, y, w, h = rect
         
         # Crop image
         cropped = img[y:y+h, x:x+w]
@@ -124,6 +143,74 @@ def auto_crop_card(image_bytes: bytes, margin: int = 10) -> bytes:
         return image_bytes
 
 
+def _find_card_rects(img: np.ndarray, min_card_area_ratio: float = 0.05) -> List[Tuple[int, int, int, int]]:
+    """
+    Find crop rectangles (x, y, w, h) of business cards in a decoded image.
+    
+    Returns an empty list if no card-shaped contour is found. A single card is
+    returned without margin; multiple cards get a small margin (max 5 cards).
+    """
+    original_height, original_width = img.shape[:2]
+    total_area = original_width * original_height
+    min_card_area = total_area * min_card_area_ratio
+    
+    # Convert to grayscale
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    
+    # Apply Gaussian blur
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    
+    # Edge detection
+    edges = cv2.Canny(blurred, 30, 150)
+    
+    # Dilate edges
+    kernel = np.ones((5, 5), np.uint8)
+    dilated = cv2.dilate(edges, kernel, iterations=1)
+    
+    # Find contours
+    contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    # Filter contours by area and aspect ratio
+    card_contours = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        
+        # Skip if too small
+        if area < min_card_area:
+            continue
+        
+        # Get bounding rectangle
+        x, y, w, h = cv2.boundingRect(contour)
+        
+        # Business cards typically have aspect ratio between 1.5:1 and 2:1
+        aspect_ratio = max(w, h) / min(w, h)
+        if 1.3 <= aspect_ratio <= 2.2:
+            card_contours.append((x, y, w, h, area))
+    
+    # Sort contours by area (largest first)
+    card_contours.sort(key=lambda c: c[4], reverse=True)
+    
+    if len(card_contours) == 0:
+        return []
+    
+    # If only one card detected, just crop it
+    if len(card_contours) == 1:
+        x, y, w, h, _ = card_contours[0]
+        return [(x, y, w, h)]
+    
+    # Multiple cards detected - add small margin to each one
+    rects = []
+    for x, y, w, h, area in card_contours[:5]:  # Limit to 5 cards max
+        margin = 5
+        x = max(0, x - margin)
+        y = max(0, y - margin)
+        w = min(original_width - x, w + 2 * margin)
+        h = min(original_height - y, h + 2 * margin)
+        rects.append((x, y, w, h))
+    
+    return rects
+
+
 def detect_multiple_cards(image_bytes: bytes, min_card_area_ratio: float = 0.05) -> List[bytes]:
     """
     Detect and extract multiple business cards from a single image.
@@ -149,74 +236,18 @@ def detect_multiple_cards(image_bytes: bytes, min_card_area_ratio: float = 0.05)
             logger.warning("Failed to decode image for multi-card detection")
             return [image_bytes]
         
-        original_height, original_width = img.shape[:2]
-        total_area = original_width * original_height
-        min_card_area = total_area * min_card_area_ratio
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Apply Gaussian blur
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        
-        # Edge detection
-        edges = cv2.Canny(blurred, 30, 150)
-        
-        # Dilate edges
-        kernel = np.ones((5, 5), np.uint8)
-        dilated = cv2.dilate(edges, kernel, iterations=1)
-        
-        # Find contours
-        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        # Filter contours by area and aspect ratio
-        card_contours = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            
-            # Skip if too small
-            if area < min_card_area:
-                continue
-            
-            # Get bounding rectangle
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Business cards typically have aspect ratio between 1.5:1 and 2:1
-            aspect_ratio = max(w, h) / min(w, h)
-            if 1.3 <= aspect_ratio <= 2.2:
-                card_contours.append((x, y, w, h, area))
-        
-        # Sort contours by area (largest first)
-        card_contours.sort(key=lambda c: c[4], reverse=True)
+        rects = _find_card_rects(img, min_card_area_ratio)
         
         # If no cards detected, return original image
-        if len(card_contours) == 0:
+        if not rects:
             logger.info("No business cards detected, returning original image")
             return [image_bytes]
         
-        # If only one card detected, just crop it
-        if len(card_contours) == 1:
-            x, y, w, h, _ = card_contours[0]
-            cropped = img[y:y+h, x:x+w]
-            logger.info(f"Single card detected and cropped: {w}x{h}")
-            return [cv2_to_bytes(cropped)]
-        
-        # Multiple cards detected - extract each one
         extracted_cards = []
-        for i, (x, y, w, h, area) in enumerate(card_contours[:5]):  # Limit to 5 cards max
-            # Add small margin
-            margin = 5
-            x = max(0, x - margin)
-            y = max(0, y - margin)
-            w = min(original_width - x, w + 2 * margin)
-            h = min(original_height - y, h + 2 * margin)
-            
-            # Extract card
+        for i, (x, y, w, h) in enumerate(rects):
             card_img = img[y:y+h, x:x+w]
-            card_bytes = cv2_to_bytes(card_img)
-            extracted_cards.append(card_bytes)
-            
-            logger.info(f"Card {i+1} extracted: {w}x{h} ({area} px²)")
+            extracted_cards.append(cv2_to_bytes(card_img))
+            logger.info(f"Card {i+1} extracted: {w}x{h}")
         
         logger.info(f"Detected and extracted {len(extracted_cards)} business cards")
         return extracted_cards
@@ -226,6 +257,28 @@ def detect_multiple_cards(image_bytes: bytes, min_card_area_ratio: float = 0.05)
         return [image_bytes]
 
 
+def _enhance_pixels(img: np.ndarray) -> np.ndarray:
+    """Denoise, equalize and sharpen a decoded image (returns BGR)."""
+    # Convert to grayscale
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    
+    # Apply denoising
+    denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+    
+    # Apply adaptive histogram equalization for better contrast
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(denoised)
+    
+    # Sharpen
+    kernel = np.array([[-1,-1,-1], 
+                      [-1, 9,-1], 
+                      [-1,-1,-1]])
+    sharpened = cv2.filter2D(enhanced, -1, kernel)
+    
+    # Convert back to BGR for consistency
+    return cv2.cvtColor(sharpened, cv2.COLOR_GRAY2BGR)
+
+
 def enhance_image_for_ocr(image_bytes: bytes) -> bytes:
     """
     Enhance image quality for better OCR results.
@@ -247,26 +300,7 @@ def enhance_image_for_ocr(image_bytes: bytes) -> bytes:
         if img is None:
             return image_bytes
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Apply denoising
-        denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-        
-        # Apply adaptive histogram equalization for better contrast
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(denoised)
-        
-        # Sharpen
-        kernel = np.array([[-1,-1,-1], 
-                          [-1, 9,-1], 
-                          [-1,-1,-1]])
-        sharpened = cv2.filter2D(enhanced, -1, kernel)
-        
-        # Convert back to BGR for consistency
-        result = cv2.cvtColor(sharpened, cv2.COLOR_GRAY2BGR)
-        
-        return cv2_to_bytes(result)
+        return cv2_to_bytes(_enhance_pixels(img))
         
     except Exception as e:
         logger.error(f"Error in enhance_image_for_ocr: {e}")
@@ -320,3 +354,53 @@ def process_business_card_image(image_bytes: bytes,
         logger.error(f"Error in process_business_card_image: {e}")
         return [image_bytes]
 
+
+
+def process_card_image(image: CardImage,
+                       auto_crop: bool = True,
+                       detect_multi: bool = True,
+                       enhance: bool = False) -> List[CardImage]:
+    """
+    Decode-once variant of :func:`process_business_card_image`.
+    
+    Works on an already decoded :class:`CardImage`; crops are pixel views and
+    nothing is re-encoded here (encoding happens when a card is saved).
+    
+    Args:
+        image: Decoded input image
+        auto_crop: Whether to auto-crop the card
+        detect_multi: Whether to detect multiple cards
+        enhance: Whether to enhance image for OCR
+    
+    Returns:
+        List of processed card images (1 or more)
+    """
+    try:
+        # Step 1: Detect multiple cards if enabled
+        cards = [image]
+        if detect_multi:
+            rects = _find_card_rects(image.pixels)
+            if rects:
+                cards = [image.crop(*rect) for rect in rects]
+            else:
+                logger.info("No business cards detected, using original image")
+        
+        # Step 2: Auto-crop single card (multi-cards are already cropped)
+        if auto_crop and len(cards) == 1:
+            rect = _find_card_rect(cards[0].pixels)
+            if rect is not None:
+                x, y, w, h = rect
+                logger.info(f"Applied auto-crop to single card: {cards[0].width}x{cards[0].height} -> {w}x{h}")
+                cards = [cards[0].crop(x, y, w, h)]
+        
+        # Step 3: Enhance if enabled
+        if enhance:
+            cards = [CardImage(_enhance_pixels(card.pixels)) for card in cards]
+        
+        logger.info(f"Processed {len(cards)} card(s) for OCR")
+        
+        return cards
+        
+    except Exception as e:
+        logger.error(f"Error in process_card_image: {e}")
+        return [image]
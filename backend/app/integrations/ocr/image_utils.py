@@ -4,8 +4,11 @@ Image processing utilities
 import io
 import os
 from pathlib import Path
+from typing import Optional
 from PIL import Image
 
+from ...core.card_image import CardImage
+
 
 def downscale_image_bytes(data: bytes, max_side: int = 2000) -> bytes:
     """
@@ -31,7 +34,12 @@ def downscale_image_bytes(data: bytes, max_side: int = 2000) -> bytes:
         return data
 
 
-def create_thumbnail(image_path: str, size: tuple = (200, 200), quality: int = 85) -> str:
+def create_thumbnail(
+    image_path: str,
+    size: tuple = (200, 200),
+    quality: int = 85,
+    image: Optional[CardImage] = None
+) -> str:
     """
     Create a thumbnail for the given image.
     
@@ -39,6 +47,7 @@ def create_thumbnail(image_path: str, size: tuple = (200, 200), quality: int = 8
         image_path: Path to the original image
         size: Thumbnail size (width, height), default (200, 200)
         quality: JPEG quality (1-100), default 85
+        image: Already decoded image; if given, the file is not re-read
     
     Returns:
         Path to the created thumbnail
@@ -49,6 +58,10 @@ def create_thumbnail(image_path: str, size: tuple = (200, 200), quality: int = 8
         thumb_name = f"{path_obj.stem}_thumb{path_obj.suffix}"
         thumb_path = path_obj.parent / thumb_name
         
+        if image is not None:
+            image.thumbnail(size).save(str(thumb_path), 'JPEG', quality=quality, optimize=True)
+            return str(thumb_path)
+        
         # Open image and create thumbnail
         with Image.open(image_path) as img:
             # Convert to RGB if necessary (for PNG with transparency, etc.)
@@ -0,0 +1,155 @@
+"""
+OCR inference client
+Forwards OCR v2.0 calls to the shared inference server instead of loading models in-process
+"""
+import logging
+import threading
+import time
+from multiprocessing.connection import Client
+from typing import Any, Dict, List, Optional, Union
+
+from ...core.config import settings
+from ...core.card_image import CardImage
+from .inference_server import encode_image, parse_address, require_authkey
+
+logger = logging.getLogger(__name__)
+
+# Seconds a remote pipeline fingerprint is reused before asking the server again
+PIPELINE_VERSION_TTL = 60.0
+
+
+class RemoteOCRManager:
+    """
+    Drop-in replacement for OCRManagerV2 backed by the OCR inference server.
+
+    Images are sent as encoded bytes; results come back without ``image_data``
+    and get the caller's own image re-attached, so downstream code sees the
+    same result shape as with a local manager.
+    """
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        authkey: Optional[str] = None,
+        timeout: Optional[float] = None
+    ):
+        self.address = parse_address(address or settings.OCR_INFERENCE_ADDRESS)
+        self.authkey = require_authkey(authkey or settings.OCR_INFERENCE_AUTHKEY)
+        self.timeout = timeout or settings.OCR_INFERENCE_TIMEOUT
+        self._pipeline_version: Optional[str] = None
+        self._pipeline_version_at = 0.0
+
+    def _call(self, method: str, **kwargs) -> Any:
+        try:
+            conn = Client(self.address, authkey=self.authkey)
+        except OSError as e:
+            raise RuntimeError(f"OCR inference server unavailable at {self.address}: {e}")
+
+        with conn:
+            conn.send((method, kwargs))
+            if not conn.poll(self.timeout):
+                raise TimeoutError(f"OCR inference '{method}' timed out after {self.timeout}s")
+            status, value = conn.recv()
+
+        if status != 'ok':
+            raise RuntimeError(value)
+        return value
+
+    def recognize(
+        self,
+        image_data: Union[bytes, CardImage],
+        provider_name: Optional[str] = None,
+        use_layout: bool = False,
+        filename: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Same contract as OCRManagerV2.recognize"""
+        result = self._call(
+            'recognize',
+            image_data=encode_image(image_data),
+            provider_name=provider_name,
+            use_layout=use_layout,
+            filename=filename
+        )
+        result['image_data'] = image_data
+        return result
+
+    def recognize_batch(
+        self,
+        images: List[Union[bytes, CardImage]],
+        provider_name: Optional[str] = None,
+        use_layout: bool = False,
+        filenames: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Same contract as OCRManagerV2.recognize_batch"""
+        results = self._call(
+            'recognize_batch',
+            images=[encode_image(image) for image in images],
+            provider_name=provider_name,
+            use_layout=use_layout,
+            filenames=filenames,
+            batch_size=batch_size
+        )
+        for image, result in zip(images, results):
+            if isinstance(result, dict):
+                result['image_data'] = image
+        return results
+
+    def get_available_providers(self) -> List[str]:
+        """Get list of available provider names (empty if the server is down)"""
+        try:
+            return self._call('get_available_providers')
+        except Exception as e:
+            logger.warning(f"⚠️ OCR inference server: {e}")
+            return []
+
+    def get_provider_info(self) -> List[Dict[str, Any]]:
+        """Get detailed information about all providers (empty if the server is down)"""
+        try:
+            return self._call('get_provider_info')
+        except Exception as e:
+            logger.warning(f"⚠️ OCR inference server: {e}")
+            return []
+
+    def get_pipeline_version(self) -> str:
+        """
+        Fingerprint of the server's models; cached briefly so result-cache
+        lookups don't queue behind long-running OCR requests.
+        """
+        if self._pipeline_version is None or time.monotonic() - self._pipeline_version_at > PIPELINE_VERSION_TTL:
+            self._pipeline_version = self._call('get_pipeline_version')
+            self._pipeline_version_at = time.monotonic()
+        return self._pipeline_version
+
+
+_ocr_manager_v2 = None
+_ocr_manager_v2_lock = threading.Lock()
+
+
+def get_ocr_manager_v2():
+    """
+    Get the process-wide OCR v2.0 manager.
+
+    Returns a RemoteOCRManager when OCR_INFERENCE_ADDRESS is set, otherwise an
+    in-process OCRManagerV2 created on first use (not at import time).
+
+    Raises:
+        ValueError: OCR_INFERENCE_ADDRESS is set but OCR_INFERENCE_AUTHKEY is not
+    """
+    global _ocr_manager_v2
+
+    if _ocr_manager_v2 is None:
+        with _ocr_manager_v2_lock:
+            if _ocr_manager_v2 is None:
+                if settings.OCR_INFERENCE_ADDRESS:
+                    logger.info(f"🚀 Using OCR inference server at {settings.OCR_INFERENCE_ADDRESS}")
+                    _ocr_manager_v2 = RemoteOCRManager()
+                else:
+                    from .providers_v2 import OCRManagerV2
+                    # API uploads share the manager across OCR_UPLOAD_CONCURRENCY threads
+                    _ocr_manager_v2 = OCRManagerV2(
+                        enable_layoutlm=True,
+                        micro_batching=settings.OCR_UPLOAD_CONCURRENCY > 1
+                    )
+
+    return _ocr_manager_v2
@@ -0,0 +1,279 @@
+"""
+OCR inference server
+Loads PaddleOCR + LayoutLMv3 once and serves recognition to API and Celery processes.
+
+The parent process builds a single OCRManagerV2 and then pre-forks worker
+processes that inherit the warm models copy-on-write and accept requests on a
+shared local socket. Clients use RemoteOCRManager (inference_client.py).
+
+Requests are pickled, so whoever can connect with the authkey can run code in
+the server: OCR_INFERENCE_AUTHKEY must be set to a secret, and the server only
+listens on a unix socket or a specific internal address, never a wildcard.
+
+Run:
+    python -m app.integrations.ocr.inference_server
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import Connection, Listener
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ...core.config import settings
+from ...core.card_image import CardImage
+
+logger = logging.getLogger(__name__)
+
+Address = Union[str, Tuple[str, int]]
+
+DEFAULT_ADDRESS = '/tmp/ocr-inference.sock'
+
+# Placeholders shipped in configs and docs; never accepted as an authkey
+KNOWN_DEFAULT_AUTHKEYS = {
+    'change-me-ocr-inference',
+    'your-secret-key-change-in-production',
+    'your-secret-key-change-this-in-production-please-make-it-strong-and-random',
+    'YOUR_OCR_INFERENCE_SECRET',
+    'CHANGE_THIS_TO_RANDOM_STRING_MIN_32_CHARS',
+}
+
+WILDCARD_HOSTS = {'', '0.0.0.0', '::', '[::]', '*'}
+
+
+def parse_address(address: str) -> Address:
+    """
+    Parse OCR_INFERENCE_ADDRESS.
+
+    ``host:port`` becomes a TCP address, anything else is a unix socket path.
+    """
+    if ':' in address and not address.startswith('/'):
+        host, port = address.rsplit(':', 1)
+        return (host, int(port))
+    return address
+
+
+def require_authkey(authkey: Optional[str]) -> bytes:
+    """
+    OCR_INFERENCE_AUTHKEY as bytes.
+
+    Raises:
+        ValueError: The key is unset or a known placeholder
+    """
+    if not authkey or authkey in KNOWN_DEFAULT_AUTHKEYS:
+        raise ValueError(
+            "OCR_INFERENCE_AUTHKEY must be set to a secret value "
+            "(requests are pickled; a known key lets anyone run code on the inference server)"
+        )
+    return authkey.encode()
+
+
+def require_private_address(address: Address) -> Address:
+    """
+    Reject listening on all interfaces.
+
+    Raises:
+        ValueError: TCP address with a wildcard host
+    """
+    if isinstance(address, tuple) and address[0] in WILDCARD_HOSTS:
+        raise ValueError(
+            f"OCR inference server must not listen on {address[0] or '*'}:{address[1]}; "
+            "use a unix socket path or an internal host address"
+        )
+    return address
+
+
+def encode_image(image: Union[bytes, CardImage]) -> bytes:
+    """Encoded bytes to send over the wire (never the raw pixel buffer)"""
+    if isinstance(image, CardImage):
+        return image.encode()
+    return image
+
+
+def _strip_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the input image from a result; the client re-attaches its own copy"""
+    result = dict(result)
+    result.pop('image_data', None)
+    return result
+
+
+def _portable_error(error: Exception) -> Exception:
+    """Exceptions from providers are not guaranteed to be picklable"""
+    return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+class OCRInferenceServer:
+    """
+    Pre-forked pool of OCR workers sharing one set of loaded models.
+
+    Protocol: the client sends ``(method, kwargs)`` and receives
+    ``('ok', value)`` or ``('error', message)``; one request per connection.
+    """
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        workers: Optional[int] = None,
+        authkey: Optional[str] = None
+    ):
+        self.address = require_private_address(
+            parse_address(address or settings.OCR_INFERENCE_ADDRESS or DEFAULT_ADDRESS)
+        )
+        self.workers = max(1, workers or settings.OCR_INFERENCE_WORKERS)
+        self.authkey = require_authkey(authkey or settings.OCR_INFERENCE_AUTHKEY)
+        self.manager = None
+        self._listener: Optional[Listener] = None
+        self._processes: List[multiprocessing.Process] = []
+        self._stopping = False
+
+    def load_models(self):
+        """Load OCR providers and LayoutLMv3 in the parent, before forking"""
+        from .providers_v2 import OCRManagerV2
+
+        started = time.time()
+        # Each forked worker serves one request at a time: nothing to micro-batch
+        self.manager = OCRManagerV2(enable_layoutlm=True, micro_batching=False)
+        logger.info(
+            f"✅ OCR models loaded in {time.time() - started:.1f}s "
+            f"(providers: {self.manager.get_available_providers()})"
+        )
+
+    def serve_forever(self):
+        """Load models, fork workers and keep the pool at full size until stopped"""
+        if self.manager is None:
+            self.load_models()
+
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)  # Stale socket from a previous run
+        self._listener = Listener(self.address, authkey=self.authkey)
+        logger.info(f"🚀 OCR inference server listening on {self.address} with {self.workers} worker(s)")
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        ctx = multiprocessing.get_context('fork')
+        self._processes = [self._spawn(ctx, i) for i in range(self.workers)]
+
+        try:
+            while not self._stopping:
+                for i, process in enumerate(self._processes):
+                    if not process.is_alive() and not self._stopping:
+                        logger.warning(
+                            f"⚠️ OCR worker {i} (pid {process.pid}) exited with {process.exitcode}, restarting"
+                        )
+                        self._processes[i] = self._spawn(ctx, i)
+                time.sleep(1.0)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop workers and release the socket"""
+        self._stopping = True
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout=10)
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        logger.info("🛑 OCR inference server stopped")
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _spawn(self, ctx, worker_id: int) -> multiprocessing.Process:
+        process = ctx.Process(
+            target=self._worker_loop, args=(worker_id,), name=f"ocr-worker-{worker_id}", daemon=True
+        )
+        process.start()
+        logger.info(f"✅ OCR worker {worker_id} started (pid {process.pid})")
+        return process
+
+    def _worker_loop(self, worker_id: int):
+        """Accept and serve requests in a forked worker"""
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        self._limit_threads()
+
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                # Failed handshake (bad authkey, client gone) must not kill the worker
+                logger.warning(f"⚠️ OCR worker {worker_id}: rejected connection: {e}")
+                continue
+            with conn:
+                self._handle(conn)
+
+    def _limit_threads(self):
+        """Split CPU threads between workers instead of each one using all cores"""
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    def _handle(self, conn: Connection):
+        try:
+            method, kwargs = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        try:
+            reply = ('ok', self._dispatch(method, kwargs))
+        except Exception as e:
+            logger.error(f"❌ OCR inference '{method}' failed: {e}", exc_info=True)
+            reply = ('error', f"{type(e).__name__}: {e}")
+
+        try:
+            conn.send(reply)
+        except (EOFError, OSError) as e:
+            logger.warning(f"⚠️ Client went away before OCR reply: {e}")
+
+    def _dispatch(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        if method == 'recognize':
+            kwargs['image_data'] = CardImage.from_bytes(kwargs['image_data'])
+            return _strip_result(self.manager.recognize(**kwargs))
+
+        if method == 'recognize_batch':
+            kwargs['images'] = [CardImage.from_bytes(data) for data in kwargs['images']]
+            return [
+                _portable_error(result) if isinstance(result, Exception) else _strip_result(result)
+                for result in self.manager.recognize_batch(**kwargs)
+            ]
+
+        if method == 'get_available_providers':
+            return self.manager.get_available_providers()
+
+        if method == 'get_provider_info':
+            return self.manager.get_provider_info()
+
+        if method == 'get_pipeline_version':
+            return self.manager.get_pipeline_version()
+
+        if method == 'ping':
+            return 'pong'
+
+        raise ValueError(f"Unknown method: {method}")
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s [%(processName)s] %(name)s: %(message)s'
+    )
+    try:
+        server = OCRInferenceServer()
+    except ValueError as e:
+        logger.error(f"❌ OCR inference server not started: {e}")
+        raise SystemExit(1)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -7,9 +7,12 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+from ....core.cache_codec import register_type
+
 logger = logging.getLogger(__name__)
 
 
+@register_type
 @dataclass
 class BoundingBox:
     """Bounding box for text region"""
@@ -37,6 +40,7 @@ class BoundingBox:
         }
 
 
+@register_type
 @dataclass
 class TextBlock:
     """Text block with position and confidence"""
@@ -106,6 +110,23 @@ class OCRProviderV2(ABC):
         """
         pass
     
+    def recognize_batch(
+        self,
+        images: List[bytes],
+        filenames: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recognize text on several images
+        
+        Default implementation calls :meth:`recognize` per image.
+        Override in providers that can share inference calls across images.
+        
+        Returns:
+            One result per image (same order), format as :meth:`recognize`
+        """
+        filenames = filenames or [None] * len(images)
+        return [self.recognize(image, name) for image, name in zip(images, filenames)]
+    
     def normalize_result(
         self, 
         blocks: List[TextBlock],
@@ -2,18 +2,26 @@
 OCR Manager v2.0
 Orchestrates multiple OCR providers with fallback
 """
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import os
+from typing import Dict, Any, List, Optional, Tuple, Union
 from PIL import Image
 import io
 
-from .base import OCRProviderV2, TextBlock
+from .base import OCRProviderV2, TextBlock, BoundingBox
 from .paddle_provider import PaddleOCRProvider
+from ....core.card_image import CardImage
+from ....core.config import settings
 from ...layoutlm.classifier import LayoutLMv3Classifier
 from ...layoutlm.config import LayoutLMConfig
+from ...layoutlm.batching import LayoutLMMicroBatcher
 
 logger = logging.getLogger(__name__)
 
+# Bump when extraction / post-processing logic changes so cached results are not reused
+OCR_PIPELINE_VERSION = "2.0.1"
+
 
 class OCRManagerV2:
     """
@@ -26,15 +34,20 @@ class OCRManagerV2:
     - LayoutLMv3 integration ready
     """
     
-    def __init__(self, enable_layoutlm: bool = True):
+    def __init__(self, enable_layoutlm: bool = True, micro_batching: bool = True):
         """
         Initialize OCR Manager v2.0
         
         Args:
             enable_layoutlm: Enable LayoutLMv3 for field classification (Phase 2)
+            micro_batching: Batch concurrent single-card LayoutLMv3 calls; only worth
+                it when several threads share this manager (otherwise it only adds
+                the batching wait to every card)
         """
         self.providers: List[OCRProviderV2] = []
         self.layoutlm_classifier = None
+        self.layoutlm_batcher = None
+        self.micro_batching = micro_batching
         self._initialize_providers()
         
         # Initialize LayoutLMv3 if enabled (Phase 2)
@@ -81,7 +94,7 @@ class OCRManagerV2:
         Recognize text from image
         
         Args:
-            image_data: Image bytes
+            image_data: Image bytes or decoded CardImage
             provider_name: Specific provider to use (optional)
             use_layout: Use LayoutLMv3 classification (Phase 2)
             filename: Optional filename for context
@@ -133,10 +146,78 @@ class OCRManagerV2:
         logger.error(error_msg)
         raise RuntimeError(error_msg)
     
+    def recognize_batch(
+        self,
+        images: List[Union[bytes, CardImage]],
+        provider_name: Optional[str] = None,
+        use_layout: bool = False,
+        filenames: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Recognize text on many cards, ``batch_size`` cards per inference call
+        
+        Args:
+            images: Image bytes or decoded CardImages
+            provider_name: Specific provider to use (optional)
+            use_layout: Use LayoutLMv3 classification
+            filenames: Optional filenames (same order as images)
+            batch_size: Cards per inference call (default: settings.OCR_BATCH_SIZE)
+        
+        Returns:
+            One entry per image, same order: the OCR result dict, or the
+            exception raised for that card (so callers can fall back per card)
+        """
+        if not self.providers:
+            raise RuntimeError("No OCR providers available")
+        
+        if provider_name:
+            providers = [p for p in self.providers if p.name.lower() == provider_name.lower()]
+            if not providers:
+                raise ValueError(f"Provider '{provider_name}' not found")
+        else:
+            providers = self.providers
+        provider = providers[0]
+        
+        batch_size = max(1, batch_size or settings.OCR_BATCH_SIZE)
+        filenames = filenames or [None] * len(images)
+        results: List[Union[Dict[str, Any], Exception]] = []
+        
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            chunk_names = filenames[start:start + batch_size]
+            
+            try:
+                logger.info(f"🔍 Batch OCR with {provider.name}: {len(chunk)} card(s)")
+                chunk_results = provider.recognize_batch(chunk, chunk_names)
+            except Exception as e:
+                # One bad card must not sink the batch: retry card by card with fallback
+                logger.warning(f"⚠️ Batch OCR failed ({e}), retrying {len(chunk)} card(s) individually")
+                chunk_results = []
+                for image, name in zip(chunk, chunk_names):
+                    try:
+                        chunk_results.append(
+                            self.recognize(image, provider_name=provider_name, filename=name)
+                        )
+                    except Exception as card_error:
+                        chunk_results.append(card_error)
+            
+            if use_layout and self.layoutlm_classifier and provider.supports_bbox:
+                ok = [i for i, r in enumerate(chunk_results) if not isinstance(r, Exception)]
+                classified = self._apply_layout_classification_batch([chunk_results[i] for i in ok])
+                for i, result in zip(ok, classified):
+                    chunk_results[i] = result
+            
+            results.extend(chunk_results)
+        
+        return results
+    
     def _apply_layout_classification(self, ocr_result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Apply LayoutLMv3 classification to OCR blocks
         
+        Concurrent callers are micro-batched into a shared forward pass.
+        
         Args:
             ocr_result: Result from OCR provider with blocks
         
@@ -148,84 +229,147 @@ class OCRManagerV2:
             return ocr_result
         
         try:
-            # Extract blocks and image from OCR result
-            blocks = ocr_result.get('blocks', [])
-            image_data = ocr_result.get('image_data')
-            
-            if not blocks or not image_data:
-                logger.warning("⚠️ Missing blocks or image data for LayoutLMv3")
+            inputs = self._layout_inputs(ocr_result)
+            if inputs is None:
                 return ocr_result
-            
-            # Convert image bytes to PIL Image
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert dict blocks to TextBlock objects if needed
-            text_blocks = []
-            for block in blocks:
-                if isinstance(block, TextBlock):
-                    text_blocks.append(block)
-                elif isinstance(block, dict):
-                    # Convert dict to TextBlock
-                    from .base import BoundingBox
-                    bbox_data = block.get('bbox', {})
-                    # Handle both formats: x/y/width/height and x1/y1/x2/y2
-                    if 'width' in bbox_data:
-                        bbox = BoundingBox(
-                            x=bbox_data.get('x', 0),
-                            y=bbox_data.get('y', 0),
-                            width=bbox_data.get('width', 0),
-                            height=bbox_data.get('height', 0)
-                        )
-                    else:
-                        # Convert x1/y1/x2/y2 to x/y/width/height
-                        x = bbox_data.get('x', bbox_data.get('x1', 0))
-                        y = bbox_data.get('y', bbox_data.get('y1', 0))
-                        x2 = bbox_data.get('x2', x)
-                        y2 = bbox_data.get('y2', y)
-                        bbox = BoundingBox(
-                            x=x,
-                            y=y,
-                            width=x2 - x,
-                            height=y2 - y
-                        )
-                    text_block = TextBlock(
-                        text=block.get('text', ''),
-                        bbox=bbox,
-                        confidence=block.get('confidence', 0.0),
-                        block_id=block.get('block_id'),
-                        field_type=block.get('field_type')
-                    )
-                    text_blocks.append(text_block)
+            text_blocks, image = inputs
             
             # Run LayoutLMv3 classification
             logger.info(f"📊 Running LayoutLMv3 classification on {len(text_blocks)} blocks...")
-            classified_result = self.layoutlm_classifier.classify_blocks(text_blocks, image)
-            
-            # Merge classified fields into OCR result
-            if classified_result and classified_result.get('fields'):
-                logger.info(f"✅ LayoutLMv3 classified {classified_result.get('classified_blocks', 0)} blocks")
-                
-                # Update blocks with field types
-                fields_map = classified_result['fields']
-                for field_name, field_data in fields_map.items():
-                    field_text = field_data.get('text', '')
-                    if field_text:
-                        ocr_result['data'][field_name] = field_text
-                
-                # Add metadata
-                ocr_result['layoutlm_used'] = True
-                ocr_result['layoutlm_confidence'] = sum(
-                    f.get('confidence', 0) for f in fields_map.values()
-                ) / len(fields_map) if fields_map else 0.0
+            if self.layoutlm_batcher:
+                classified_result = self.layoutlm_batcher.classify(text_blocks, image)
             else:
-                logger.warning("⚠️ LayoutLMv3 returned no classified fields")
+                classified_result = self.layoutlm_classifier.classify_blocks(text_blocks, image)
             
-            return ocr_result
+            return self._merge_layout_result(ocr_result, classified_result)
             
         except Exception as e:
             logger.error(f"❌ LayoutLMv3 classification failed: {e}", exc_info=True)
             return ocr_result
     
+    def _apply_layout_classification_batch(
+        self,
+        ocr_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply LayoutLMv3 classification to several OCR results at once
+        
+        Args:
+            ocr_results: Results from OCR provider with blocks
+        
+        Returns:
+            Enhanced results (same order)
+        """
+        if not self.layoutlm_classifier or not self.layoutlm_classifier.is_available():
+            logger.warning("⚠️ LayoutLMv3 not available, using fallback")
+            return ocr_results
+        
+        try:
+            pending = []
+            items = []
+            for idx, ocr_result in enumerate(ocr_results):
+                inputs = self._layout_inputs(ocr_result)
+                if inputs is not None:
+                    pending.append(idx)
+                    items.append(inputs)
+            
+            if items:
+                logger.info(f"📊 Running batched LayoutLMv3 classification on {len(items)} cards...")
+                classified = self.layoutlm_classifier.classify_batch(items)
+                for idx, classified_result in zip(pending, classified):
+                    ocr_results[idx] = self._merge_layout_result(ocr_results[idx], classified_result)
+            
+            return ocr_results
+            
+        except Exception as e:
+            logger.error(f"❌ Batched LayoutLMv3 classification failed: {e}", exc_info=True)
+            return ocr_results
+    
+    def _layout_inputs(self, ocr_result: Dict[str, Any]) -> Optional[Tuple[List[TextBlock], Image.Image]]:
+        """
+        Extract (text_blocks, PIL image) for LayoutLMv3 from an OCR result
+        
+        Returns None if blocks or image are missing.
+        """
+        # Extract blocks and image from OCR result
+        blocks = ocr_result.get('blocks', [])
+        image_data = ocr_result.get('image_data')
+        
+        if not blocks or not image_data:
+            logger.warning("⚠️ Missing blocks or image data for LayoutLMv3")
+            return None
+        
+        # Convert image bytes (or decoded CardImage) to PIL Image
+        if isinstance(image_data, CardImage):
+            image = image_data.to_pil()
+        else:
+            image = Image.open(io.BytesIO(image_data))
+        
+        # Convert dict blocks to TextBlock objects if needed
+        text_blocks = []
+        for block in blocks:
+            if isinstance(block, TextBlock):
+                text_blocks.append(block)
+            elif isinstance(block, dict):
+                # Convert dict to TextBlock
+                bbox_data = block.get('bbox', {})
+                # Handle both formats: x/y/width/height and x1/y1/x2/y2
+                if 'width' in bbox_data:
+                    bbox = BoundingBox(
+                        x=bbox_data.get('x', 0),
+                        y=bbox_data.get('y', 0),
+                        width=bbox_data.get('width', 0),
+                        height=bbox_data.get('height', 0)
+                    )
+                else:
+                    # Convert x1/y1/x2/y2 to x/y/width/height
+                    x = bbox_data.get('x', bbox_data.get('x1', 0))
+                    y = bbox_data.get('y', bbox_data.get('y1', 0))
+                    x2 = bbox_data.get('x2', x)
+                    y2 = bbox_data.get('y2', y)
+                    bbox = BoundingBox(
+                        x=x,
+                        y=y,
+                        width=x2 - x,
+                        height=y2 - y
+                    )
+                text_block = TextBlock(
+                    text=block.get('text', ''),
+                    bbox=bbox,
+                    confidence=block.get('confidence', 0.0),
+                    block_id=block.get('block_id'),
+                    field_type=block.get('field_type')
+                )
+                text_blocks.append(text_block)
+        
+        return text_blocks, image
+    
+    def _merge_layout_result(
+        self,
+        ocr_result: Dict[str, Any],
+        classified_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Merge LayoutLMv3 classified fields into OCR result"""
+        if classified_result and classified_result.get('fields'):
+            logger.info(f"✅ LayoutLMv3 classified {classified_result.get('classified_blocks', 0)} blocks")
+            
+            # Update blocks with field types
+            fields_map = classified_result['fields']
+            for field_name, field_data in fields_map.items():
+                field_text = field_data.get('text', '')
+                if field_text:
+                    ocr_result['data'][field_name] = field_text
+            
+            # Add metadata
+            ocr_result['layoutlm_used'] = True
+            ocr_result['layoutlm_confidence'] = sum(
+                f.get('confidence', 0) for f in fields_map.values()
+            ) / len(fields_map) if fields_map else 0.0
+        else:
+            logger.warning("⚠️ LayoutLMv3 returned no classified fields")
+        
+        return ocr_result
+    
     def get_available_providers(self) -> List[str]:
         """Get list of available provider names"""
         return [provider.name for provider in self.providers]
@@ -243,6 +387,24 @@ class OCRManagerV2:
             for provider in sorted(self.providers, key=lambda x: x.priority)
         ]
     
+    def get_pipeline_version(self) -> str:
+        """
+        Short fingerprint of everything that affects recognition output:
+        pipeline version, providers (with post-processing mode) and the
+        LayoutLMv3 checkpoint (path + modification time).
+        """
+        parts = [OCR_PIPELINE_VERSION]
+        for provider in self.providers:
+            parts.append(f"{provider.name}:{getattr(provider, 'enable_postprocessing', False)}")
+        
+        if self.layoutlm_classifier and self.layoutlm_classifier.is_available():
+            config = self.layoutlm_classifier.config
+            checkpoint = config.fine_tuned_path or config.model_name
+            mtime = os.path.getmtime(checkpoint) if os.path.exists(checkpoint) else 0
+            parts.append(f"layoutlm:{checkpoint}:{mtime}")
+        
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+    
     def initialize_layoutlm(self, model_path: Optional[str] = None):
         """
         Initialize LayoutLMv3 classifier (Phase 2 - COMPLETED)
@@ -262,11 +424,22 @@ class OCRManagerV2:
             self.layoutlm_classifier = LayoutLMv3Classifier(config)
             
             if self.layoutlm_classifier.is_available():
+                if self.micro_batching:
+                    # Concurrent single-card requests share one forward pass
+                    self.layoutlm_batcher = LayoutLMMicroBatcher(
+                        self.layoutlm_classifier.classify_batch,
+                        max_batch_size=config.inference_batch_size,
+                        max_wait_ms=config.max_batch_wait_ms
+                    )
+                else:
+                    self.layoutlm_batcher = None
                 logger.info("✅ LayoutLMv3 classifier initialized successfully")
             else:
+                self.layoutlm_batcher = None
                 logger.warning("⚠️ LayoutLMv3 model not available, will use fallback heuristics")
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize LayoutLMv3: {e}", exc_info=True)
             self.layoutlm_classifier = None
+            self.layoutlm_batcher = None
 
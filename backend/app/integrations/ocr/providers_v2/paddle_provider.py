@@ -3,12 +3,14 @@ PaddleOCR Provider v2.0
 High-performance OCR with bounding boxes
 """
 import io
+import copy
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from PIL import Image, ImageEnhance
 import numpy as np
 
 from .base import OCRProviderV2, TextBlock, BoundingBox
+from ....core.card_image import CardImage
 from ..field_extractor import FieldExtractor
 from ..ocr_postprocessor import OCRPostProcessor
 
@@ -142,6 +144,19 @@ class PaddleOCRProvider(OCRProviderV2):
             logger.warning(f"⚠️ Image preprocessing failed: {e}, using original")
             return img
     
+    def _load_image(self, image_data: Union[bytes, CardImage]) -> np.ndarray:
+        """Decode (if needed) and preprocess image into an RGB array for PaddleOCR"""
+        if isinstance(image_data, CardImage):
+            img = image_data.to_pil()
+        else:
+            img = Image.open(io.BytesIO(image_data))
+        
+        # IMPROVED: Preprocess image for better OCR
+        img = self._preprocess_image(img)
+        
+        # Convert to numpy array
+        return np.array(img)
+    
     def recognize(
         self, 
         image_data: bytes, 
@@ -150,106 +165,187 @@ class PaddleOCRProvider(OCRProviderV2):
         """
         Recognize text using PaddleOCR
         
+        ``image_data`` may be image bytes or an already decoded CardImage
+        (decode-once upload path).
+        
         Returns enhanced result with bounding boxes
         """
         if not self.is_available():
             raise RuntimeError(f"{self.name} is not available")
         
         try:
-            # Load image
-            img = Image.open(io.BytesIO(image_data))
-            original_size = (img.width, img.height)
-            
-            # IMPROVED: Preprocess image for better OCR
-            img = self._preprocess_image(img)
-            
-            # Convert to numpy array
-            img_array = np.array(img)
-            image_size = (img.width, img.height)
+            img_array = self._load_image(image_data)
             
             # Run OCR
             result = self.ocr.ocr(img_array, cls=True)
+            lines = result[0] if result and result[0] else []
             
-            # Parse results into TextBlocks
-            blocks = []
-            all_text = []
-            total_confidence = 0
-            block_count = 0
-            
-            if result and result[0]:
-                for idx, line in enumerate(result[0]):
-                    if line:
-                        # line format: [bbox, (text, confidence)]
-                        bbox_coords = line[0]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                        text, confidence = line[1]
-                        
-                        # Convert bbox to our format
-                        x_coords = [p[0] for p in bbox_coords]
-                        y_coords = [p[1] for p in bbox_coords]
-                        
-                        x = min(x_coords)
-                        y = min(y_coords)
-                        width = max(x_coords) - x
-                        height = max(y_coords) - y
-                        
-                        bbox = BoundingBox(x=x, y=y, width=width, height=height)
-                        
-                        block = TextBlock(
-                            text=text,
-                            bbox=bbox,
-                            confidence=confidence,
-                            block_id=idx
-                        )
-                        
-                        blocks.append(block)
-                        all_text.append(text)
-                        total_confidence += confidence
-                        block_count += 1
+            return self._build_result(lines, img_array, image_data)
             
-            # Calculate average confidence
-            avg_confidence = total_confidence / block_count if block_count > 0 else 0.0
-            
-            # Combine text
-            raw_text = "\n".join(all_text)
+        except Exception as e:
+            logger.error(f"❌ {self.name} recognition failed: {e}", exc_info=True)
+            raise
+    
+    def recognize_batch(
+        self,
+        images: List[Union[bytes, CardImage]],
+        filenames: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recognize text on several cards with shared inference calls
+        
+        Text detection runs per card, then the text-line crops of all cards
+        are pooled so the angle classifier and the recognizer run over the
+        whole batch at once (PaddleOCR batches crops by ``rec_batch_num``).
+        
+        Args:
+            images: Image bytes or decoded CardImages
+            filenames: Optional filenames (same order as images)
+        
+        Returns:
+            One result per image, same format as :meth:`recognize`.
+            Raises if the whole batch fails; callers may retry per card.
+        """
+        if not self.is_available():
+            raise RuntimeError(f"{self.name} is not available")
+        
+        if not images:
+            return []
+        
+        try:
+            from tools.infer import predict_system
+        except ImportError:
+            # PaddleOCR internals not importable: keep results correct, lose batching
+            logger.warning(f"⚠️ {self.name} batch internals unavailable, recognizing sequentially")
+            return [self.recognize(image, None) for image in images]
+        
+        try:
+            img_arrays = [self._load_image(image) for image in images]
             
-            # Optional: Post-processing (DISABLED by default, OCR should be tuned instead)
-            if self.enable_postprocessing and self.post_processor:
-                logger.debug("⚙️ Applying post-processing (enabled)")
-                blocks = self.post_processor.post_process_blocks(blocks)
-                all_text = [b.text for b in blocks]
-                raw_text = "\n".join(all_text)
+            # STEP 1: Detection per card (boxes have per-card geometry)
+            card_boxes = []
+            crops = []
+            for img_array in img_arrays:
+                dt_boxes, _ = self.ocr.text_detector(img_array)
+                boxes = predict_system.sorted_boxes(dt_boxes) if dt_boxes is not None else []
+                card_boxes.append(boxes)
+                for box in boxes:
+                    box = copy.deepcopy(box)
+                    if getattr(self.ocr.args, 'det_box_type', 'quad') == 'quad':
+                        crops.append(predict_system.get_rotate_crop_image(img_array, box))
+                    else:
+                        crops.append(predict_system.get_minarea_rect_crop(img_array, box))
             
-            # Use field extractor (heuristic-based)
-            data = self.field_extractor.extract_fields(
-                blocks=blocks,
-                image_size=image_size,
-                combined_text=raw_text
-            )
+            # STEP 2: Angle classification + recognition over all crops at once
+            rec_res = []
+            if crops:
+                if self.ocr.use_angle_cls:
+                    crops, _, _ = self.ocr.text_classifier(crops)
+                rec_res, _ = self.ocr.text_recognizer(crops)
             
-            # Optional: Validate extracted fields
-            if self.enable_postprocessing and self.post_processor:
-                data = self.post_processor.validate_and_fix_extracted_data(data)
+            # STEP 3: Split pooled results back per card
+            results = []
+            offset = 0
+            for image, img_array, boxes in zip(images, img_arrays, card_boxes):
+                lines = []
+                for box, (text, confidence) in zip(boxes, rec_res[offset:offset + len(boxes)]):
+                    if confidence >= self.ocr.drop_score:
+                        lines.append([box.tolist(), (text, confidence)])
+                offset += len(boxes)
+                results.append(self._build_result(lines, img_array, image))
             
-            logger.info(
-                f"✅ {self.name} recognized {block_count} blocks, "
-                f"avg confidence: {avg_confidence:.2f}"
-            )
+            logger.info(f"✅ {self.name} batch recognized {len(images)} cards, {len(crops)} text lines")
             
-            return {
-                "provider": self.name,
-                "raw_text": raw_text,
-                "blocks": blocks,  # TextBlock objects
-                "data": data,
-                "confidence": avg_confidence,
-                "image_size": image_size,
-                "block_count": block_count,
-                "image_data": image_data,  # For LayoutLMv3 (Phase 2)
-            }
+            return results
             
         except Exception as e:
-            logger.error(f"❌ {self.name} recognition failed: {e}", exc_info=True)
+            logger.error(f"❌ {self.name} batch recognition failed: {e}", exc_info=True)
             raise
     
+    def _build_result(
+        self,
+        lines: List[Any],
+        img_array: np.ndarray,
+        image_data: Union[bytes, CardImage]
+    ) -> Dict[str, Any]:
+        """Convert PaddleOCR lines ``[bbox, (text, confidence)]`` into provider result"""
+        image_size = (img_array.shape[1], img_array.shape[0])
+        
+        # Parse results into TextBlocks
+        blocks = []
+        all_text = []
+        total_confidence = 0
+        block_count = 0
+        
+        for idx, line in enumerate(lines):
+            if line:
+                # line format: [bbox, (text, confidence)]
+                bbox_coords = line[0]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+                text, confidence = line[1]
+                
+                # Convert bbox to our format
+                x_coords = [p[0] for p in bbox_coords]
+                y_coords = [p[1] for p in bbox_coords]
+                
+                x = min(x_coords)
+                y = min(y_coords)
+                width = max(x_coords) - x
+                height = max(y_coords) - y
+                
+                bbox = BoundingBox(x=x, y=y, width=width, height=height)
+                
+                block = TextBlock(
+                    text=text,
+                    bbox=bbox,
+                    confidence=confidence,
+                    block_id=idx
+                )
+                
+                blocks.append(block)
+                all_text.append(text)
+                total_confidence += confidence
+                block_count += 1
+        
+        # Calculate average confidence
+        avg_confidence = total_confidence / block_count if block_count > 0 else 0.0
+        
+        # Combine text
+        raw_text = "\n".join(all_text)
+        
+        # Optional: Post-processing (DISABLED by default, OCR should be tuned instead)
+        if self.enable_postprocessing and self.post_processor:
+            logger.debug("⚙️ Applying post-processing (enabled)")
+            blocks = self.post_processor.post_process_blocks(blocks)
+            all_text = [b.text for b in blocks]
+            raw_text = "\n".join(all_text)
+        
+        # Use field extractor (heuristic-based)
+        data = self.field_extractor.extract_fields(
+            blocks=blocks,
+            image_size=image_size,
+            combined_text=raw_text
+        )
+        
+        # Optional: Validate extracted fields
+        if self.enable_postprocessing and self.post_processor:
+            data = self.post_processor.validate_and_fix_extracted_data(data)
+        
+        logger.info(
+            f"✅ {self.name} recognized {block_count} blocks, "
+            f"avg confidence: {avg_confidence:.2f}"
+        )
+        
+        return {
+            "provider": self.name,
+            "raw_text": raw_text,
+            "blocks": blocks,  # TextBlock objects
+            "data": data,
+            "confidence": avg_confidence,
+            "image_size": image_size,
+            "block_count": block_count,
+            "image_data": image_data,  # For LayoutLMv3 (Phase 2)
+        }
+    
     def recognize_with_layout(
         self,
         image_data: bytes,
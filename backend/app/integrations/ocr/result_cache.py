@@ -0,0 +1,100 @@
+"""
+Content-addressed cache of card recognition results
+Keyed by image content hash, provider, OCR version setting and pipeline (model) version
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+from ...cache import get_from_cache, set_to_cache
+from ...core.config import settings
+from ...core.metrics import ocr_result_cache_counter
+from ...core.card_image import CardImage
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "ocr_result"
+
+
+def _pipeline_version(ocr_version: str) -> str:
+    """Model fingerprint for v2.0; v1.0 (Tesseract) has no checkpoint to track"""
+    if ocr_version != "v2.0":
+        return "tesseract"
+    from .inference_client import get_ocr_manager_v2
+    return get_ocr_manager_v2().get_pipeline_version()
+
+
+def result_cache_key(
+    image: CardImage,
+    provider: Optional[str],
+    ocr_version: str,
+    pipeline_version: Optional[str] = None
+) -> str:
+    """
+    Build the cache key for a card.
+
+    Changing the ``ocr_version`` setting or the model checkpoint changes the
+    key, so stale results are never served and simply expire.
+    """
+    if pipeline_version is None:
+        pipeline_version = _pipeline_version(ocr_version)
+    return (
+        f"{CACHE_PREFIX}:{ocr_version}:{pipeline_version}:"
+        f"{provider or 'auto'}:{image.content_hash()}"
+    )
+
+
+def lookup(
+    image: CardImage,
+    provider: Optional[str],
+    ocr_version: str
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Look up a previous recognition of the same image (before QR and OCR).
+
+    Returns:
+        (cache_key, entry); entry has ``qr_data`` and ``ocr_result`` keys or
+        is None on a miss. cache_key is None if the cache is disabled or the
+        pipeline version could not be determined.
+    """
+    if settings.OCR_RESULT_CACHE_TTL <= 0:
+        return None, None
+
+    try:
+        key = result_cache_key(image, provider, ocr_version)
+    except Exception as e:
+        logger.warning(f"⚠️ OCR result cache unavailable: {e}")
+        return None, None
+
+    entry = get_from_cache(key)
+    if entry:
+        ocr_result_cache_counter.labels(result='hit').inc()
+        logger.info(f"✅ OCR result cache hit ({image.content_hash()[:12]})")
+        return key, entry
+
+    ocr_result_cache_counter.labels(result='miss').inc()
+    return key, None
+
+
+def store(
+    key: Optional[str],
+    qr_data: Optional[Dict[str, Any]] = None,
+    ocr_result: Optional[Union[Dict[str, Any], Exception]] = None
+) -> bool:
+    """
+    Remember the recognition result for ``key`` (no-op without a key).
+
+    Failed OCR (an Exception) is not cached; the input image is stripped
+    from the OCR result so only extracted data is stored.
+    """
+    if not key or isinstance(ocr_result, Exception):
+        return False
+    if ocr_result is None and not (qr_data and any(qr_data.values())):
+        return False
+
+    if ocr_result is not None:
+        ocr_result = {k: v for k, v in ocr_result.items() if k != 'image_data'}
+    return set_to_cache(
+        key,
+        {'qr_data': qr_data, 'ocr_result': ocr_result},
+        ttl=settings.OCR_RESULT_CACHE_TTL
+    )
@@ -11,6 +11,7 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from prometheus_fastapi_instrumentator import Instrumentator
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import time
 import logging
@@ -18,6 +19,10 @@ import logging
 # Local imports
 from .database import engine, Base
 from .models import Contact
+from .repositories.contact_search import ensure_search_index
+from .services.monitoring_service import monitoring_sampler
+from .repositories.contact_metrics import reconcile_periodically
+from .core.config import settings
 from .api import api_router
 from .middleware import (
     ErrorHandlerMiddleware,
@@ -69,8 +74,15 @@ def init_db_with_retry(max_retries: int = 30, delay: float = 1.0) -> bool:
                 conn.execute(text("""
                     ALTER TABLE contacts ADD COLUMN IF NOT EXISTS photo_path VARCHAR;
                 """))
+                for column in ('phone', 'phone_mobile', 'phone_work', 'phone_additional'):
+                    conn.execute(text(f"""
+                        CREATE INDEX IF NOT EXISTS ix_contacts_{column} ON contacts ({column});
+                    """))
                 conn.execute(text("""
-                    ALTER TABLE contacts ADD COLUMN IF NOT EXISTS ocr_raw VARCHAR;
+                    CREATE INDEX IF NOT EXISTS ix_contacts_email_lower ON contacts (lower(email));
+                """))
+                conn.execute(text("""
+                    ALTER TABLE contact_ocr_results ALTER COLUMN payload SET STORAGE EXTERNAL;
                 """))
                 conn.commit()
             
@@ -141,6 +153,7 @@ def validate_security_config():
 # Initialize database on startup
 init_db_with_retry()
 backfill_uids()
+ensure_search_index(engine)
 validate_security_config()
 
 
@@ -162,9 +175,20 @@ async def lifespan(app: FastAPI):
     logger.info(f"🗄️  Database: {os.getenv('DATABASE_URL', 'sqlite')[:30]}...")
     logger.info("=" * 60)
     
+    metrics_reconciler = None
+    if os.getenv("TESTING") != "true":
+        monitoring_sampler.start()
+        # Seeds the contact gauges, then corrects drift from other processes
+        metrics_reconciler = asyncio.create_task(
+            reconcile_periodically(settings.CONTACT_METRICS_RECONCILE_INTERVAL)
+        )
+    
     yield
     
     # Shutdown
+    if metrics_reconciler is not None:
+        metrics_reconciler.cancel()
+    await monitoring_sampler.stop()
     logger.info("👋 FastAPI Business Card CRM shutting down...")
 
 
@@ -0,0 +1,83 @@
+"""
+One-off migration: move legacy contacts.ocr_raw values into contact_ocr_results
+
+Run once after deploying, from the backend container:
+
+    python -m app.migrate_ocr_results
+
+Safe to re-run: contacts are moved in batches, each in its own transaction,
+and contacts already present in contact_ocr_results are only cleared.
+"""
+import logging
+
+from sqlalchemy import bindparam, inspect, text
+
+from .database import engine
+from .models import ContactOCRResult
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_ocr_results(batch_size: int = 500) -> int:
+    """
+    Move legacy contacts.ocr_raw values into contact_ocr_results (compressed).
+
+    Args:
+        batch_size: Contacts moved per transaction
+
+    Returns:
+        Number of OCR results moved
+    """
+    columns = {c['name'] for c in inspect(engine).get_columns('contacts')}
+    if 'ocr_raw' not in columns:
+        return 0
+
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, ocr_raw FROM contacts WHERE ocr_raw IS NOT NULL ORDER BY id LIMIT :n"
+            ), {'n': batch_size}).fetchall()
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            existing = {
+                contact_id for (contact_id,) in conn.execute(
+                    ContactOCRResult.__table__.select()
+                    .with_only_columns(ContactOCRResult.contact_id)
+                    .where(ContactOCRResult.contact_id.in_(ids))
+                )
+            }
+            fresh = [
+                {
+                    'contact_id': contact_id,
+                    'format_version': ContactOCRResult.FORMAT_ZLIB_JSON,
+                    'revision': 1,
+                    'payload': ContactOCRResult.encode(raw),
+                }
+                for contact_id, raw in rows if contact_id not in existing
+            ]
+            if fresh:
+                conn.execute(ContactOCRResult.__table__.insert(), fresh)
+            conn.execute(
+                text("UPDATE contacts SET ocr_raw = NULL WHERE id IN :ids")
+                .bindparams(bindparam('ids', expanding=True)),
+                {'ids': ids}
+            )
+            moved += len(fresh)
+
+    return moved
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        moved = migrate_ocr_results()
+    except Exception as e:
+        logger.error(f"❌ OCR results migration failed: {e}")
+        raise SystemExit(1)
+    logger.info(f"✅ Moved OCR results of {moved} contact(s) to contact_ocr_results")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,7 @@ from .contact import Contact, Tag, Group, contact_tags, contact_groups
 from .two_factor_auth import TwoFactorAuth, TwoFactorBackupCode
 from .settings import AppSetting, SystemSettings
 from .audit import AuditLog
-from .ocr import OCRCorrection
+from .ocr import OCRCorrection, ContactOCRResult
 
 __all__ = [
     'Base',
@@ -23,6 +23,7 @@ __all__ = [
     'SystemSettings',
     'AuditLog',
     'OCRCorrection',
+    'ContactOCRResult',
     'TwoFactorAuth',
     'TwoFactorBackupCode',
 ]
@@ -1,6 +1,8 @@
 """
 Contact, Tag, and Group models for CRM functionality.
 """
+from sqlalchemy import Index
+
 from .base import Base, Column, Integer, String, DateTime, Table, ForeignKey, relationship, func
 
 
@@ -65,15 +67,15 @@ class Contact(Base):
     # Contact info
     company = Column(String, nullable=True, index=True)  # Company name (indexed for grouping)
     position = Column(String, nullable=True)  # Job position
-    email = Column(String, nullable=True)
-    phone = Column(String, nullable=True)  # Primary phone (for backward compatibility)
+    email = Column(String, nullable=True)  # Indexed as lower(email), see __table_args__
+    phone = Column(String, nullable=True, index=True)  # Primary phone (for backward compatibility)
     address = Column(String, nullable=True)  # Primary address
     website = Column(String, nullable=True)
     
     # Additional CRM fields
-    phone_mobile = Column(String, nullable=True)  # Mobile phone
-    phone_work = Column(String, nullable=True)  # Work phone
-    phone_additional = Column(String, nullable=True)  # Additional phone
+    phone_mobile = Column(String, nullable=True, index=True)  # Mobile phone
+    phone_work = Column(String, nullable=True, index=True)  # Work phone
+    phone_additional = Column(String, nullable=True, index=True)  # Additional phone
     fax = Column(String, nullable=True)  # Fax
     address_additional = Column(String, nullable=True)  # Additional address
     department = Column(String, nullable=True)  # Department
@@ -86,7 +88,6 @@ class Contact(Base):
     comment = Column(String, nullable=True)
     photo_path = Column(String, nullable=True)  # Original photo path
     thumbnail_path = Column(String, nullable=True)  # Thumbnail path
-    ocr_raw = Column(String, nullable=True)  # Raw OCR text
     
     # QR Code data
     has_qr_code = Column(Integer, nullable=True, default=0)  # 1 if QR code detected, 0 otherwise
@@ -99,6 +100,37 @@ class Contact(Base):
     # Relationships
     tags = relationship('Tag', secondary=contact_tags, back_populates='contacts')
     groups = relationship('Group', secondary=contact_groups, back_populates='contacts')
+    # OCR result (blocks, raw text) lives in contact_ocr_results; loaded on access
+    ocr_result = relationship(
+        'ContactOCRResult', uselist=False, lazy='select',
+        cascade='all, delete-orphan', passive_deletes=True
+    )
+    
+    # Case-insensitive email lookups (bulk import deduplication)
+    __table_args__ = (
+        Index('ix_contacts_email_lower', func.lower(email)),
+    )
+    
+    @property
+    def ocr_raw(self):
+        """Raw OCR JSON (stored in contact_ocr_results)"""
+        return self.ocr_result.text if self.ocr_result is not None else None
+    
+    @ocr_raw.setter
+    def ocr_raw(self, value):
+        if value is None:
+            self.ocr_result = None
+            return
+        from .ocr import ContactOCRResult
+        payload = ContactOCRResult.encode(value)
+        if self.ocr_result is None:
+            self.ocr_result = ContactOCRResult(
+                payload=payload, format_version=ContactOCRResult.FORMAT_ZLIB_JSON, revision=1
+            )
+        else:
+            self.ocr_result.payload = payload
+            self.ocr_result.format_version = ContactOCRResult.FORMAT_ZLIB_JSON
+            self.ocr_result.revision = (self.ocr_result.revision or 0) + 1
 
 
 
@@ -1,6 +1,11 @@
 """
-OCR correction model for training and improvement.
+OCR models: corrections for training, stored OCR results.
 """
+import json
+import zlib
+
+from sqlalchemy import LargeBinary
+
 from .base import Base, Column, Integer, String, DateTime, ForeignKey, func
 
 
@@ -33,5 +38,38 @@ class OCRCorrection(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
 
+class ContactOCRResult(Base):
+    """
+    OCR result of a contact (blocks, raw text, LayoutLM and validation
+    output), kept out of the contacts table.
 
-
+    The JSON document is stored zlib-compressed; ``format_version`` names the
+    encoding and ``revision`` counts the saves (re-runs, block edits).
+    Read and written through ``Contact.ocr_raw``.
+    """
+    __tablename__ = "contact_ocr_results"
+    
+    # 1 = zlib-compressed UTF-8 JSON
+    FORMAT_ZLIB_JSON = 1
+    
+    contact_id = Column(Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True)
+    format_version = Column(Integer, nullable=False, default=FORMAT_ZLIB_JSON)
+    revision = Column(Integer, nullable=False, default=1)
+    payload = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @staticmethod
+    def encode(text: str) -> bytes:
+        return zlib.compress(text.encode('utf-8'))
+    
+    @property
+    def text(self) -> str:
+        """The stored JSON document"""
+        if self.format_version != self.FORMAT_ZLIB_JSON:
+            raise ValueError(f'Unknown OCR result format version: {self.format_version}')
+        return zlib.decompress(self.payload).decode('utf-8')
+    
+    @property
+    def data(self):
+        """The stored JSON document, parsed"""
+        return json.loads(self.text)
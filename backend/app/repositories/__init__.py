@@ -8,6 +8,10 @@ from .user_repository import UserRepository
 from .ocr_repository import OCRRepository
 from .settings_repository import SettingsRepository
 from .audit_repository import AuditRepository
+from .statistics_repository import StatisticsRepository
+from .contact_metrics import reconcile_contact_metrics  # also registers the metric listeners
+from .settings_cache import settings_cache  # also registers the settings invalidation listeners
+from .principal_cache import principal_cache  # also registers the principal invalidation listeners
 
 __all__ = [
     'ContactRepository',
@@ -15,5 +19,6 @@ __all__ = [
     'OCRRepository',
     'SettingsRepository',
     'AuditRepository',
+    'StatisticsRepository',
 ]
 
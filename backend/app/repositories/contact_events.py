@@ -0,0 +1,99 @@
+"""
+Contact change events
+Notifies listeners after a transaction that changed contacts commits
+
+Tracks ORM inserts/updates/deletes of Contact rows (and bulk
+``query(Contact).update()/.delete()``) per session, and calls the
+registered listeners once per committed transaction. Used to keep derived
+data (cached statistics, metrics) in step with the contacts table.
+"""
+import logging
+from typing import Callable, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..models import Contact
+
+logger = logging.getLogger(__name__)
+
+_CHANGES_KEY = "contact_changes"
+
+# Listener receives {'inserted': n, 'updated': n, 'deleted': n, 'bulk': bool}
+ContactChangeListener = Callable[[Dict[str, int]], None]
+
+_listeners: List[ContactChangeListener] = []
+
+
+def on_contacts_changed(listener: ContactChangeListener) -> ContactChangeListener:
+    """Register ``listener`` to run after each commit that changed contacts (usable as a decorator)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def _changes(session: Session) -> Dict[str, int]:
+    return session.info.setdefault(
+        _CHANGES_KEY, {"inserted": 0, "updated": 0, "deleted": 0, "bulk": False}
+    )
+
+
+def record_contact_changes(session: Session, inserted: int = 0, updated: int = 0, deleted: int = 0):
+    """
+    Count contact changes made outside the ORM unit of work (COPY, Core
+    executemany); listeners see them when ``session`` commits.
+    """
+    changes = _changes(session)
+    changes["inserted"] += inserted
+    changes["updated"] += updated
+    changes["deleted"] += deleted
+    changes["bulk"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context):
+    inserted = sum(1 for obj in session.new if isinstance(obj, Contact))
+    deleted = sum(1 for obj in session.deleted if isinstance(obj, Contact))
+    updated = sum(
+        1 for obj in session.dirty
+        if isinstance(obj, Contact) and session.is_modified(obj, include_collections=False)
+    )
+    if inserted or updated or deleted:
+        changes = _changes(session)
+        changes["inserted"] += inserted
+        changes["updated"] += updated
+        changes["deleted"] += deleted
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not Contact:
+        return None
+
+    # Run the statement here to learn how many rows it touched
+    result = orm_execute_state.invoke_statement()
+    changes = _changes(orm_execute_state.session)
+    changes["bulk"] = True
+    rowcount = max(getattr(result, "rowcount", 0) or 0, 0)
+    changes["deleted" if orm_execute_state.is_delete else "updated"] += rowcount
+    return result
+
+
+@event.listens_for(Session, "after_commit")
+def _notify(session: Session):
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        try:
+            listener(changes)
+        except Exception as e:
+            logger.error(f"❌ Contact change listener {listener.__name__} failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session):
+    session.info.pop(_CHANGES_KEY, None)
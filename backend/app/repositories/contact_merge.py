@@ -0,0 +1,227 @@
+"""
+Contact Merge
+Set-based merging of duplicate contacts into a master contact
+
+For a batch of merge groups (master + slaves) the work is a fixed number of
+statements, independent of how many contacts, tags or groups are involved:
+- one SELECT of all master/slave field values, empty master fields filled
+  from the first slave (by id) that has them, one bulk UPDATE
+- tags/groups copied with INSERT ... SELECT ... ON CONFLICT DO NOTHING
+- audit log and OCR correction rows repointed to the master with one UPDATE
+- slaves (and their links and OCR results) removed with one DELETE each
+"""
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import AuditLog, Contact, ContactOCRResult, OCRCorrection, User
+from ..models.contact import contact_groups, contact_tags
+
+logger = logging.getLogger(__name__)
+
+# Master fields filled from a slave when empty; a field copied together with
+# its companion (QR code flag, thumbnail)
+MERGE_FIELDS = [
+    'full_name', 'first_name', 'last_name', 'middle_name',
+    'company', 'position', 'department',
+    'email', 'phone', 'phone_mobile', 'phone_work', 'phone_additional', 'fax',
+    'address', 'address_additional',
+    'website', 'birthday', 'source', 'status', 'priority', 'comment',
+    'qr_data', 'photo_path',
+]
+COMPANION_FIELDS = {'qr_data': 'has_qr_code', 'photo_path': 'thumbnail_path'}
+
+# Merge groups per transaction (keeps the bound parameters of one statement
+# well below the driver limits)
+MERGE_BATCH_SIZE = 200
+
+# Contact ids per existence check SELECT
+ID_CHECK_BATCH_SIZE = 5000
+
+# (master_id, slave_ids)
+MergeGroup = Tuple[int, Sequence[int]]
+
+
+class InvalidMergeError(ValueError):
+    """Merge groups overlap or a master is listed as its own slave"""
+
+
+class MergeContactsNotFoundError(LookupError):
+    """Some contacts of a merge group do not exist"""
+
+
+class ContactMerger:
+    """
+    Merges contacts in batches of merge groups (one transaction per batch).
+    """
+
+    def __init__(self, db: Session, user: Optional[User] = None):
+        self.db = db
+        self.user = user
+
+    def merge(self, master_id: int, slave_ids: Sequence[int]) -> int:
+        """
+        Merge ``slave_ids`` into ``master_id`` and commit.
+
+        Returns:
+            Number of merged (deleted) contacts
+        """
+        return self.merge_groups([(master_id, slave_ids)])
+
+    def merge_groups(self, groups: Sequence[MergeGroup], batch_size: int = MERGE_BATCH_SIZE) -> int:
+        """
+        Merge many groups, committing after every ``batch_size`` groups.
+
+        All groups are validated and every contact checked for existence before
+        the first batch, so an error means nothing was merged.
+
+        Raises:
+            InvalidMergeError: A contact appears in more than one place
+            MergeContactsNotFoundError: A master or slave does not exist
+
+        Returns:
+            Number of merged (deleted) contacts
+        """
+        groups = [(master_id, list(dict.fromkeys(slave_ids))) for master_id, slave_ids in groups if slave_ids]
+        self._validate(groups)
+        self._check_exist(groups)
+
+        merged = 0
+        for start in range(0, len(groups), batch_size):
+            batch = groups[start:start + batch_size]
+            try:
+                merged += self._merge_batch(batch)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        logger.info(f"✅ Merged {merged} contacts into {len(groups)} masters")
+        return merged
+
+    @staticmethod
+    def _validate(groups: List[Tuple[int, List[int]]]):
+        seen = set()
+        for master_id, slave_ids in groups:
+            if master_id in slave_ids:
+                raise InvalidMergeError(
+                    f'Master contact (ID: {master_id}) cannot be in the list of contacts to delete'
+                )
+            for contact_id in [master_id, *slave_ids]:
+                if contact_id in seen:
+                    raise InvalidMergeError(f'Contact {contact_id} appears in more than one merge group')
+                seen.add(contact_id)
+
+    def _check_exist(self, groups: List[Tuple[int, List[int]]]):
+        """Raise MergeContactsNotFoundError unless every master and slave exists"""
+        contact_ids = [contact_id for master_id, slave_ids in groups for contact_id in (master_id, *slave_ids)]
+        missing = set(contact_ids)
+        for start in range(0, len(contact_ids), ID_CHECK_BATCH_SIZE):
+            batch = contact_ids[start:start + ID_CHECK_BATCH_SIZE]
+            missing.difference_update(
+                contact_id for (contact_id,) in self.db.execute(select(Contact.id).where(Contact.id.in_(batch)))
+            )
+        if missing:
+            raise MergeContactsNotFoundError(f'Contacts not found: {sorted(missing)}')
+
+    def _merge_batch(self, groups: List[Tuple[int, List[int]]]) -> int:
+        master_of: Dict[int, int] = {
+            slave_id: master_id for master_id, slave_ids in groups for slave_id in slave_ids
+        }
+        slave_ids = list(master_of)
+
+        rows = self._load_fields([master_id for master_id, _ in groups] + slave_ids)
+        missing = {master_id for master_id, _ in groups} | set(slave_ids)
+        missing -= rows.keys()
+        if missing:
+            raise MergeContactsNotFoundError(f'Contacts not found: {sorted(missing)}')
+
+        self._fill_master_fields(groups, rows)
+
+        self._copy_links(contact_tags, 'tag_id', slave_ids, master_of)
+        self._copy_links(contact_groups, 'group_id', slave_ids, master_of)
+
+        for model in (AuditLog, OCRCorrection):
+            self.db.execute(
+                update(model.__table__)
+                .where(model.contact_id.in_(slave_ids))
+                .values(contact_id=case(master_of, value=model.contact_id))
+                .execution_options(synchronize_session=False)
+            )
+
+        for table in (contact_tags, contact_groups, ContactOCRResult.__table__):
+            self.db.execute(delete(table).where(table.c.contact_id.in_(slave_ids)))
+        self.db.execute(
+            delete(Contact).where(Contact.id.in_(slave_ids)).execution_options(synchronize_session=False)
+        )
+
+        self._audit(groups)
+        return len(slave_ids)
+
+    def _load_fields(self, contact_ids: List[int]) -> Dict[int, Dict[str, object]]:
+        columns = ['id'] + MERGE_FIELDS + list(COMPANION_FIELDS.values())
+        result = self.db.execute(
+            select(*[getattr(Contact, c) for c in columns]).where(Contact.id.in_(contact_ids))
+        )
+        return {row[0]: dict(zip(columns, row)) for row in result}
+
+    def _fill_master_fields(self, groups: List[Tuple[int, List[int]]], rows: Dict[int, Dict[str, object]]):
+        """Empty master fields take the value of the first slave (by id) that has one"""
+        changes = []
+        for master_id, slave_ids in groups:
+            master = rows[master_id]
+            merged = dict(master)
+            for field in MERGE_FIELDS:
+                if master[field]:
+                    continue
+                donor = next((rows[s] for s in sorted(slave_ids) if rows[s][field]), None)
+                if donor is None:
+                    continue
+                merged[field] = donor[field]
+                if field in COMPANION_FIELDS:
+                    merged[COMPANION_FIELDS[field]] = donor[COMPANION_FIELDS[field]]
+            if merged != master:
+                changes.append(merged)
+
+        # All columns in every row, so the bulk UPDATE by primary key is one statement
+        if changes:
+            self.db.execute(update(Contact), changes)
+
+    def _copy_links(self, table, target_column: str, slave_ids: List[int], master_of: Dict[int, int]):
+        """INSERT the slaves' tag/group links for their masters, skipping links the master has"""
+        target = table.c[target_column]
+        links = select(case(master_of, value=table.c.contact_id), target).where(
+            table.c.contact_id.in_(slave_ids)
+        ).distinct()
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            statement = postgresql.insert(table).from_select(['contact_id', target_column], links)
+            statement = statement.on_conflict_do_nothing()
+        elif dialect == 'sqlite':
+            statement = sqlite.insert(table).from_select(['contact_id', target_column], links)
+            statement = statement.on_conflict_do_nothing()
+        else:
+            existing = select(table.c.contact_id, target).where(
+                table.c.contact_id.in_(set(master_of.values()))
+            )
+            statement = insert(table).from_select(
+                ['contact_id', target_column], links.except_(existing)
+            )
+        self.db.execute(statement)
+
+    def _audit(self, groups: List[Tuple[int, List[int]]]):
+        self.db.execute(insert(AuditLog.__table__), [
+            {
+                'contact_id': master_id,
+                'user_id': self.user.id if self.user else None,
+                'username': self.user.username if self.user else None,
+                'action': 'merge_contacts',
+                'entity_type': 'contact',
+                'changes': json.dumps({'merged_contacts': slave_ids, 'master_id': master_id}, ensure_ascii=False),
+            }
+            for master_id, slave_ids in groups
+        ])
@@ -0,0 +1,69 @@
+"""
+Contact metrics
+Keeps the contact Prometheus metrics up to date from contact change events
+
+The ``contacts_total`` gauge is adjusted by each committed transaction
+instead of a COUNT(*) per write. Each process only sees its own writes, so
+the API process also reconciles the gauges with the database periodically
+(changes made by Celery workers show up within one interval).
+"""
+import asyncio
+import logging
+from typing import Dict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..core.metrics import (
+    contacts_total,
+    contacts_created_counter,
+    contacts_updated_counter,
+    contacts_deleted_counter,
+    users_total
+)
+from ..database import SessionLocal
+from ..models import Contact, User
+from .contact_events import on_contacts_changed
+
+logger = logging.getLogger(__name__)
+
+
+@on_contacts_changed
+def _update_contact_metrics(changes: Dict[str, int]):
+    if changes["inserted"]:
+        contacts_created_counter.inc(changes["inserted"])
+        contacts_total.inc(changes["inserted"])
+    if changes["updated"]:
+        contacts_updated_counter.inc(changes["updated"])
+    if changes["deleted"]:
+        contacts_deleted_counter.inc(changes["deleted"])
+        contacts_total.dec(changes["deleted"])
+
+
+def reconcile_contact_metrics(db: Session = None) -> int:
+    """
+    Set the contacts/users gauges from the database.
+
+    Returns:
+        Number of contacts
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        total = db.query(func.count(Contact.id)).scalar() or 0
+        contacts_total.set(total)
+        users_total.set(db.query(func.count(User.id)).scalar() or 0)
+        return total
+    finally:
+        if own_session:
+            db.close()
+
+
+async def reconcile_periodically(interval: float):
+    """Reconcile the gauges now and then every ``interval`` seconds (runs until cancelled)"""
+    while True:
+        try:
+            await asyncio.to_thread(reconcile_contact_metrics)
+        except Exception as e:
+            logger.error(f"❌ Contact metrics reconciliation failed: {e}")
+        await asyncio.sleep(interval)
@@ -2,15 +2,46 @@
 Contact Repository
 Handles all database operations for contacts
 """
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, load_only, selectinload
 from sqlalchemy import or_, desc, asc
 from typing import List, Optional, Dict, Any, Tuple
 import logging
 
 from ..models import Contact, Tag, Group
+from .contact_search import ContactSearch, SEARCH_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# Columns serialized by list views (schemas.ContactResponse; no ocr_raw)
+CONTACT_LIST_COLUMNS = (
+    'id', 'uid', 'sequence_number',
+    'full_name', 'last_name', 'first_name', 'middle_name',
+    'company', 'position', 'email', 'phone', 'address', 'website',
+    'phone_mobile', 'phone_work', 'phone_additional', 'fax', 'address_additional',
+    'department', 'birthday', 'source', 'status', 'priority',
+    'comment', 'photo_path', 'thumbnail_path',
+    'created_at', 'updated_at',
+)
+
+
+def contact_relations() -> tuple:
+    """
+    Loader options for tags and groups.
+
+    selectinload: one extra ``IN (...)`` query per relationship for the
+    whole result, instead of one lazy load per contact (or the row
+    multiplication of a JOIN combined with LIMIT).
+    """
+    return (selectinload(Contact.tags), selectinload(Contact.groups))
+
+
+def contact_list_options() -> tuple:
+    """Loader options for list views: serialized columns only, plus tags and groups"""
+    return (
+        load_only(*[getattr(Contact, column) for column in CONTACT_LIST_COLUMNS]),
+        *contact_relations(),
+    )
+
 
 class ContactRepository:
     """
@@ -33,10 +64,7 @@ class ContactRepository:
         query = self.db.query(Contact)
         
         if eager_load:
-            query = query.options(
-                joinedload(Contact.tags),
-                joinedload(Contact.groups)
-            )
+            query = query.options(*contact_relations())
         
         return query.offset(skip).limit(limit).all()
     
@@ -45,10 +73,7 @@ class ContactRepository:
         query = self.db.query(Contact).filter(Contact.id == contact_id)
         
         if eager_load:
-            query = query.options(
-                joinedload(Contact.tags),
-                joinedload(Contact.groups)
-            )
+            query = query.options(*contact_relations())
         
         return query.first()
     
@@ -69,25 +94,17 @@ class ContactRepository:
             fields: List of fields to search in (default: all text fields)
         """
         if not fields:
-            fields = ['full_name', 'company', 'position', 'email', 'phone', 'website', 'address']
+            fields = SEARCH_FIELDS
+        
+        if set(fields) == set(SEARCH_FIELDS):
+            # Index-backed (pg_trgm / FTS5), see contact_search.py
+            return ContactSearch(self.db).filter(self.db.query(Contact), search_term).all()
         
         search_pattern = f"%{search_term}%"
-        filters = []
-        
-        if 'full_name' in fields:
-            filters.append(Contact.full_name.ilike(search_pattern))
-        if 'company' in fields:
-            filters.append(Contact.company.ilike(search_pattern))
-        if 'position' in fields:
-            filters.append(Contact.position.ilike(search_pattern))
-        if 'email' in fields:
-            filters.append(Contact.email.ilike(search_pattern))
-        if 'phone' in fields:
-            filters.append(Contact.phone.ilike(search_pattern))
-        if 'website' in fields:
-            filters.append(Contact.website.ilike(search_pattern))
-        if 'address' in fields:
-            filters.append(Contact.address.ilike(search_pattern))
+        filters = [
+            getattr(Contact, field).ilike(search_pattern)
+            for field in fields if field in SEARCH_FIELDS
+        ]
         
         return self.db.query(Contact).filter(or_(*filters)).all()
     
@@ -105,10 +122,7 @@ class ContactRepository:
         Returns:
             Tuple of (contacts list, total count)
         """
-        query = self.db.query(Contact).options(
-            joinedload(Contact.tags),
-            joinedload(Contact.groups)
-        )
+        query = self.db.query(Contact).options(*contact_list_options())
         
         # Apply filters
         for key, value in filters.items():
@@ -0,0 +1,221 @@
+"""
+Contact Search
+Index-backed substring search over contact text fields
+
+- PostgreSQL: pg_trgm GIN index over one concatenated, lower-cased document
+  expression; LIKE '%q%' on that expression uses the index, ranked by
+  word_similarity.
+- SQLite: FTS5 external-content table with the trigram tokenizer, kept in
+  sync by triggers; ranked by bm25.
+- Anything else (or index not installed): the previous ILIKE scan.
+"""
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import Float, func, literal_column, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+
+from ..models import Contact
+
+logger = logging.getLogger(__name__)
+
+# Fields covered by the search index (order matters for the index expression)
+SEARCH_FIELDS = ['full_name', 'company', 'position', 'email', 'phone', 'website', 'address']
+
+# chr(31) (unit separator) keeps a query from matching across two fields
+SEARCH_DOCUMENT_SQL = "lower(" + " || chr(31) || ".join(
+    f"coalesce(contacts.{field}, '')" for field in SEARCH_FIELDS
+) + ")"
+
+PG_INDEX_NAME = "ix_contacts_search_trgm"
+SQLITE_FTS_TABLE = "contacts_fts"
+
+# FTS5 trigram tokens need at least 3 characters
+MIN_FTS_QUERY_LENGTH = 3
+
+BACKEND_TRGM = "trgm"
+BACKEND_FTS5 = "fts5"
+BACKEND_LIKE = "like"
+
+_backends: Dict[str, str] = {}
+_backends_lock = threading.Lock()
+
+
+def ensure_search_index(engine: Engine) -> str:
+    """
+    Create the search index for the engine's dialect if it does not exist.
+
+    Safe to run on every startup.
+
+    Returns:
+        Search backend in use ('trgm', 'fts5' or 'like')
+    """
+    dialect = engine.dialect.name
+    try:
+        if dialect == "postgresql":
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {PG_INDEX_NAME} ON contacts "
+                    f"USING gin (({SEARCH_DOCUMENT_SQL}) gin_trgm_ops)"
+                ))
+        elif dialect == "sqlite":
+            _ensure_sqlite_fts(engine)
+    except Exception as e:
+        logger.warning(f"⚠️ Contact search index unavailable, using ILIKE scan: {e}")
+
+    with _backends_lock:
+        _backends.pop(str(engine.url), None)
+    backend = _detect_backend(engine)
+    logger.info(f"✅ Contact search backend: {backend}")
+    return backend
+
+
+def _ensure_sqlite_fts(engine: Engine):
+    columns = ", ".join(SEARCH_FIELDS)
+    new_values = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+    old_values = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SQLITE_FTS_TABLE}
+        ).first()
+        if exists:
+            return
+
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5("
+            f"{columns}, content='contacts', content_rowid='id', tokenize='trigram')"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER contacts_fts_ai AFTER INSERT ON contacts BEGIN "
+            f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER contacts_fts_ad AFTER DELETE ON contacts BEGIN "
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER contacts_fts_au AFTER UPDATE ON contacts BEGIN "
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        # Index rows that existed before the table was created
+        conn.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def _detect_backend(engine: Engine) -> str:
+    """Check (once per database) whether the search index is installed"""
+    url = str(engine.url)
+    with _backends_lock:
+        if url in _backends:
+            return _backends[url]
+
+    backend = BACKEND_LIKE
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                if conn.execute(
+                    text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+                    {"name": PG_INDEX_NAME}
+                ).first():
+                    backend = BACKEND_TRGM
+            elif engine.dialect.name == "sqlite":
+                if conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": SQLITE_FTS_TABLE}
+                ).first():
+                    backend = BACKEND_FTS5
+    except Exception as e:
+        logger.warning(f"⚠️ Could not detect contact search index: {e}")
+
+    with _backends_lock:
+        _backends[url] = backend
+    return backend
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_phrase(value: str) -> str:
+    """Quote the query as a single FTS5 phrase (no operators)"""
+    return '"' + value.replace('"', '""') + '"'
+
+
+class ContactSearch:
+    """
+    Applies the search condition (and optionally relevance ordering) to a
+    Contact query, using the search index when it is available.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.backend = _detect_backend(db.get_bind())
+
+    def _backend_for(self, q: str) -> str:
+        if self.backend == BACKEND_FTS5 and len(q) < MIN_FTS_QUERY_LENGTH:
+            return BACKEND_LIKE
+        return self.backend
+
+    def filter(self, query: Query, q: str, rank: bool = False) -> Query:
+        """
+        Restrict ``query`` to contacts matching ``q`` in any search field.
+
+        Args:
+            query: Query over Contact
+            q: Search string (substring match, case-insensitive)
+            rank: Order by relevance (best match first)
+        """
+        q = q.strip()
+        if not q:
+            return query
+
+        backend = self._backend_for(q)
+
+        if backend == BACKEND_TRGM:
+            document = literal_column(SEARCH_DOCUMENT_SQL)
+            query = query.filter(document.like(f"%{_escape_like(q.lower())}%", escape="\\"))
+            if rank:
+                query = query.order_by(func.word_similarity(q.lower(), document).desc(), Contact.id.desc())
+            return query
+
+        if backend == BACKEND_FTS5:
+            matches = text(
+                f"SELECT rowid AS id, rank AS score FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH :phrase"
+            ).bindparams(phrase=_fts_phrase(q)).columns(id=Contact.id.type, score=Float).subquery()
+            query = query.join(matches, matches.c.id == Contact.id)
+            if rank:
+                query = query.order_by(matches.c.score.asc(), Contact.id.desc())
+            return query
+
+        pattern = f"%{q}%"
+        query = query.filter(or_(*[getattr(Contact, field).ilike(pattern) for field in SEARCH_FIELDS]))
+        if rank:
+            query = query.order_by(Contact.id.desc())
+        return query
+
+    def search(self, q: str, limit: int = 10, fields: Optional[List[str]] = None) -> List[Contact]:
+        """
+        Ranked search (best matches first).
+
+        Args:
+            q: Search string
+            limit: Maximum number of results
+            fields: Restrict to these fields (not index-backed; ILIKE scan)
+        """
+        query = self.db.query(Contact)
+        if fields and set(fields) != set(SEARCH_FIELDS):
+            pattern = f"%{q}%"
+            query = query.filter(or_(*[
+                getattr(Contact, field).ilike(pattern) for field in fields if field in SEARCH_FIELDS
+            ]))
+            return query.order_by(Contact.id.desc()).limit(limit).all()
+
+        return self.filter(query, q, rank=True).limit(limit).all()
@@ -0,0 +1,114 @@
+"""
+Keyset (cursor) pagination helpers
+Opaque cursors and planner-based row count estimates
+"""
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was issued for a different sort order"""
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """
+    Build an opaque cursor pointing just after the row (``value``, ``last_id``).
+
+    Args:
+        sort_by: Sort column name
+        sort_order: 'asc' or 'desc'
+        value: Sort column value of the last returned row
+        last_id: Primary key of the last returned row
+    """
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort_by, "o": sort_order, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor issued by :func:`encode_cursor` for the same sort.
+
+    Returns:
+        (last sort value, last id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or the sort changed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload: Dict[str, Any] = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = payload["v"], int(payload["id"])
+        if isinstance(value, dict) and "dt" in value:
+            value = datetime.fromisoformat(value["dt"])
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    return value, last_id
+
+
+def order_keyset(query: Query, sort_column, id_column, descending: bool) -> Query:
+    """
+    Apply the total order used by keyset pagination: sort column with NULLs
+    last (same on PostgreSQL and SQLite), then id as tie-breaker.
+    """
+    if sort_column is id_column:
+        return query.order_by(id_column.desc() if descending else id_column.asc())
+    if descending:
+        return query.order_by(sort_column.desc().nulls_last(), id_column.desc())
+    return query.order_by(sort_column.asc().nulls_last(), id_column.asc())
+
+
+def after_keyset(query: Query, sort_column, id_column, descending: bool, value: Any, last_id: int) -> Query:
+    """Restrict ``query`` to rows that come after (``value``, ``last_id``) in keyset order"""
+    id_after = id_column < last_id if descending else id_column > last_id
+
+    if sort_column is id_column:
+        return query.filter(id_after)
+
+    if value is None:
+        # Already inside the trailing NULL block
+        return query.filter(and_(sort_column.is_(None), id_after))
+
+    value_after = sort_column < value if descending else sort_column > value
+    return query.filter(or_(
+        value_after,
+        and_(sort_column == value, id_after),
+        sort_column.is_(None),
+    ))
+
+
+def estimate_count(query: Query) -> Optional[int]:
+    """
+    Row count estimate from the PostgreSQL planner (EXPLAIN, nothing is executed).
+
+    Returns:
+        Estimated rows, or None if the database has no planner estimate
+    """
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    try:
+        compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"⚠️ Row estimate failed, falling back to COUNT: {e}")
+        return None
@@ -0,0 +1,149 @@
+"""
+Principal cache
+Authenticated users resolved from memory instead of a query per request
+
+get_current_user looks the token's username up here. A hit rebuilds the
+User from the cached columns and attaches it to the request session without
+a query (``Session.merge(load=False)``); columns that are not cached
+(password hash, refresh token) are loaded only if an endpoint touches them.
+
+Entries live in the 'principals' cache namespace (Redis for
+PRINCIPAL_CACHE_TTL seconds, L1 for only PRINCIPAL_CACHE_L1_TTL) and are
+dropped when a commit changes a cached column, deletes the user, revokes its
+refresh token (logout) or changes its 2FA configuration. Other processes
+drop their L1 copy within PRINCIPAL_CACHE_L1_TTL, so a deactivation takes
+effect everywhere almost at once.
+"""
+import logging
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..cache import cache_namespace
+from ..core.config import settings
+from ..models import TwoFactorAuth, User
+
+logger = logging.getLogger(__name__)
+
+# User columns kept in the cache (no credentials)
+PRINCIPAL_FIELDS = ('id', 'username', 'email', 'full_name', 'is_active', 'is_admin', 'created_at')
+
+_CHANGED_KEY = "principals_changed"
+_ALL_CHANGED_KEY = "principals_all_changed"
+
+
+class PrincipalCache:
+    """Username -> cached principal (user columns and 2FA state)"""
+
+    def __init__(self, namespace: str = "principals"):
+        self.namespace = cache_namespace(namespace, l1_ttl=settings.PRINCIPAL_CACHE_L1_TTL)
+
+    def principal(self, db: Session, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached principal of ``username``, loaded on a miss.
+
+        Returns:
+            Dict with PRINCIPAL_FIELDS and two_factor_enabled, None if the user does not exist
+        """
+        principal = self.namespace.get(username)
+        if principal is None:
+            _, principal = self._load(db, username)
+        return principal
+
+    def get_user(self, db: Session, username: str) -> Optional[User]:
+        """
+        User ``username`` attached to ``db`` (no query on a cache hit).
+
+        Returns:
+            User or None if the user does not exist
+        """
+        principal = self.namespace.get(username)
+        if principal is None:
+            user, _ = self._load(db, username)
+            return user
+
+        user = User(**{f: principal[f] for f in PRINCIPAL_FIELDS})
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def _load(self, db: Session, username: str):
+        row = (
+            db.query(User, TwoFactorAuth.is_enabled)
+            .outerjoin(TwoFactorAuth, TwoFactorAuth.user_id == User.id)
+            .filter(User.username == username)
+            .first()
+        )
+        if row is None:
+            return None, None
+
+        user, two_factor_enabled = row
+        principal = {f: getattr(user, f) for f in PRINCIPAL_FIELDS}
+        principal['two_factor_enabled'] = bool(two_factor_enabled)
+        self.namespace.set(username, principal, ttl=settings.PRINCIPAL_CACHE_TTL)
+        return user, principal
+
+    def invalidate(self, username: Optional[str] = None):
+        """Drop the principal of ``username`` (all principals if None)"""
+        if username is None:
+            self.namespace.invalidate()
+        else:
+            self.namespace.delete(username)
+
+
+principal_cache = PrincipalCache()
+
+
+def _changed_usernames(user: User, deleted: bool) -> Set[str]:
+    """Usernames whose principal a flushed change of ``user`` makes stale"""
+    state = inspect(user)
+    if deleted or state.attrs.username.history.deleted:
+        return {user.username, *state.attrs.username.history.deleted}
+    if any(state.attrs[f].history.has_changes() for f in PRINCIPAL_FIELDS):
+        return {user.username}
+    refresh_token = state.attrs.refresh_token_hash.history
+    if refresh_token.has_changes() and user.refresh_token_hash is None:
+        return {user.username}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context):
+    changed: Set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            changed |= _changed_usernames(obj, deleted=obj in session.deleted)
+        elif isinstance(obj, TwoFactorAuth):
+            session.info[_ALL_CHANGED_KEY] = True
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in (User, TwoFactorAuth):
+            orm_execute_state.session.info[_ALL_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session: Session):
+    changed = session.info.pop(_CHANGED_KEY, set())
+    everything = session.info.pop(_ALL_CHANGED_KEY, False)
+    if not (changed or everything):
+        return
+    try:
+        if everything:
+            principal_cache.invalidate()
+        else:
+            for username in changed:
+                principal_cache.invalidate(username)
+    except Exception as e:
+        logger.error(f"❌ Principal cache invalidation failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session):
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_ALL_CHANGED_KEY, None)
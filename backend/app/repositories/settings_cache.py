@@ -0,0 +1,131 @@
+"""
+Settings cache
+In-memory copy of the app_settings and system_settings tables
+
+All rows of both tables are loaded at once (per database engine) and every
+get_setting/get_system_setting is served from memory. A committed change to
+either table (ORM flush or bulk ``query().update()/.delete()``) bumps the
+generation of the 'settings' cache namespace in Redis, a version counter
+every API and worker process compares against its copy:
+- the writing process reloads on its next read
+- other processes within CACHE_L1_TTL seconds
+- without Redis, copies are reloaded at the latest after SETTINGS_CACHE_TTL
+"""
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..cache import cache_namespace
+from ..core.config import settings
+from ..models import AppSetting, SystemSettings
+
+logger = logging.getLogger(__name__)
+
+_CHANGED_KEY = "settings_changed"
+_SETTINGS_MODELS = (AppSetting, SystemSettings)
+
+
+@dataclass
+class _Snapshot:
+    generation: int
+    loaded_at: float
+    app: Dict[str, Optional[str]] = field(default_factory=dict)
+    system: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+class SettingsCache:
+    """Per-engine snapshots of all settings, reloaded when the generation changes"""
+
+    def __init__(self, namespace: str = "settings"):
+        self.namespace = cache_namespace(namespace)
+        self._snapshots: "weakref.WeakKeyDictionary[Engine, _Snapshot]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _snapshot(self, db: Session) -> _Snapshot:
+        engine = db.get_bind()
+        generation = self.namespace.generation()
+        snapshot = self._snapshots.get(engine)
+        if (
+            snapshot is not None
+            and snapshot.generation == generation
+            and time.monotonic() - snapshot.loaded_at < settings.SETTINGS_CACHE_TTL
+        ):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshots.get(engine)
+            if snapshot is None or snapshot.generation != generation or (
+                time.monotonic() - snapshot.loaded_at >= settings.SETTINGS_CACHE_TTL
+            ):
+                snapshot = self._load(engine, generation)
+                self._snapshots[engine] = snapshot
+        return snapshot
+
+    @staticmethod
+    def _load(engine: Engine, generation: int) -> _Snapshot:
+        # Own connection: only committed values are cached, never a caller's pending changes
+        with engine.connect() as conn:
+            app = dict(conn.execute(select(AppSetting.key, AppSetting.value)).all())
+            system = dict(conn.execute(select(SystemSettings.key, SystemSettings.value)).all())
+        logger.debug(f"Settings loaded: {len(app)} app, {len(system)} system (generation {generation})")
+        return _Snapshot(generation=generation, loaded_at=time.monotonic(), app=app, system=system)
+
+    def get(self, db: Session, key: str, default: Optional[str] = None) -> Optional[str]:
+        """App setting value, ``default`` if the row does not exist"""
+        return self._snapshot(db).app.get(key, default)
+
+    def get_system(self, db: Session, key: str, default: Optional[str] = None) -> Optional[str]:
+        """System setting value, ``default`` if the row does not exist"""
+        return self._snapshot(db).system.get(key, default)
+
+    def app_settings(self, db: Session) -> Dict[str, Optional[str]]:
+        """All app settings (a copy)"""
+        return dict(self._snapshot(db).app)
+
+    def invalidate(self):
+        """Make every process reload its settings on the next read"""
+        self.namespace.invalidate()
+        with self._lock:
+            self._snapshots.clear()
+
+
+settings_cache = SettingsCache()
+
+
+def _is_setting(obj) -> bool:
+    return isinstance(obj, _SETTINGS_MODELS)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context):
+    if any(_is_setting(obj) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in _SETTINGS_MODELS:
+            orm_execute_state.session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session: Session):
+    if session.info.pop(_CHANGED_KEY, False):
+        try:
+            settings_cache.invalidate()
+        except Exception as e:
+            logger.error(f"❌ Settings cache invalidation failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session):
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,121 @@
+"""
+Statistics Repository
+Aggregates for the admin statistics overview
+"""
+from datetime import datetime
+from typing import Any, Dict
+import logging
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from ..cache import cache_namespace
+from ..core.config import settings
+from ..models import Contact, Tag, Group, User
+from .contact_events import on_contacts_changed
+
+logger = logging.getLogger(__name__)
+
+statistics_cache = cache_namespace('statistics')
+
+OVERVIEW_CACHE_KEY = 'overview'
+
+
+@on_contacts_changed
+def _invalidate_statistics(changes: Dict[str, int]):
+    statistics_cache.invalidate()
+
+
+def _non_empty(column):
+    return case((func.coalesce(column, '') != '', 1))
+
+
+class StatisticsRepository:
+    """
+    Repository for statistics queries.
+
+    All contact totals come from one scan of ``contacts`` (conditional
+    aggregates); the result is cached until contacts change.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def overview(self) -> Dict[str, Any]:
+        """
+        Statistics overview (cached; invalidated by any committed contact change).
+
+        Returns:
+            Dict with totals, completeness, top_companies, top_positions and
+            contacts_by_month
+        """
+        cached = statistics_cache.get(OVERVIEW_CACHE_KEY)
+        if cached is not None:
+            return cached
+
+        overview = self.compute_overview()
+        statistics_cache.set(OVERVIEW_CACHE_KEY, overview, ttl=settings.STATISTICS_CACHE_TTL)
+        return overview
+
+    def compute_overview(self) -> Dict[str, Any]:
+        """Compute the statistics overview from the database"""
+        # Contact totals in one pass; the small tables as scalar subqueries
+        (
+            total_contacts, with_email, with_phone, with_photo,
+            total_tags, total_groups, total_users
+        ) = self.db.execute(select(
+            func.count(Contact.id),
+            func.count(_non_empty(Contact.email)),
+            func.count(_non_empty(Contact.phone)),
+            func.count(_non_empty(Contact.photo_path)),
+            select(func.count(Tag.id)).scalar_subquery(),
+            select(func.count(Group.id)).scalar_subquery(),
+            select(func.count(User.id)).scalar_subquery(),
+        ).select_from(Contact)).one()
+
+        return {
+            "totals": {
+                "contacts": total_contacts,
+                "tags": total_tags,
+                "groups": total_groups,
+                "users": total_users,
+            },
+            "completeness": {
+                "with_email": with_email,
+                "with_phone": with_phone,
+                "with_photo": with_photo,
+                "email_percentage": round((with_email / total_contacts * 100) if total_contacts > 0 else 0, 1),
+                "phone_percentage": round((with_phone / total_contacts * 100) if total_contacts > 0 else 0, 1),
+                "photo_percentage": round((with_photo / total_contacts * 100) if total_contacts > 0 else 0, 1),
+            },
+            "top_companies": self._top_values(Contact.company),
+            "top_positions": self._top_values(Contact.position),
+            "contacts_by_month": self._contacts_by_month(),
+        }
+
+    def _top_values(self, column, limit: int = 10):
+        rows = self.db.query(
+            column,
+            func.count(Contact.id).label('count')
+        ).filter(
+            column.isnot(None),
+            column != ''
+        ).group_by(column).order_by(func.count(Contact.id).desc()).limit(limit).all()
+        return [{"name": name, "count": count} for name, count in rows]
+
+    def _contacts_by_month(self, months: int = 12):
+        """Contacts created per month, oldest first, for the last ``months`` months"""
+        if self.db.get_bind().dialect.name == 'sqlite':
+            month = func.strftime('%Y-%m', Contact.created_at)
+        else:
+            month = func.to_char(Contact.created_at, 'YYYY-MM')
+
+        now = datetime.utcnow()
+        first = now.year * 12 + now.month - 1 - (months - 1)
+        since = datetime(first // 12, first % 12 + 1, 1)
+
+        rows = self.db.query(
+            month.label('month'),
+            func.count(Contact.id).label('count')
+        ).filter(Contact.created_at >= since).group_by('month').order_by('month').all()
+        return [{"month": m, "count": count} for m, count in rows]
@@ -101,17 +101,16 @@ class ContactBase(BaseModel):
     # Notes and files
     comment: Optional[str] = None
     photo_path: Optional[str] = None
-    ocr_raw: Optional[str] = None
 
 
 class ContactCreate(ContactBase):
     """Schema for creating a contact."""
-    pass
+    ocr_raw: Optional[str] = None
 
 
 class ContactUpdate(ContactBase):
     """Schema for updating a contact."""
-    pass
+    ocr_raw: Optional[str] = None
 
 
 class ContactResponse(ContactBase):
@@ -131,9 +130,12 @@ class PaginatedContactsResponse(BaseModel):
     """Schema for paginated contacts response."""
     items: List[ContactResponse]
     total: int
-    page: int
+    page: Optional[int] = None
     limit: int
-    pages: int
+    pages: Optional[int] = None
+    # Cursor pagination only
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
     
     model_config = ConfigDict(from_attributes=True)
 
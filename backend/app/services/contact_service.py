@@ -9,21 +9,23 @@ Handles all business logic related to contacts including:
 - Phone number formatting
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import List, Optional, Dict, Any, Tuple
 import uuid
 import logging
 
 from .base import BaseService
 from ..models import Contact, User, Tag, Group, AuditLog
+from ..repositories.contact_search import ContactSearch
+from ..repositories.contact_repository import contact_list_options
+from ..repositories.pagination import (
+    InvalidCursorError, encode_cursor, decode_cursor,
+    order_keyset, after_keyset, estimate_count
+)
 from ..core.phone import format_phone_number
 from ..core.utils import create_audit_log, get_system_setting
-from ..core.metrics import (
-    contacts_created_counter,
-    contacts_updated_counter,
-    contacts_deleted_counter,
-    contacts_total
-)
+
+# Columns usable as keyset sort keys (cursor pagination)
+CURSOR_SORT_FIELDS = ('id', 'full_name', 'company', 'position', 'created_at')
 
 
 class ContactService(BaseService):
@@ -44,7 +46,10 @@ class ContactService(BaseService):
         sort_by: str = 'id',
         sort_order: str = 'desc',
         page: int = 1,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        use_cursor: bool = False,
+        exact_total: bool = False
     ) -> Dict[str, Any]:
         """
         Get paginated list of contacts with advanced search and filtering.
@@ -55,30 +60,29 @@ class ContactService(BaseService):
             position: Position filter
             tags: Comma-separated tag names
             groups: Comma-separated group names
-            sort_by: Field to sort by (id, full_name, company, position)
+            sort_by: Field to sort by (id, full_name, company, position, or
+                relevance when ``q`` is given)
             sort_order: Sort direction (asc, desc)
             page: Page number (starts from 1)
             limit: Items per page
+            cursor: Opaque cursor from the previous page's ``next_cursor``
+                (implies ``use_cursor``)
+            use_cursor: Keyset pagination instead of OFFSET; ``page`` is ignored
+            exact_total: In cursor mode, COUNT(*) instead of the planner estimate
         
         Returns:
-            Dict with items, total, page, limit, and pages
+            Dict with items, total, page, limit, and pages (offset mode) or
+            items, total, total_is_estimate, limit and next_cursor (cursor mode)
+        
+        Raises:
+            InvalidCursorError: Malformed cursor or unsupported cursor sort
         """
-        query = self.db.query(Contact)
+        # Serialized columns only; tags/groups in one query each for the page
+        query = self.db.query(Contact).options(*contact_list_options())
         
-        # Full-text search
+        # Full-text search (index-backed, see repositories/contact_search.py)
         if q:
-            search_term = f"%{q}%"
-            query = query.filter(
-                or_(
-                    Contact.full_name.ilike(search_term),
-                    Contact.company.ilike(search_term),
-                    Contact.position.ilike(search_term),
-                    Contact.email.ilike(search_term),
-                    Contact.phone.ilike(search_term),
-                    Contact.website.ilike(search_term),
-                    Contact.address.ilike(search_term)
-                )
-            )
+            query = ContactSearch(self.db).filter(query, q, rank=(sort_by == 'relevance'))
         
         # Filter by company
         if company:
@@ -108,12 +112,16 @@ class ContactService(BaseService):
                 if group_ids:
                     query = query.filter(Contact.groups.any(Group.id.in_(group_ids)))
         
-        # Sorting
-        sort_field = getattr(Contact, sort_by, Contact.id)
-        if sort_order.lower() == 'asc':
-            query = query.order_by(sort_field.asc())
-        else:
-            query = query.order_by(sort_field.desc())
+        if use_cursor or cursor:
+            return self._list_contacts_keyset(query, sort_by, sort_order, limit, cursor, exact_total)
+        
+        # Sorting ('relevance' ordering was applied by the search above)
+        if not (q and sort_by == 'relevance'):
+            sort_field = getattr(Contact, sort_by, Contact.id)
+            if sort_order.lower() == 'asc':
+                query = query.order_by(sort_field.asc())
+            else:
+                query = query.order_by(sort_field.desc())
         
         # Get total count before pagination
         total = query.count()
@@ -133,9 +141,60 @@ class ContactService(BaseService):
             "pages": pages
         }
     
+    def _list_contacts_keyset(
+        self,
+        query,
+        sort_by: str,
+        sort_order: str,
+        limit: int,
+        cursor: Optional[str],
+        exact_total: bool
+    ) -> Dict[str, Any]:
+        """
+        Keyset page of an already filtered contacts query.
+        
+        Seeks past the last row of the previous page on (sort column, id), so
+        the cost of a page does not grow with its depth and rows inserted or
+        deleted meanwhile do not shift pages.
+        """
+        if sort_by not in CURSOR_SORT_FIELDS:
+            raise InvalidCursorError(
+                f"Cursor pagination supports sort_by in {', '.join(CURSOR_SORT_FIELDS)}"
+            )
+        sort_order = 'asc' if sort_order.lower() == 'asc' else 'desc'
+        descending = sort_order == 'desc'
+        sort_column = getattr(Contact, sort_by)
+        
+        # Total for the whole filtered set (independent of the cursor position)
+        total = None if exact_total else estimate_count(query)
+        total_is_estimate = total is not None
+        if total is None:
+            total = query.count()
+        
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort_by, sort_order)
+            query = after_keyset(query, sort_column, Contact.id, descending, value, last_id)
+        
+        # One extra row tells whether there is a next page
+        rows = order_keyset(query, sort_column, Contact.id, descending).limit(limit + 1).all()
+        items = rows[:limit]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
+        
+        return {
+            "items": items,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+    
     def search_contacts(self, q: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Fast global search for contacts.
+        Fast global search for contacts, best matches first.
         
         Args:
             q: Search query
@@ -144,27 +203,13 @@ class ContactService(BaseService):
         Returns:
             List of contact dictionaries with minimal data
         """
-        search_term = f"%{q}%"
-        
-        contacts = self.db.query(Contact).filter(
-            or_(
-                Contact.full_name.ilike(search_term),
-                Contact.company.ilike(search_term),
-                Contact.position.ilike(search_term),
-                Contact.email.ilike(search_term),
-                Contact.phone.ilike(search_term)
-            )
-        ).limit(limit).all()
-        
-        # Return simplified data
-        return [{
-            'id': c.id,
-            'full_name': c.full_name,
-            'company': c.company,
-            'position': c.position,
-            'email': c.email,
-            'phone': c.phone
-        } for c in contacts]
+        # Only the returned columns are selected
+        query = self.db.query(
+            Contact.id, Contact.full_name, Contact.company,
+            Contact.position, Contact.email, Contact.phone
+        )
+        rows = ContactSearch(self.db).filter(query, q, rank=True).limit(limit).all()
+        return [row._asdict() for row in rows]
     
     def get_by_id(self, contact_id: int) -> Optional[Contact]:
         """
@@ -232,10 +277,6 @@ class ContactService(BaseService):
         self.commit()
         self.refresh(contact)
         
-        # Update metrics
-        contacts_created_counter.inc()
-        contacts_total.set(self.db.query(Contact).count())
-        
         return contact
     
     def update_contact(
@@ -282,9 +323,6 @@ class ContactService(BaseService):
         self.commit()
         self.refresh(contact)
         
-        # Update metrics
-        contacts_updated_counter.inc()
-        
         return contact
     
     def delete_contact(self, contact_id: int, current_user: User) -> bool:
@@ -315,10 +353,6 @@ class ContactService(BaseService):
         self.delete(contact)
         self.commit()
         
-        # Update metrics
-        contacts_deleted_counter.inc()
-        contacts_total.set(self.db.query(Contact).count())
-        
         return True
     
     def get_contact_history(self, contact_id: int, limit: int = 50) -> List[AuditLog]:
@@ -0,0 +1,138 @@
+"""
+Duplicate Service
+
+Finds likely duplicate contacts (core/duplicates.py) using the duplicate
+detection settings:
+- for one contact (new card at upload): candidates come from indexed
+  lookups (email, phone, name search), then are scored
+- full-table sweep: every contact goes into a blocking/LSH index; only
+  contacts sharing a block are scored
+"""
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from .base import BaseService
+from .settings_service import SettingsService
+from ..core.duplicates import FINGERPRINT_FIELDS, PHONE_FIELDS, ContactFingerprint, DuplicateIndex
+from ..core.metrics import record_duplicate_detection
+from ..core.phone import format_phone_number
+from ..models import Contact
+from ..repositories.contact_search import ContactSearch
+
+# Rows fetched per round trip during a sweep
+SWEEP_BATCH_SIZE = 5000
+
+# Name search matches considered for one contact
+MAX_NAME_CANDIDATES = 200
+
+
+def _fingerprint_columns():
+    return [Contact.id] + [getattr(Contact, f) for f in FINGERPRINT_FIELDS]
+
+
+def _fingerprint_row(row) -> ContactFingerprint:
+    return ContactFingerprint.from_fields(row[0], dict(zip(FINGERPRINT_FIELDS, row[1:])))
+
+
+class DuplicateService(BaseService):
+    """
+    Service for duplicate contact detection.
+
+    The threshold defaults to the ``duplicate_similarity_threshold`` setting.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.settings = SettingsService(db).get_duplicate_detection_settings()
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings['enabled']
+
+    @property
+    def auto_detect(self) -> bool:
+        return self.settings['enabled'] and self.settings['auto_detect']
+
+    def find_duplicates_for(
+        self,
+        contact: Contact,
+        threshold: Optional[float] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Find contacts similar to ``contact``.
+
+        Args:
+            contact: Contact to check (usually just created)
+            threshold: Minimum score (default: setting)
+            limit: Maximum number of results
+
+        Returns:
+            List of dicts with contact_id, duplicate_id, score, matched_fields; best first
+        """
+        threshold = self.settings['threshold'] if threshold is None else threshold
+        started = time.time()
+
+        fingerprint = ContactFingerprint.from_fields(
+            contact.id, {f: getattr(contact, f, None) for f in FINGERPRINT_FIELDS}
+        )
+        index = DuplicateIndex()
+        index.add_all(_fingerprint_row(row) for row in self._candidate_rows(contact))
+        matches = index.find_matches(fingerprint, threshold)[:limit]
+
+        record_duplicate_detection(time.time() - started, len(matches))
+        return [asdict(m) for m in matches]
+
+    def _candidate_rows(self, contact: Contact):
+        """Fingerprint columns of contacts sharing an email, a phone or a name token (index-backed lookups)"""
+        conditions = []
+        if contact.email:
+            conditions.append(func.lower(Contact.email) == contact.email.strip().lower())
+        phones = {format_phone_number(getattr(contact, f, None)) for f in PHONE_FIELDS} - {''}
+        if phones:
+            # Any phone of the contact against any phone column (each indexed)
+            conditions.extend(getattr(Contact, f).in_(phones) for f in PHONE_FIELDS)
+
+        candidate_ids = set()
+        if conditions:
+            candidate_ids.update(
+                contact_id for (contact_id,) in self.db.query(Contact.id).filter(or_(*conditions))
+            )
+
+        name_tokens = (contact.full_name or contact.last_name or '').split()
+        if name_tokens:
+            longest = max(name_tokens, key=len)
+            query = ContactSearch(self.db).filter(self.db.query(Contact.id), longest)
+            candidate_ids.update(contact_id for (contact_id,) in query.limit(MAX_NAME_CANDIDATES))
+
+        candidate_ids.discard(contact.id)
+        if not candidate_ids:
+            return []
+        return self.db.query(*_fingerprint_columns()).filter(Contact.id.in_(candidate_ids)).all()
+
+    def find_all_duplicates(self, threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Sweep all contacts for likely duplicate pairs.
+
+        Args:
+            threshold: Minimum score (default: setting)
+
+        Returns:
+            List of dicts with contact_id, duplicate_id, score, matched_fields; best first
+        """
+        threshold = self.settings['threshold'] if threshold is None else threshold
+        started = time.time()
+
+        index = DuplicateIndex()
+        rows = self.db.query(*_fingerprint_columns()).yield_per(SWEEP_BATCH_SIZE)
+        index.add_all(_fingerprint_row(row) for row in rows)
+        matches = index.find_pairs(threshold)
+
+        duration = time.time() - started
+        record_duplicate_detection(duration, len(matches))
+        self.logger.info(f"✅ Duplicate sweep: {len(matches)} pairs among {len(index)} contacts in {duration:.1f}s")
+        return [asdict(m) for m in matches]
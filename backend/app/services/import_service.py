@@ -0,0 +1,340 @@
+"""
+Import Service
+
+Bulk import of contacts from CSV/XLSX files:
+- reads the file in chunks (memory does not grow with the file)
+- formats phone numbers column-wise (core/phone.py)
+- skips rows duplicating an existing contact or an earlier row
+  (same uid, same email, or a shared phone plus a common name word; looked up
+  through indexes) and reports them in the summary
+- writes each chunk with COPY (PostgreSQL) or one executemany INSERT
+- adds the audit log rows set-based (INSERT ... SELECT)
+"""
+import csv
+import io
+import json
+import os
+import re
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+from sqlalchemy import func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from .base import BaseService
+from ..core.phone import format_phone_series
+from ..models import AuditLog, Contact, User
+from ..repositories.contact_events import record_contact_changes
+
+# Columns accepted from the file (others are ignored)
+IMPORT_FIELDS = [
+    'uid', 'full_name', 'last_name', 'first_name', 'middle_name',
+    'company', 'position', 'department', 'email',
+    'phone', 'phone_mobile', 'phone_work', 'phone_additional', 'fax',
+    'address', 'address_additional', 'website', 'comment',
+]
+PHONE_FIELDS = ['phone', 'phone_mobile', 'phone_work', 'phone_additional']
+
+IMPORT_CHUNK_SIZE = 5000
+
+# Values per IN (...) lookup; stays below SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+SUPPORTED_EXTENSIONS = ('csv', 'xlsx', 'xls')
+
+# Skipped rows listed in the summary (the count is always complete)
+SKIPPED_REPORT_LIMIT = 1000
+
+NAME_FIELDS = ['full_name', 'last_name', 'first_name']
+
+# progress(rows_processed, fraction_of_file_done)
+ProgressCallback = Callable[[int, float], None]
+
+
+def iter_import_chunks(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[Tuple[pd.DataFrame, float]]:
+    """
+    Read an import file in chunks of string columns.
+
+    Yields:
+        (chunk, fraction of the file read so far)
+
+    Raises:
+        ValueError: Unsupported file extension
+    """
+    ext = path.rsplit('.', 1)[-1].lower()
+
+    if ext == 'csv':
+        size = os.path.getsize(path) or 1
+        with open(path, 'rb') as f:
+            for chunk in pd.read_csv(f, dtype=str, keep_default_na=False, chunksize=chunk_size):
+                yield chunk, min(f.tell() / size, 1.0)
+
+    elif ext == 'xlsx':
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(c) if c is not None else '' for c in next(rows, [])]
+            total = max((sheet.max_row or 1) - 1, 1)
+            buffer, done = [], 0
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= chunk_size:
+                    done += len(buffer)
+                    yield pd.DataFrame(buffer, columns=header, dtype=object), min(done / total, 1.0)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header, dtype=object), 1.0
+        finally:
+            workbook.close()
+
+    elif ext == 'xls':
+        # Legacy binary format has no streaming reader
+        df = pd.read_excel(path, dtype=str)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size], min((start + chunk_size) / max(len(df), 1), 1.0)
+
+    else:
+        raise ValueError('Unsupported file format')
+
+
+def name_tokens(*names: Optional[str]) -> Set[str]:
+    """Lowercase words (2+ characters) of the given name fields"""
+    return {
+        word for name in names if isinstance(name, str)  # skips None/NaN
+        for word in re.findall(r'\w+', str(name).lower()) if len(word) > 1
+    }
+
+
+class ContactImporter(BaseService):
+    """
+    Bulk contact importer (one transaction per chunk).
+
+    Duplicate keys seen in earlier chunks are remembered, so duplicates
+    within the file are skipped as well. A shared phone alone (an office
+    switchboard) is not a duplicate: the names must share a word too.
+    """
+
+    def __init__(self, db: Session, user: Optional[User] = None, filename: Optional[str] = None,
+                 chunk_size: int = IMPORT_CHUNK_SIZE):
+        super().__init__(db)
+        self.user = user
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self._seen: Dict[str, Set[str]] = {'uid': set(), 'email': set()}
+        # phone -> name words of the rows imported with it
+        self._seen_phones: Dict[str, Set[str]] = {}
+
+    def run(self, path: str, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Import a CSV/XLSX file.
+
+        Args:
+            path: File path (extension selects the format)
+            progress: Called after each chunk
+
+        Returns:
+            Dict with total_rows, imported, skipped_duplicates, skipped_empty and
+            skipped (first SKIPPED_REPORT_LIMIT duplicates: file row, matched key and value)
+        """
+        summary = {'total_rows': 0, 'imported': 0, 'skipped_duplicates': 0, 'skipped_empty': 0,
+                   'skipped': []}
+
+        for chunk, fraction in iter_import_chunks(path, self.chunk_size):
+            offset = summary['total_rows']
+            summary['total_rows'] += len(chunk)
+
+            rows = self._prepare(chunk)
+            summary['skipped_empty'] += len(chunk) - len(rows)
+
+            fresh, skipped = self._drop_duplicates(rows)
+            summary['skipped_duplicates'] += len(skipped)
+            if len(summary['skipped']) < SKIPPED_REPORT_LIMIT:
+                # Line 1 of the file is the header
+                positions = chunk.index.get_indexer(skipped.index) + offset + 2
+                summary['skipped'].extend(
+                    {'row': int(row), 'reason': reason, 'value': value}
+                    for row, reason, value in zip(positions, skipped['reason'], skipped['value'])
+                )
+                del summary['skipped'][SKIPPED_REPORT_LIMIT:]
+
+            if len(fresh):
+                self.import_rows(fresh)
+                summary['imported'] += len(fresh)
+
+            if progress:
+                progress(summary['total_rows'], fraction)
+
+        self.logger.info(
+            f"✅ Imported {summary['imported']}/{summary['total_rows']} contacts "
+            f"({summary['skipped_duplicates']} duplicates, {summary['skipped_empty']} empty)"
+        )
+        return summary
+
+    def _prepare(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Select known columns, trim values, format phones, drop empty rows"""
+        chunk = chunk.rename(columns=lambda c: str(c).strip().lower())
+        df = pd.DataFrame(index=chunk.index)
+        for field in IMPORT_FIELDS:
+            if field in chunk.columns:
+                column = chunk[field]
+                if isinstance(column, pd.DataFrame):  # repeated header
+                    column = column.iloc[:, 0]
+                values = column.astype(object).where(column.notna(), '').astype(str).str.strip()
+                if field in PHONE_FIELDS:
+                    values = format_phone_series(values)
+                df[field] = values.where(values != '', None)
+            else:
+                df[field] = None
+
+        data_fields = [f for f in IMPORT_FIELDS if f != 'uid']
+        return df[df[data_fields].notna().any(axis=1)]
+
+    def _drop_duplicates(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Drop rows duplicating a contact in the DB, earlier in the file, or earlier in the chunk.
+
+        A row is a duplicate on the same uid, the same email, or a phone in
+        common (any of PHONE_FIELDS on either side) with a name word in common.
+
+        Returns:
+            (kept rows, matched key ('reason') and 'value' of each dropped row)
+        """
+        keys = {
+            'uid': df['uid'],
+            'email': df['email'].str.lower(),
+        }
+        existing = {
+            'uid': self._existing('uid', Contact.uid, keys['uid']),
+            'email': self._existing('email', func.lower(Contact.email), keys['email']),
+        }
+
+        skipped = pd.DataFrame({'reason': None, 'value': None}, index=df.index, dtype=object)
+        for name, values in keys.items():
+            present = values.notna()
+            duplicate = present & skipped['reason'].isna() & (
+                values.isin(existing[name] | self._seen[name]) | values.duplicated(keep='first')
+            )
+            skipped.loc[duplicate, 'reason'] = name
+            skipped.loc[duplicate, 'value'] = df.loc[duplicate, name]
+
+        # Rows are checked in order, so a phone row also matches earlier rows of the chunk
+        candidates = df[skipped['reason'].isna() & df[PHONE_FIELDS].notna().any(axis=1)]
+        existing_phones = self._existing_phones(pd.concat([candidates[f] for f in PHONE_FIELDS]))
+        for index, row in candidates.iterrows():
+            tokens = name_tokens(*(row[f] for f in NAME_FIELDS))
+            phones = [row[f] for f in PHONE_FIELDS if isinstance(row[f], str)]
+            matched = next(
+                (p for p in phones
+                 if tokens & (existing_phones.get(p, set()) | self._seen_phones.get(p, set()))),
+                None
+            )
+            if matched:
+                skipped.loc[index] = ['phone', matched]
+            else:
+                for phone in phones:
+                    self._seen_phones.setdefault(phone, set()).update(tokens)
+
+        keep = skipped['reason'].isna()
+        for name, values in keys.items():
+            self._seen[name].update(values[keep].dropna())
+        return df[keep], skipped[~keep]
+
+    def _existing(self, name: str, column, values: pd.Series) -> Set[str]:
+        """Values already present in ``column`` (batched IN lookups, index-backed)"""
+        found: Set[str] = set()
+        # Keys accepted earlier in this file are dropped anyway
+        unique = list(set(values.dropna()) - self._seen[name])
+        for start in range(0, len(unique), LOOKUP_BATCH_SIZE):
+            batch = unique[start:start + LOOKUP_BATCH_SIZE]
+            found.update(v for (v,) in self.db.execute(select(column).where(column.in_(batch))))
+        return found
+
+    def _existing_phones(self, values: pd.Series) -> Dict[str, Set[str]]:
+        """
+        Name words of the contacts having each phone in any phone column
+        (batched IN lookups, one index per column).
+        """
+        found: Dict[str, Set[str]] = {}
+        unique = list(set(values.dropna()))
+        phone_columns = [getattr(Contact, f) for f in PHONE_FIELDS]
+        for start in range(0, len(unique), LOOKUP_BATCH_SIZE):
+            batch = unique[start:start + LOOKUP_BATCH_SIZE]
+            wanted = set(batch)
+            rows = self.db.execute(
+                select(*phone_columns, *(getattr(Contact, f) for f in NAME_FIELDS))
+                .where(or_(*(column.in_(batch) for column in phone_columns)))
+            )
+            for row in rows:
+                tokens = name_tokens(*row[len(PHONE_FIELDS):])
+                for phone in set(row[:len(PHONE_FIELDS)]) & wanted:
+                    found.setdefault(phone, set()).update(tokens)
+        return found
+
+    def import_rows(self, df: pd.DataFrame) -> List[str]:
+        """
+        Insert prepared rows and their audit entries, then commit.
+
+        Returns:
+            uids of the inserted contacts
+        """
+        df = df.copy()
+        missing_uid = df['uid'].isna()
+        df.loc[missing_uid, 'uid'] = [uuid.uuid4().hex for _ in range(int(missing_uid.sum()))]
+        df['status'] = 'active'
+        df['has_qr_code'] = 0
+
+        columns = list(df.columns)
+        rows = [
+            {c: (None if v is None or v != v else v) for c, v in zip(columns, record)}
+            for record in df.itertuples(index=False, name=None)
+        ]
+
+        if self.db.get_bind().dialect.name == 'postgresql':
+            self._copy(columns, rows)
+        else:
+            self.db.execute(insert(Contact.__table__), rows)
+
+        uids = df['uid'].tolist()
+        self._audit(uids)
+        record_contact_changes(self.db, inserted=len(rows))
+        self.commit()
+        return uids
+
+    def _copy(self, columns: List[str], rows: Iterable[Dict[str, Any]]):
+        """COPY rows into contacts (unquoted empty field = NULL)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(['' if row[c] is None else row[c] for c in columns])
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY contacts ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    def _audit(self, uids: List[str]):
+        """One 'created' audit entry per imported contact, inserted set-based"""
+        changes = json.dumps({'source': 'import', 'file': self.filename}, ensure_ascii=False)
+        for start in range(0, len(uids), LOOKUP_BATCH_SIZE):
+            batch = uids[start:start + LOOKUP_BATCH_SIZE]
+            self.db.execute(
+                insert(AuditLog.__table__).from_select(
+                    ['contact_id', 'user_id', 'username', 'action', 'entity_type', 'changes'],
+                    select(
+                        Contact.id,
+                        literal(self.user.id if self.user else None),
+                        literal(self.user.username if self.user else None),
+                        literal('created'),
+                        literal('contact'),
+                        literal(changes),
+                    ).where(Contact.uid.in_(batch))
+                )
+            )
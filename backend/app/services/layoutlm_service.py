@@ -23,8 +23,13 @@ except ImportError:
     LAYOUTLM_AVAILABLE = False
     logging.warning("LayoutLMv3 not available. Install with: pip install transformers torch")
 
+from ..integrations.layoutlm.batching import bucket_by_length, word_level_predictions
+
 logger = logging.getLogger(__name__)
 
+# Cards per forward pass in classify_fields_batch
+DEFAULT_BATCH_SIZE = int(os.getenv('LAYOUTLM_BATCH_SIZE', '8'))
+
 
 class LayoutLMv3Service:
     """
@@ -135,56 +140,98 @@ class LayoutLMv3Service:
                 - confidence: float
                 - predictions: List[Dict] (raw predictions)
         """
+        return self.classify_fields_batch([(image, ocr_blocks)])[0]
+    
+    def classify_fields_batch(
+        self,
+        items: List[Tuple[Image.Image, List[Dict[str, Any]]]],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify OCR blocks of several cards with batched forward passes
+        
+        Cards are bucketed by token length; each bucket is padded once to its
+        longest card and classified in a single CPU forward pass.
+        
+        Args:
+            items: List of (image, ocr_blocks) pairs, one per card
+            batch_size: Cards per forward pass
+        
+        Returns:
+            One result per card (same format as classify_fields), in input order
+        """
+        if not items:
+            return []
+        
         if not self.is_available():
             logger.warning("LayoutLMv3 not available, returning empty result")
-            return self._empty_result()
-        
-        if not ocr_blocks:
-            logger.warning("No OCR blocks provided")
-            return self._empty_result()
+            return [self._empty_result() for _ in items]
         
         try:
-            # Extract words and bboxes from OCR blocks
-            words = [block['text'] for block in ocr_blocks]
-            boxes = [self._normalize_bbox(block['bbox'], image.size) for block in ocr_blocks]
+            results: List[Optional[Dict[str, Any]]] = [None] * len(items)
             
-            # Encode inputs
-            encoding = self.processor(
-                image,
-                words,
-                boxes=boxes,
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=512
-            )
-            
-            # Move to device
-            encoding = {k: v.to(self.device) for k, v in encoding.items()}
-            
-            # Inference
-            with torch.no_grad():
-                outputs = self.model(**encoding)
-                predictions = outputs.logits.argmax(-1).squeeze().tolist()
+            # Extract words and bboxes from OCR blocks
+            prepared = {}
+            for idx, (image, ocr_blocks) in enumerate(items):
+                if not ocr_blocks:
+                    logger.warning("No OCR blocks provided")
+                    results[idx] = self._empty_result()
+                    continue
+                words = [block['text'] for block in ocr_blocks]
+                boxes = [self._normalize_bbox(block['bbox'], image.size) for block in ocr_blocks]
+                prepared[idx] = (words, boxes)
             
-            # Handle single-token case (predictions is int, not list)
-            if isinstance(predictions, int):
-                predictions = [predictions]
+            # Token length per card for padding-aware bucketing
+            indices = list(prepared.keys())
+            lengths = [
+                len(self.processor.tokenizer(
+                    prepared[idx][0], boxes=prepared[idx][1], truncation=True, max_length=512
+                )['input_ids'])
+                for idx in indices
+            ]
             
-            # Decode predictions
-            result = self._decode_predictions(
-                words,
-                predictions,
-                ocr_blocks
-            )
+            for bucket in bucket_by_length(lengths, batch_size):
+                bucket_indices = [indices[i] for i in bucket]
+                
+                # Encode inputs (padded to the longest card in this bucket)
+                encoding = self.processor(
+                    [items[idx][0].convert('RGB') for idx in bucket_indices],
+                    [prepared[idx][0] for idx in bucket_indices],
+                    boxes=[prepared[idx][1] for idx in bucket_indices],
+                    return_tensors="pt",
+                    padding="longest",
+                    truncation=True,
+                    max_length=512
+                )
+                
+                # Move to device
+                inputs = {k: v.to(self.device) for k, v in encoding.items()}
+                
+                # Inference
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                    token_predictions = outputs.logits.argmax(-1).tolist()
+                
+                for row, idx in enumerate(bucket_indices):
+                    words = prepared[idx][0]
+                    
+                    predictions, _ = word_level_predictions(
+                        encoding.word_ids(row),
+                        token_predictions[row],
+                        len(words),
+                        outside_label=self.LABEL2ID['O']
+                    )
+                    
+                    # Decode predictions
+                    results[idx] = self._decode_predictions(words, predictions, items[idx][1])
             
-            logger.info(f"LayoutLMv3 classified {len(words)} tokens")
+            logger.info(f"LayoutLMv3 classified {len(items)} card(s)")
             
-            return result
+            return results
             
         except Exception as e:
             logger.error(f"LayoutLMv3 classification failed: {e}", exc_info=True)
-            return self._empty_result()
+            return [self._empty_result() for _ in items]
     
     def _normalize_bbox(self, bbox: List[List[int]], image_size: Tuple[int, int]) -> List[int]:
         """
@@ -0,0 +1,501 @@
+"""
+Monitoring Service
+
+Background sampler for the monitoring dashboard: probes services, Celery,
+OCR stats and system health concurrently (each in a thread, with a timeout)
+and keeps the latest snapshot, so the dashboard endpoint never blocks on them.
+
+With Redis, only one API process (the holder of a Redis lock) samples; it
+publishes the snapshot to Redis and the other processes read it from there.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import case, desc, func, or_, text
+
+from .. import cache
+from ..core.config import settings
+from ..database import SessionLocal
+from ..models import Contact
+
+logger = logging.getLogger(__name__)
+
+# Per-worker timeout for one Celery inspect broadcast
+CELERY_INSPECT_TIMEOUT = 1.0
+
+# Redis keys of the shared snapshot and of the sampler lock
+SNAPSHOT_KEY = "monitoring:snapshot"
+SAMPLER_LOCK_KEY = "monitoring:sampler"
+
+
+# ----------------------------------------------------------------------------
+# Probes (blocking; run in threads by MonitoringSampler)
+# ----------------------------------------------------------------------------
+
+def probe_celery() -> Dict[str, Any]:
+    """Inspect Celery workers once; feeds both the services and queue sections"""
+    from ..celery_app import celery_app
+    inspect = celery_app.control.inspect(timeout=CELERY_INSPECT_TIMEOUT)
+
+    active = inspect.active()
+    active_count = sum(len(tasks) for tasks in (active or {}).values())
+    scheduled = inspect.scheduled()
+    scheduled_count = sum(len(tasks) for tasks in (scheduled or {}).values())
+    reserved = inspect.reserved()
+    reserved_count = sum(len(tasks) for tasks in (reserved or {}).values())
+    stats = inspect.stats()
+    queues = probe_queues()
+
+    return {
+        "active_tasks": active_count,
+        "scheduled_tasks": scheduled_count,
+        "reserved_tasks": reserved_count,
+        "total_pending": active_count + scheduled_count + reserved_count + sum(q["depth"] for q in queues),
+        "queues": queues,
+        "workers": list(stats.keys()) if stats else [],
+        "workers_count": len(stats) if stats else 0,
+        "status": "operational" if stats else "no_workers"
+    }
+
+
+def _sent_at(raw_message: Optional[bytes]) -> Optional[float]:
+    """Publish time stamped by celery_app._stamp_sent_at (None if absent/unreadable)"""
+    if not raw_message:
+        return None
+    try:
+        return float(json.loads(raw_message)["headers"]["sent_at"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def probe_queues() -> List[Dict[str, Any]]:
+    """
+    Depth and head-of-line wait of every task queue, read from the broker.
+
+    Each queue is one Redis list per priority; messages are pushed on the
+    left, so the oldest is the last element of each list.
+    """
+    from ..celery_app import PRIORITY_SEPARATOR, PRIORITY_STEPS, TASK_QUEUES, celery_app
+
+    keys = {
+        queue: [queue] + [f"{queue}{PRIORITY_SEPARATOR}{p}" for p in PRIORITY_STEPS if p]
+        for queue in TASK_QUEUES
+    }
+    with celery_app.connection_for_read() as connection:
+        pipe = connection.default_channel.client.pipeline(transaction=False)
+        for queue in TASK_QUEUES:
+            for key in keys[queue]:
+                pipe.llen(key)
+                pipe.lindex(key, -1)
+        replies = iter(pipe.execute())
+
+    now = time.time()
+    queues = []
+    for queue in TASK_QUEUES:
+        depth, oldest = 0, None
+        for _ in keys[queue]:
+            length, tail = next(replies), next(replies)
+            depth += length
+            sent_at = _sent_at(tail)
+            if sent_at is not None and (oldest is None or sent_at < oldest):
+                oldest = sent_at
+        queues.append({
+            "name": queue,
+            "depth": depth,
+            "wait_seconds": round(max(now - oldest, 0.0), 1) if oldest is not None else 0.0,
+        })
+    return queues
+
+
+def probe_minio() -> Dict[str, Any]:
+    import requests
+    response = requests.get("http://minio:9000/minio/health/live", timeout=2)
+    return {
+        "name": "MinIO Storage",
+        "status": "healthy" if response.status_code == 200 else "error",
+        "endpoint": "minio:9000"
+    }
+
+
+def probe_redis() -> Dict[str, Any]:
+    import redis
+    host = os.getenv('REDIS_HOST', 'redis')
+    r = redis.Redis(host=host, port=6379, socket_connect_timeout=2, socket_timeout=2)
+    r.ping()
+    return {
+        "name": "Redis Cache",
+        "status": "healthy",
+        "endpoint": f"{host}:6379"
+    }
+
+
+def probe_postgres() -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+    return {
+        "name": "PostgreSQL",
+        "status": "healthy",
+        "endpoint": "db:5432"
+    }
+
+
+def probe_label_studio() -> Dict[str, Any]:
+    import requests
+    response = requests.get("http://label-studio:8080/health", timeout=2)
+    return {
+        "name": "Label Studio",
+        "status": "healthy" if response.status_code == 200 else "warning",
+        "endpoint": "label-studio:8080"
+    }
+
+
+def probe_ocr_stats() -> Dict[str, Any]:
+    """OCR processing statistics for the last 24 hours (one aggregate query)"""
+    yesterday = datetime.utcnow() - timedelta(hours=24)
+    db = SessionLocal()
+    try:
+        total_scans, ocr_scans, qr_scans, photo_scans = db.query(
+            func.count(Contact.id),
+            func.count(case((or_(Contact.ocr_result.has(), Contact.photo_path.isnot(None)), 1))),
+            func.count(case((Contact.has_qr_code == 1, 1))),
+            func.count(case((Contact.photo_path.isnot(None), 1))),
+        ).filter(Contact.created_at >= yesterday).one()
+    finally:
+        db.close()
+
+    methods_breakdown = {}
+    if qr_scans > 0:
+        methods_breakdown['QR Code'] = qr_scans
+    if photo_scans > 0:
+        methods_breakdown['OCR (Photo)'] = photo_scans
+    manual_scans = total_scans - qr_scans - photo_scans
+    if manual_scans > 0:
+        methods_breakdown['Manual Entry'] = manual_scans
+
+    return {
+        "period": "last_24h",
+        "total_scans": total_scans,
+        "ocr_scans": ocr_scans,
+        "methods_breakdown": methods_breakdown,
+        "success_rate": round((ocr_scans / total_scans * 100) if total_scans > 0 else 0, 2)
+    }
+
+
+def probe_recent_scans(limit: int = 20) -> List[Dict[str, Any]]:
+    """Most recent business card scans (only the columns the dashboard shows)"""
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            Contact.id, Contact.full_name, Contact.company, Contact.email, Contact.phone,
+            Contact.position, Contact.website, Contact.photo_path, Contact.has_qr_code,
+            Contact.created_at, Contact.ocr_result.has().label('has_ocr')
+        ).order_by(desc(Contact.created_at)).limit(limit).all()
+    finally:
+        db.close()
+
+    scans = []
+    for row in rows:
+        # Determine recognition method based on available data
+        if row.has_qr_code == 1:
+            recognition_method = "QR Code"
+        elif row.photo_path:
+            recognition_method = "OCR (Photo)"
+        elif row.has_ocr:
+            recognition_method = "OCR"
+        else:
+            recognition_method = "Manual Entry"
+
+        scans.append({
+            "id": row.id,
+            "full_name": row.full_name or "Unknown",
+            "company": row.company or "",
+            "recognition_method": recognition_method,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "has_photo": bool(row.photo_path),
+            "fields_count": sum([
+                bool(row.full_name),
+                bool(row.email),
+                bool(row.phone),
+                bool(row.company),
+                bool(row.position),
+                bool(row.website),
+            ])
+        })
+    return scans
+
+
+def probe_system_health() -> Dict[str, Any]:
+    """
+    CPU, memory and disk usage.
+
+    CPU is measured since the previous sample (``interval=None``), so no
+    probe ever sleeps.
+    """
+    import psutil
+
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory_percent = psutil.virtual_memory().percent
+    disk_percent = psutil.disk_usage('/').percent
+
+    # Overall health status
+    if cpu_percent > 90 or memory_percent > 90 or disk_percent > 90:
+        status = "critical"
+    elif cpu_percent > 70 or memory_percent > 70 or disk_percent > 80:
+        status = "warning"
+    else:
+        status = "healthy"
+
+    return {
+        "status": status,
+        "cpu_percent": round(cpu_percent, 2),
+        "memory_percent": round(memory_percent, 2),
+        "disk_percent": round(disk_percent, 2),
+        "uptime": "N/A"
+    }
+
+
+# Fallbacks reported when a probe fails or times out
+def _celery_error(error: str) -> Dict[str, Any]:
+    return {
+        "active_tasks": 0, "scheduled_tasks": 0, "reserved_tasks": 0, "total_pending": 0,
+        "queues": [], "workers": [], "workers_count": 0, "status": "error", "error": error
+    }
+
+
+def _ocr_stats_error(error: str) -> Dict[str, Any]:
+    return {
+        "period": "last_24h", "total_scans": 0, "ocr_scans": 0,
+        "methods_breakdown": {}, "success_rate": 0, "error": error
+    }
+
+
+def _system_health_error(error: str) -> Dict[str, Any]:
+    return {"status": "unknown", "cpu_percent": 0, "memory_percent": 0, "disk_percent": 0, "error": error}
+
+
+def _connection_failed(service_name: str) -> Callable[[str], Dict[str, Any]]:
+    def fallback(error: str) -> Dict[str, Any]:
+        return {"name": service_name, "status": "error", "error": "Connection failed"}
+    return fallback
+
+
+def _label_studio_unknown(error: str) -> Dict[str, Any]:
+    return {"name": "Label Studio", "status": "unknown", "endpoint": "label-studio:8080"}
+
+
+def _no_scans(error: str) -> List[Dict[str, Any]]:
+    return []
+
+
+def _consume_result(future: asyncio.Future):
+    """Retrieve the outcome of a probe nobody waits for any more (timed out)"""
+    if not future.cancelled():
+        future.exception()
+
+
+# ----------------------------------------------------------------------------
+# Sampler
+# ----------------------------------------------------------------------------
+
+class MonitoringSampler:
+    """
+    Keeps a rolling snapshot of the monitoring dashboard data.
+
+    ``start()`` runs a loop on the event loop. In every cycle the process
+    holding the Redis sampler lock runs all probes concurrently (each in a
+    worker thread, with a timeout) and publishes the snapshot; the other
+    processes only read the published snapshot. Without Redis every process
+    samples for itself.
+
+    A probe whose previous run is still hanging in its thread is skipped
+    instead of starting another thread.
+    """
+
+    def __init__(self, interval: float, probe_timeout: float):
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._running: Dict[str, asyncio.Future] = {}
+        self._leader_lock = None
+        # A leader that stops renewing is replaced after this long
+        self.lock_ttl = 2 * interval + probe_timeout
+        self.snapshot_ttl = 4 * interval + probe_timeout
+
+    async def _probe(self, name: str, fn: Callable[[], Any], fallback: Callable[[str], Any]) -> Any:
+        running = self._running.get(name)
+        if running is not None and not running.done():
+            logger.warning(f"⚠️ Monitoring probe '{name}' skipped: previous run still in progress")
+            return fallback("Previous probe still running")
+
+        future = asyncio.ensure_future(asyncio.to_thread(fn))
+        future.add_done_callback(_consume_result)
+        self._running[name] = future
+        try:
+            # shield: on timeout stop waiting, but keep tracking the thread until it returns
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Monitoring probe '{name}' timed out after {self.probe_timeout}s")
+            return fallback("Timed out")
+        except Exception as e:
+            logger.error(f"❌ Monitoring probe '{name}' failed: {e}")
+            return fallback(str(e))
+
+    async def sample(self) -> Dict[str, Any]:
+        """Run all probes concurrently and build a dashboard snapshot"""
+        (
+            queue, minio, redis_status, postgres, label_studio,
+            ocr_stats, recent_scans, system_health
+        ) = await asyncio.gather(
+            self._probe("celery", probe_celery, _celery_error),
+            self._probe("minio", probe_minio, _connection_failed("MinIO Storage")),
+            self._probe("redis", probe_redis, _connection_failed("Redis Cache")),
+            self._probe("postgres", probe_postgres, _connection_failed("PostgreSQL")),
+            self._probe("label_studio", probe_label_studio, _label_studio_unknown),
+            self._probe("ocr_stats", probe_ocr_stats, _ocr_stats_error),
+            self._probe("recent_scans", probe_recent_scans, _no_scans),
+            self._probe("system_health", probe_system_health, _system_health_error),
+        )
+
+        if queue.get("status") == "error":
+            celery_status = {"name": "Celery Workers", "status": "error", "error": queue.get("error")}
+        else:
+            celery_status = {
+                "name": "Celery Workers",
+                "status": "healthy" if queue["workers_count"] else "warning",
+                "workers_count": queue["workers_count"],
+                "active_tasks": queue["active_tasks"]
+            }
+
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "services": {
+                "backend": {
+                    "name": "Backend API",
+                    "version": "6.0.0",
+                    "status": "healthy",
+                    "uptime": "N/A"
+                },
+                "celery": celery_status,
+                "minio": minio,
+                "redis": redis_status,
+                "postgres": postgres,
+                "label_studio": label_studio,
+            },
+            "queue": queue,
+            "ocr_stats": ocr_stats,
+            "recent_scans": recent_scans,
+            "system_health": system_health
+        }
+
+    def _lock(self) -> asyncio.Lock:
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        return self._refresh_lock
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Take a new sample now (and publish it)"""
+        async with self._lock():
+            self._snapshot = await self.sample()
+            await asyncio.to_thread(self._publish, self._snapshot)
+            return self._snapshot
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """Latest snapshot; samples once if neither this process nor the sampler has one yet"""
+        if self._snapshot is None:
+            async with self._lock():
+                # Concurrent first callers share one sample
+                if self._snapshot is None:
+                    self._snapshot = await asyncio.to_thread(self._read_shared)
+                if self._snapshot is None:
+                    self._snapshot = await self.sample()
+                    await asyncio.to_thread(self._publish, self._snapshot)
+        return self._snapshot
+
+    def _is_leader(self) -> bool:
+        """Take or renew the sampler lock (always True without Redis)"""
+        client = cache.redis_client
+        if client is None:
+            return True
+        try:
+            if self._leader_lock is not None and self._leader_lock.owned():
+                self._leader_lock.reacquire()
+                return True
+            self._leader_lock = client.lock(SAMPLER_LOCK_KEY, timeout=self.lock_ttl, thread_local=False)
+            return self._leader_lock.acquire(blocking=False)
+        except Exception as e:
+            logger.warning(f"⚠️ Monitoring sampler lock unavailable: {e}")
+            self._leader_lock = None
+            return True
+
+    def _publish(self, snapshot: Dict[str, Any]):
+        client = cache.redis_client
+        if client is None:
+            return
+        try:
+            client.set(SNAPSHOT_KEY, json.dumps(snapshot, default=str), px=int(self.snapshot_ttl * 1000))
+        except Exception as e:
+            logger.error(f"❌ Monitoring snapshot publish failed: {e}")
+
+    def _read_shared(self) -> Optional[Dict[str, Any]]:
+        client = cache.redis_client
+        if client is None:
+            return None
+        try:
+            data = client.get(SNAPSHOT_KEY)
+        except Exception as e:
+            logger.error(f"❌ Monitoring snapshot read failed: {e}")
+            return None
+        return json.loads(data) if data else None
+
+    async def _cycle(self):
+        if await asyncio.to_thread(self._is_leader):
+            await self.refresh()
+            return
+        shared = await asyncio.to_thread(self._read_shared)
+        if shared is not None:
+            self._snapshot = shared
+
+    async def _run(self):
+        while True:
+            try:
+                await self._cycle()
+            except Exception as e:
+                logger.error(f"❌ Monitoring sample failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background sampling loop (call from the running event loop)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"✅ Monitoring sampler started (every {self.interval}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._leader_lock is not None:
+            try:
+                self._leader_lock.release()
+            except Exception:
+                pass  # Expired or Redis gone: the lock times out on its own
+            self._leader_lock = None
+
+
+monitoring_sampler = MonitoringSampler(
+    interval=settings.MONITORING_SAMPLE_INTERVAL,
+    probe_timeout=settings.MONITORING_PROBE_TIMEOUT
+)
@@ -12,7 +12,8 @@ import logging
 
 from .base import BaseService
 from ..models import AppSetting, SystemSettings
-from ..core.utils import get_system_setting
+from ..core.utils import get_setting, get_system_setting
+from ..repositories.settings_cache import settings_cache
 
 
 class SettingsService(BaseService):
@@ -27,7 +28,10 @@ class SettingsService(BaseService):
     
     def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
-        Get a system setting value.
+        Get a setting value (from the settings cache).
+        
+        The app setting written by ``set_setting`` wins; the system setting
+        of the same key is the fallback.
         
         Args:
             key: Setting key
@@ -36,6 +40,9 @@ class SettingsService(BaseService):
         Returns:
             Setting value or default
         """
+        value = get_setting(self.db, key)
+        if value is not None:
+            return value
         return get_system_setting(self.db, key, default)
     
     def set_setting(self, key: str, value: str) -> AppSetting:
@@ -78,8 +85,7 @@ class SettingsService(BaseService):
         Returns:
             Dict mapping keys to values
         """
-        settings = self.get_all_settings()
-        return {s.key: s.value for s in settings}
+        return settings_cache.app_settings(self.db)
     
     def delete_setting(self, key: str) -> bool:
         """
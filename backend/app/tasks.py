@@ -5,24 +5,28 @@ import os
 import io
 import uuid
 import json
-import time
+import shutil
 import zipfile
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 
-from celery import Task
+from celery import Task, chord, group
 from sqlalchemy.orm import Session
 
+from . import cache
 from .celery_app import celery_app
 from .database import SessionLocal
 from .models import Contact
 from .integrations.ocr.providers import OCRManager  # Old OCR v1.0
-from .integrations.ocr.providers_v2 import OCRManagerV2  # NEW OCR v2.0
+from .integrations.ocr.inference_client import get_ocr_manager_v2  # NEW OCR v2.0
 from .integrations.ocr.utils import enhance_ocr_result
 from .core import qr as qr_utils
-from .integrations.ocr.image_utils import downscale_image_bytes, create_thumbnail
-from .services.layoutlm_service import get_layoutlm_service
+from .integrations.ocr.image_utils import create_thumbnail
+from .core.card_image import CardImage
+from .integrations.ocr import result_cache
+from .core.config import settings
+from .core.task_blobs import blob_path, delete_expired_blobs
 from .services.validator_service import ValidatorService
 from .services.storage_service import StorageService
 from .integrations.label_studio.service import LabelStudioService
@@ -31,50 +35,74 @@ from PIL import Image
 
 logger = logging.getLogger(__name__)
 
-# Initialize OCR managers (v1.0 fallback + v2.0 primary)
-ocr_manager_v1 = OCRManager()  # Old Tesseract-based (fallback)
-ocr_manager_v2 = OCRManagerV2(enable_layoutlm=True)  # NEW PaddleOCR + LayoutLMv3
-layoutlm_service = get_layoutlm_service()
+# OCR v1.0 fallback (Tesseract, lightweight)
+ocr_manager_v1 = OCRManager()
+
+# OCR v2.0 (PaddleOCR + LayoutLMv3) is obtained via get_ocr_manager_v2(): it talks
+# to the shared OCR inference server when OCR_INFERENCE_ADDRESS is set, so worker
+# children never load the models themselves (and recycling them is cheap).
+
+# Per-batch chunk counters (Redis hash, see batch_progress)
+BATCH_PROGRESS_KEY = "batch:progress:{}"
+BATCH_PROGRESS_TTL = 86400
 
 # Initialize Label Studio and Active Learning
 label_studio_service = LabelStudioService()
 active_learning_service = ActiveLearningService()
 
-# Use v2.0 by default
-ocr_manager = ocr_manager_v2  # PRIMARY: Use OCR v2.0 for all new cards
-
-logger.info("🚀 OCR v2.0 initialized: PaddleOCR + LayoutLMv3 + Validator + Label Studio ready")
-
 
 def _process_card_sync(
-    image_data: bytes,
+    image_data: Union[bytes, CardImage],
     filename: str,
     provider: str = 'auto',
     user_id: int = None,
-    db: Session = None
+    db: Session = None,
+    qr_data: Optional[Dict[str, Any]] = None,
+    ocr_result: Optional[Union[Dict[str, Any], Exception]] = None,
+    ocr_version: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Synchronous version of process_single_card for use in batch processing.
     Does not use Celery task context.
+    
+    Batch callers may pass precomputed ``qr_data`` / ``ocr_result`` (from
+    OCRManagerV2.recognize_batch; an Exception means v2.0 failed for this
+    card) and ``ocr_version`` so they are not recomputed per card.
     """
     _db = db if db else SessionLocal()
     try:
         logger.info(f"Processing card (sync): {filename}")
         
+        image = image_data if isinstance(image_data, CardImage) else CardImage.from_bytes(image_data)
+        
         # Save file
-        file_ext = os.path.splitext(filename)[1].lower()
         safe_name = f"{uuid.uuid4().hex}_{filename}"
         save_path = os.path.join('/app/uploads', safe_name)
-        
-        with open(save_path, 'wb') as f:
-            f.write(image_data)
+        image.save(save_path)
         
         # Create thumbnail
-        thumbnail_path = create_thumbnail(save_path, size=(200, 200), quality=85)
+        thumbnail_path = create_thumbnail(save_path, size=(200, 200), quality=85, image=image)
         thumbnail_name = os.path.basename(thumbnail_path)
         
-        # Try QR code first
-        qr_data = qr_utils.process_image_with_qr(image_data)
+        # Check OCR version setting
+        if ocr_version is None:
+            from .core.utils import get_setting
+            ocr_version = get_setting(_db, "ocr_version", "v2.0")
+        
+        # Determine provider
+        provider_name = None if provider == 'auto' else provider
+        
+        # Try the result cache, then QR code (unless the batch caller already did)
+        cache_key = None
+        if qr_data is None and ocr_result is None:
+            cache_key, cached = result_cache.lookup(image, provider_name, ocr_version)
+            if cached:
+                qr_data, ocr_result = cached['qr_data'], cached['ocr_result']
+                cache_key = None  # Already cached
+            else:
+                qr_data = qr_utils.process_image_with_qr(image)
+                if qr_data and any(qr_data.values()):
+                    result_cache.store(cache_key, qr_data=qr_data)
         
         data = None
         raw_json = None
@@ -90,27 +118,27 @@ def _process_card_sync(
             }, ensure_ascii=False)
             logger.info(f"QR code extracted from {filename}")
         else:
-            # Check OCR version setting
-            from .core.utils import get_setting
-            ocr_version = get_setting(_db, "ocr_version", "v2.0")
-            
             # Increased limit for high-res business cards
-            ocr_input = downscale_image_bytes(image_data, max_size=6000)
-            
-            # Determine provider
-            provider_name = None if provider == 'auto' else provider
+            ocr_input = image.downscale(max_side=6000)
             
             # Run OCR based on version setting
-            if ocr_version == "v2.0":
+            if ocr_result is not None and not isinstance(ocr_result, Exception) and ocr_version != "v2.0":
+                # Cached result (v1.0 results are only cached when v1.0 is selected)
+                logger.info(f"🔧 Using cached OCR v1.0 result for {filename}")
+            elif ocr_version == "v2.0":
                 # Use OCR v2.0 (PaddleOCR + LayoutLMv3)
                 logger.info(f"🚀 Using OCR v2.0 for {filename}")
                 try:
-                    ocr_result = ocr_manager_v2.recognize(
-                        image_data=ocr_input,
-                        provider_name=provider_name,
-                        use_layout=True,  # Enable LayoutLMv3 AI classification
-                        filename=filename
-                    )
+                    if isinstance(ocr_result, Exception):
+                        raise ocr_result
+                    if ocr_result is None:
+                        ocr_result = get_ocr_manager_v2().recognize(
+                            image_data=ocr_input,
+                            provider_name=provider_name,
+                            use_layout=True,  # Enable LayoutLMv3 AI classification
+                            filename=filename
+                        )
+                        result_cache.store(cache_key, ocr_result=ocr_result)
                     
                     # Validate and auto-correct with ValidatorService
                     validator = ValidatorService(_db)
@@ -121,7 +149,7 @@ def _process_card_sync(
                 except Exception as v2_error:
                     logger.warning(f"⚠️ OCR v2.0 failed, falling back to v1.0: {v2_error}")
                     ocr_result = ocr_manager_v1.recognize(
-                        ocr_input,
+                        ocr_input.encode(),
                         filename=filename,
                         preferred_provider=provider_name
                     )
@@ -129,10 +157,11 @@ def _process_card_sync(
                 # Use OCR v1.0 (Tesseract)
                 logger.info(f"🔧 Using OCR v1.0 for {filename}")
                 ocr_result = ocr_manager_v1.recognize(
-                    ocr_input,
+                    ocr_input.encode(),
                     filename=filename,
                     preferred_provider=provider_name
                 )
+                result_cache.store(cache_key, ocr_result=ocr_result)
             
             # Process OCR result (works for both v1.0 and v2.0)
             data = ocr_result['data']
@@ -239,7 +268,7 @@ class DatabaseTask(Task):
 @celery_app.task(bind=True, base=DatabaseTask, name='app.tasks.process_single_card')
 def process_single_card(
     self,
-    image_data: bytes,
+    image_key: str,
     filename: str,
     provider: str = 'auto',
     user_id: int = None
@@ -248,7 +277,7 @@ def process_single_card(
     Process a single business card image.
     
     Args:
-        image_data: Binary image data
+        image_key: Task blob key of the image (core.task_blobs.put_blob)
         filename: Original filename
         provider: OCR provider ('auto', 'tesseract', 'parsio', 'google')
         user_id: User ID for audit
@@ -257,27 +286,36 @@ def process_single_card(
         dict with contact data or error
     """
     try:
-        logger.info(f"✅ CELERY TASK STARTED: process_single_card for {filename} (data size: {len(image_data)} bytes)")
+        logger.info(f"✅ CELERY TASK STARTED: process_single_card for {filename} (blob {image_key[:12]})")
         logger.info(f"Processing card: {filename}")
         
         # Update task state
         self.update_state(state='PROCESSING', meta={'status': 'Scanning image...'})
         
-        # Save file
-        file_ext = os.path.splitext(filename)[1].lower()
+        # Save file (kernel-side copy of the task blob)
         safe_name = f"{uuid.uuid4().hex}_{filename}"
         save_path = os.path.join('/app/uploads', safe_name)
-        
-        with open(save_path, 'wb') as f:
-            f.write(image_data)
+        shutil.copyfile(blob_path(image_key), save_path)
         
         # Create thumbnail
         thumbnail_path = create_thumbnail(save_path, size=(200, 200), quality=85)
         thumbnail_name = os.path.basename(thumbnail_path)
         
+        # Check OCR version setting
+        from .core.utils import get_setting
+        ocr_version = get_setting(self.db, "ocr_version", "v2.0")
+        preferred = None if provider == 'auto' else provider
+        
+        # Identical image seen before with the same pipeline: skip QR and OCR
+        image = CardImage.from_file(save_path)
+        cache_key, cached = result_cache.lookup(image, preferred, ocr_version)
+        
         # Try QR code first
         self.update_state(state='PROCESSING', meta={'status': 'Looking for QR code...'})
-        qr_data = qr_utils.process_image_with_qr(image_data)
+        if cached:
+            qr_data = cached['qr_data']
+        else:
+            qr_data = qr_utils.process_image_with_qr(image)
         
         data = None
         raw_json = None
@@ -292,44 +330,49 @@ def process_single_card(
                 'data': qr_data
             }, ensure_ascii=False)
             logger.info(f"QR code extracted from {filename}")
+            if not cached:
+                result_cache.store(cache_key, qr_data=qr_data)
         else:
             # Fallback to OCR
             self.update_state(state='PROCESSING', meta={'status': 'Running OCR...'})
             
-            # Check OCR version setting
-            from .core.utils import get_setting
-            ocr_version = get_setting(_db, "ocr_version", "v2.0")
-            
             # Increased limit for high-res business cards
-            ocr_input = downscale_image_bytes(image_data, max_side=6000)
-            preferred = None if provider == 'auto' else provider
+            ocr_input = image.downscale(max_side=6000)
             
             # Run OCR based on version setting
-            if ocr_version == "v2.0":
+            if cached and cached.get('ocr_result'):
+                ocr_result = cached['ocr_result']
+                logger.info(f"✅ Using cached OCR result for {filename}")
+                if ocr_version == "v2.0":
+                    validator = ValidatorService(self.db)
+                    ocr_result = validator.validate_ocr_result(ocr_result, auto_correct=True)
+            elif ocr_version == "v2.0":
                 logger.info(f"🚀 Using OCR v2.0 for {filename}")
                 try:
-                    ocr_result = ocr_manager_v2.recognize(
+                    ocr_result = get_ocr_manager_v2().recognize(
                         image_data=ocr_input,
                         provider_name=preferred,
                         use_layout=True,
                         filename=filename
                     )
-                    validator = ValidatorService(_db)
+                    result_cache.store(cache_key, ocr_result=ocr_result)
+                    validator = ValidatorService(self.db)
                     ocr_result = validator.validate_ocr_result(ocr_result, auto_correct=True)
                 except Exception as v2_error:
                     logger.warning(f"⚠️ OCR v2.0 failed, falling back to v1.0: {v2_error}")
                     ocr_result = ocr_manager_v1.recognize(
-                        ocr_input,
+                        ocr_input.encode(),
                         filename=filename,
                         preferred_provider=preferred
                     )
             else:
                 logger.info(f"🔧 Using OCR v1.0 for {filename}")
                 ocr_result = ocr_manager_v1.recognize(
-                    ocr_input,
+                    ocr_input.encode(),
                     filename=filename,
                     preferred_provider=preferred
                 )
+                result_cache.store(cache_key, ocr_result=ocr_result)
             
             data = ocr_result['data']
             recognition_method = ocr_result['provider']
@@ -441,6 +484,19 @@ def process_single_card(
         }
 
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff')
+
+
+def _zip_image_members(zip_ref: zipfile.ZipFile) -> List[str]:
+    """Image members of an archive (macOS metadata and hidden files skipped)"""
+    return [
+        f for f in zip_ref.namelist()
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+        and not f.startswith('__MACOSX')
+        and not f.startswith('.')
+    ]
+
+
 @celery_app.task(bind=True, name='app.tasks.process_batch_upload')
 def process_batch_upload(
     self,
@@ -451,153 +507,374 @@ def process_batch_upload(
     """
     Process a batch of business cards from a ZIP archive.
     
+    The archive is split into chunks of OCR_BATCH_SIZE cards; every chunk is
+    a process_batch_chunk subtask (run by any bulk worker, reading its cards
+    straight from the archive) and finish_batch_upload aggregates them. This
+    task is replaced by that chord, so its id reports the final result;
+    until then batch_progress() reads the counters the chunks add to.
+    
     Args:
-        zip_path: Path to ZIP file
+        zip_path: Path to ZIP file (shared uploads volume)
         provider: OCR provider
         user_id: User ID for audit
         
     Returns:
-        dict with results summary
+        dict with results summary (from finish_batch_upload)
     """
-    results = {
-        'total': 0,
-        'success': 0,
-        'failed': 0,
-        'skipped': 0,
-        'contacts': [],
-        'errors': []
-    }
-    
     try:
         logger.info(f"✅ CELERY TASK STARTED: process_batch_upload from {zip_path}")
-        logger.info(f"Processing batch upload: {zip_path}")
         
-        # Extract ZIP
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            image_files = _zip_image_members(zip_ref)
+        if not image_files:
+            raise Exception("No image files found in ZIP archive")
+        
+        logger.info(f"Found {len(image_files)} images in ZIP")
+        
+        # OCR version is read once per batch, not per card
+        from .core.utils import get_setting
+        db = SessionLocal()
+        try:
+            ocr_version = get_setting(db, "ocr_version", "v2.0")
+        finally:
+            db.close()
+        
+        chunk_size = max(1, settings.OCR_BATCH_SIZE)
+        batch_id = self.request.id
+        header = group(
+            process_batch_chunk.s(
+                zip_path, image_files[start:start + chunk_size], provider, user_id, ocr_version, batch_id=batch_id
+            )
+            for start in range(0, len(image_files), chunk_size)
+        )
+        
         self.update_state(
             state='PROCESSING',
             meta={
-                'status': 'Extracting ZIP archive...',
+                'status': f'Processing {len(image_files)} cards in {len(header.tasks)} parts...',
                 'progress': 0,
-                'total': 0,
-                'processed': 0
+                'total': len(image_files),
+                'processed': 0,
+                'batch_id': batch_id
             }
         )
+    except Exception as e:
+        logger.error(f"Batch processing failed: {e}")
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
+        raise
+    
+    raise self.replace(chord(header, finish_batch_upload.s(zip_path, len(image_files), batch_id=batch_id)))
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name='app.tasks.process_batch_chunk')
+def process_batch_chunk(
+    self,
+    zip_path: str,
+    filenames: List[str],
+    provider: str,
+    user_id: Optional[int],
+    ocr_version: str,
+    batch_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Process some cards of a ZIP batch: decode, result cache and QR per card,
+    batched OCR v2.0 inference for the rest, then validate and save.
+    
+    Members are read straight from the archive (no extracted copies). Decoded
+    pixels held at once are bounded by OCR_BATCH_MAX_PIXELS (plus one card),
+    not by the chunk size. Errors are reported per card, so the chord always
+    completes. The counts are added to the batch's progress counters
+    (batch_progress).
+    
+    Returns:
+        dict with success, failed, contacts, errors
+    """
+    results = {'success': 0, 'failed': 0, 'contacts': [], 'errors': []}
+    provider_name = None if provider == 'auto' else provider
+    
+    def fail(filename: str, error: Exception):
+        logger.error(f"Error processing {filename}: {error}")
+        results['failed'] += 1
+        results['errors'].append({'filename': filename, 'error': str(error)})
+    
+    try:
+        zip_ref = zipfile.ZipFile(zip_path, 'r')
+    except Exception as e:
+        for filename in filenames:
+            fail(filename, e)
+        _count_batch_progress(batch_id, results)
+        return results
+    
+    with zip_ref:
+        # STEP 1: Decode each card, then result cache, then QR codes. Cards that
+        # still need OCR keep only their OCR-sized copy, pending in groups of at
+        # most OCR_BATCH_SIZE cards / OCR_BATCH_MAX_PIXELS decoded pixels.
+        cards = []
+        pending = []
+        
+        def recognize_pending():
+            # STEP 2: Batched OCR v2.0 of the pending group, whose pixels are then released
+            try:
+                batch_results = get_ocr_manager_v2().recognize_batch(
+                    [c.pop('ocr_image') for c in pending],
+                    provider_name=provider_name,
+                    use_layout=True,
+                    filenames=[os.path.basename(c['filename']) for c in pending],
+                    batch_size=len(pending)
+                )
+            except Exception as e:
+                batch_results = [e] * len(pending)
+            for card, ocr_result in zip(pending, batch_results):
+                card['ocr_result'] = ocr_result
+                result_cache.store(card['cache_key'], ocr_result=ocr_result)
+            pending.clear()
         
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            file_list = zip_ref.namelist()
-            
-            # Filter image files
-            image_files = [
-                f for f in file_list
-                if f.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'))
-                and not f.startswith('__MACOSX')
-                and not f.startswith('.')
-            ]
-            
-            results['total'] = len(image_files)
-            
-            if not image_files:
-                raise Exception("No image files found in ZIP archive")
-            
-            logger.info(f"Found {len(image_files)} images in ZIP")
-            
-            # Process each image
-            for idx, filename in enumerate(image_files):
-                try:
-                    # Update progress
-                    progress = int((idx / len(image_files)) * 100)
-                    self.update_state(
-                        state='PROCESSING',
-                        meta={
-                            'status': f'Processing {filename}...',
-                            'progress': progress,
-                            'total': len(image_files),
-                            'processed': idx,
-                            'current_file': filename
-                        }
-                    )
-                    
-                    # Read image data
-                    image_data = zip_ref.read(filename)
-                    
-                    # Process card synchronously (not as Celery task)
-                    result = _process_card_sync(
-                        image_data,
-                        os.path.basename(filename),
-                        provider,
-                        user_id
-                    )
-                    
-                    if result['success']:
-                        results['success'] += 1
-                        results['contacts'].append(result)
-                    else:
-                        results['failed'] += 1
-                        results['errors'].append({
-                            'filename': filename,
-                            'error': result.get('error', 'Unknown error')
-                        })
-                    
-                    # Small delay to prevent overwhelming the system
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {filename}: {e}")
-                    results['failed'] += 1
-                    results['errors'].append({
+        for filename in filenames:
+            try:
+                image = CardImage.from_bytes(zip_ref.read(filename))
+                cache_key, cached = result_cache.lookup(image, provider_name, ocr_version)
+                if cached:
+                    cards.append({
                         'filename': filename,
-                        'error': str(e)
+                        'qr_data': cached['qr_data'],
+                        'ocr_result': cached['ocr_result'],
                     })
+                    continue
+                
+                qr_data = qr_utils.process_image_with_qr(image)
+                card = {'filename': filename, 'qr_data': qr_data, 'ocr_result': None}
+                cards.append(card)
+                if qr_data and any(qr_data.values()):
+                    result_cache.store(cache_key, qr_data=qr_data)
+                elif ocr_version == "v2.0":
+                    card['cache_key'] = cache_key
+                    card['ocr_image'] = image.downscale(max_side=6000)
+                    pending.append(card)
+                del image  # Full-size pixels are not kept while waiting for OCR
+            except Exception as e:
+                fail(filename, e)
+                continue
+            
+            if pending and (
+                len(pending) >= settings.OCR_BATCH_SIZE
+                or sum(c['ocr_image'].width * c['ocr_image'].height for c in pending)
+                >= settings.OCR_BATCH_MAX_PIXELS
+            ):
+                recognize_pending()
+        
+        if pending:
+            recognize_pending()
+        
+        # STEP 3: Validate and save each card (decoded again, one at a time;
+        # one DB session for the chunk)
+        for card in cards:
+            filename = card['filename']
+            try:
+                result = _process_card_sync(
+                    zip_ref.read(filename),
+                    os.path.basename(filename),
+                    provider,
+                    user_id,
+                    db=self.db,
+                    qr_data=card['qr_data'] or {},
+                    ocr_result=card['ocr_result'],
+                    ocr_version=ocr_version
+                )
+                if result['success']:
+                    results['success'] += 1
+                    results['contacts'].append(result)
+                else:
+                    fail(filename, Exception(result.get('error', 'Unknown error')))
+            except Exception as e:
+                fail(filename, e)
+    
+    _count_batch_progress(batch_id, results)
+    return results
+
+
+def _count_batch_progress(batch_id: Optional[str], results: Dict[str, Any]):
+    """Add a finished chunk's counts to its batch's counters (one round trip)"""
+    if not batch_id or cache.redis_client is None:
+        return
+    key = BATCH_PROGRESS_KEY.format(batch_id)
+    try:
+        pipe = cache.redis_client.pipeline(transaction=False)
+        pipe.hincrby(key, 'success', results['success'])
+        pipe.hincrby(key, 'failed', results['failed'])
+        pipe.expire(key, BATCH_PROGRESS_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Batch progress update failed for {batch_id}: {e}")
+
+
+@celery_app.task(name='app.tasks.finish_batch_upload')
+def finish_batch_upload(
+    chunk_results: List[Dict[str, Any]],
+    zip_path: str,
+    total: int,
+    batch_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Chord callback: aggregate the chunk results, remove the ZIP file and the progress counters"""
+    results = {
+        'total': total,
+        'success': 0,
+        'failed': 0,
+        'skipped': 0,
+        'contacts': [],
+        'errors': []
+    }
+    for chunk in chunk_results:
+        results['success'] += chunk['success']
+        results['failed'] += chunk['failed']
+        results['contacts'].extend(chunk['contacts'])
+        results['errors'].extend(chunk['errors'])
+    
+    if os.path.exists(zip_path):
+        os.remove(zip_path)
+    if batch_id and cache.redis_client is not None:
+        try:
+            cache.redis_client.delete(BATCH_PROGRESS_KEY.format(batch_id))
+        except Exception as e:
+            logger.warning(f"Batch progress cleanup failed for {batch_id}: {e}")
+    
+    logger.info(
+        f"Batch processing completed: {results['success']} success, "
+        f"{results['failed']} failed, {results['total']} total"
+    )
+    return results
+
+
+def batch_progress(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Live progress of a batch from the counters of its finished chunks
+    (one HGETALL; the chunk results themselves are not read).
+    
+    Args:
+        meta: PROCESSING meta of process_batch_upload
         
-        # Clean up ZIP file
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
+    Returns:
+        dict with processed, success, failed, progress (percent)
+    """
+    counters = {}
+    batch_id = meta.get('batch_id')
+    if batch_id and cache.redis_client is not None:
+        try:
+            counters = cache.redis_client.hgetall(BATCH_PROGRESS_KEY.format(batch_id))
+        except Exception as e:
+            logger.warning(f"Batch progress read failed for {batch_id}: {e}")
+    
+    success = int(counters.get(b'success', 0))
+    failed = int(counters.get(b'failed', 0))
+    
+    total = meta.get('total') or 0
+    processed = success + failed
+    return {
+        'processed': processed,
+        'success': success,
+        'failed': failed,
+        'progress': int(processed * 100 / total) if total else 0,
+    }
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name='app.tasks.import_contacts_file')
+def import_contacts_file(
+    self,
+    path: str,
+    filename: str = None,
+    user_id: int = None
+) -> Dict[str, Any]:
+    """
+    Bulk import contacts from an uploaded CSV/XLSX file.
+    
+    Args:
+        path: Path of the saved upload
+        filename: Original file name (for the audit log)
+        user_id: User ID for audit
         
-        logger.info(
-            f"Batch processing completed: {results['success']} success, "
-            f"{results['failed']} failed, {results['total']} total"
+    Returns:
+        dict with total_rows, imported, skipped_duplicates, skipped_empty, skipped (duplicate rows)
+    """
+    from .models import User
+    from .services.import_service import ContactImporter
+    
+    def report(rows: int, fraction: float):
+        self.update_state(
+            state='PROCESSING',
+            meta={
+                'status': f'Imported {rows} rows...',
+                'progress': int(fraction * 100),
+                'processed': rows
+            }
         )
+    
+    try:
+        logger.info(f"✅ CELERY TASK STARTED: import_contacts_file {filename}")
+        user = self.db.query(User).filter(User.id == user_id).first() if user_id else None
+        return ContactImporter(self.db, user=user, filename=filename).run(path, progress=report)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name='app.tasks.find_duplicate_pairs')
+def find_duplicate_pairs(self, threshold: float = None, limit: int = 100) -> Dict[str, Any]:
+    """
+    Sweep all contacts for likely duplicate pairs.
+    
+    Args:
+        threshold: Minimum score (default: duplicate_similarity_threshold setting)
+        limit: Maximum number of pairs to return
         
-        return results
-        
-    except Exception as e:
-        logger.error(f"Batch processing failed: {e}")
-        # Clean up ZIP file on error
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-        raise
+    Returns:
+        dict with enabled, total and pairs (best first)
+    """
+    from .services.duplicate_service import DuplicateService
+    
+    service = DuplicateService(self.db)
+    if not service.enabled:
+        return {'enabled': False, 'total': 0, 'pairs': []}
+    
+    self.update_state(state='PROCESSING', meta={'status': 'Searching for duplicates...', 'progress': 0})
+    pairs = service.find_all_duplicates(threshold=threshold)
+    return {'enabled': True, 'total': len(pairs), 'pairs': pairs[:limit]}
 
 
 @celery_app.task(name='app.tasks.cleanup_old_results')
 def cleanup_old_results():
     """
-    Clean up old Celery results from Redis.
+    Clean up old Celery results from Redis and expired task blobs.
     Runs periodically via Celery Beat.
     """
     try:
-        from celery.result import AsyncResult
         import redis
+        from .cache import iter_key_batches, unlink_keys
         
-        redis_client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/1'))
-        
-        # Get all keys matching celery task pattern
-        keys = redis_client.keys('celery-task-meta-*')
+        # Task results live in the result backend DB, not the cache DB
+        redis_client = redis.from_url(
+            os.getenv('CELERY_RESULT_BACKEND', os.getenv('REDIS_URL', 'redis://localhost:6379/1'))
+        )
         
         cleaned = 0
         # cutoff_time = datetime.now() - timedelta(hours=24)  # Reserved for future use
         
-        for key in keys:
+        # SCAN in batches instead of KEYS so the broker is never blocked
+        for batch in iter_key_batches('celery-task-meta-*', client=redis_client):
             try:
-                # Check if result is older than 24 hours
-                ttl = redis_client.ttl(key)
-                if ttl == -1:  # No expiry set
-                    redis_client.delete(key)
-                    cleaned += 1
+                # Results without expiry are left over; check TTLs in one round trip
+                pipe = redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.ttl(key)
+                stale = [key for key, ttl in zip(batch, pipe.execute()) if ttl == -1]
+                cleaned += unlink_keys(stale, client=redis_client)
             except Exception as e:
-                logger.warning(f"Error cleaning up key {key}: {e}")
+                logger.warning(f"Error cleaning up batch of {len(batch)} keys: {e}")
         
         logger.info(f"Cleaned up {cleaned} old Celery results")
-        return {'cleaned': cleaned}
+        
+        # Images of tasks that finished (or never ran) long ago
+        blobs_removed = delete_expired_blobs()
+        return {'cleaned': cleaned, 'blobs_removed': blobs_removed}
         
     except Exception as e:
         logger.error(f"Cleanup task failed: {e}")
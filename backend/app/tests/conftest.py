@@ -199,3 +199,9 @@ def db(test_db):
     """Alias for test_db to match repository tests"""
     return test_db
 
+
+@pytest.fixture
+def query_budget():
+    """Query-count guard on the test engine: ``with query_budget(5): ...``"""
+    from .query_counter import assert_max_queries
+    return lambda budget: assert_max_queries(engine, budget)
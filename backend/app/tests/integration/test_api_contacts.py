@@ -36,6 +36,29 @@ class TestContactsAPI:
         data = response.json()
         assert len(data["items"]) <= 10
     
+    def test_list_contacts_query_budget(self, client, auth_token, test_db, query_budget):
+        """Test a full page with tags and groups takes a fixed number of queries"""
+        from ...models import Contact, Tag, Group
+        
+        tag, group = Tag(name='budget-tag'), Group(name='budget-group')
+        test_db.add_all([
+            Contact(full_name=f'Contact {i}', tags=[tag], groups=[group])
+            for i in range(100)
+        ])
+        test_db.commit()
+        test_db.expire_all()
+        
+        # auth user, count, page, tags, groups (+ session/token checks)
+        with query_budget(10):
+            response = client.get(
+                "/contacts/?limit=100",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert len(items) == 100
+        assert all(item["tags"][0]["name"] == 'budget-tag' for item in items)
+    
     def test_list_contacts_search(self, client, auth_token, test_contact):
         """Test contacts search"""
         response = client.get(
@@ -0,0 +1,46 @@
+"""
+Query-count guard for tests
+
+    with assert_max_queries(engine, 5):
+        client.get('/contacts/?limit=100')
+
+fails when the block runs more SQL statements than its budget (e.g. an
+N+1 lazy load in a list endpoint).
+"""
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Records the SQL statements executed on an engine while active"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> 'QueryCounter':
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, budget: int):
+    """Fail if the block executes more than ``budget`` statements"""
+    with QueryCounter(engine) as counter:
+        yield counter
+    assert counter.count <= budget, (
+        f"{counter.count} queries, budget {budget}:\n" + "\n".join(counter.statements)
+    )
@@ -0,0 +1,131 @@
+"""
+Unit tests for the fanned-out ZIP batch upload (member selection, chunk
+aggregation, progress counters)
+"""
+import zipfile
+from collections import defaultdict
+
+import cv2
+import numpy as np
+import pytest
+
+try:
+    from app import tasks
+    TASKS_AVAILABLE = True
+except ImportError:  # app.tasks needs the OCR system libraries (zbar)
+    TASKS_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not TASKS_AVAILABLE, reason="OCR system libraries not installed")
+
+
+class HashRedis:
+    """The Redis hash commands used by the progress counters"""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field.encode()] = self.hashes[key].get(field.encode(), 0) + amount
+
+    def expire(self, key, ttl):
+        pass
+
+    def execute(self):
+        pass
+
+    def hgetall(self, key):
+        return {k: str(v).encode() for k, v in self.hashes.get(key, {}).items()}
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+class TestBatchUpload:
+    """Tests for process_batch_upload helpers"""
+
+    def test_zip_image_members(self, tmp_path):
+        path = tmp_path / 'cards.zip'
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name in ('a.jpg', 'b.PNG', 'notes.txt', '__MACOSX/a.jpg', '.hidden.jpg', 'dir/c.jpeg'):
+                archive.writestr(name, b'x')
+
+        with zipfile.ZipFile(path) as archive:
+            assert tasks._zip_image_members(archive) == ['a.jpg', 'b.PNG', 'dir/c.jpeg']
+
+    def test_finish_aggregates_chunks_and_removes_zip(self, tmp_path):
+        path = tmp_path / 'cards.zip'
+        path.write_bytes(b'zip')
+        chunks = [
+            {'success': 2, 'failed': 0, 'contacts': [{'contact_id': 1}, {'contact_id': 2}], 'errors': []},
+            {'success': 0, 'failed': 1, 'contacts': [], 'errors': [{'filename': 'c.jpg', 'error': 'x'}]},
+        ]
+
+        result = tasks.finish_batch_upload(chunks, str(path), 3)
+
+        assert result['total'] == 3
+        assert (result['success'], result['failed']) == (2, 1)
+        assert [c['contact_id'] for c in result['contacts']] == [1, 2]
+        assert result['errors'][0]['filename'] == 'c.jpg'
+        assert not path.exists()
+
+    def test_chunk_reports_unreadable_archive_per_card(self, tmp_path):
+        path = tmp_path / 'broken.zip'
+        path.write_bytes(b'not a zip')
+
+        result = tasks.process_batch_chunk.run(str(path), ['a.jpg', 'b.jpg'], 'auto', None, 'v2.0')
+
+        assert result['failed'] == 2
+        assert [e['filename'] for e in result['errors']] == ['a.jpg', 'b.jpg']
+
+    def test_progress_reads_chunk_counters(self, tmp_path, monkeypatch):
+        redis = HashRedis()
+        monkeypatch.setattr(tasks.cache, 'redis_client', redis)
+        path = tmp_path / 'broken.zip'
+        path.write_bytes(b'not a zip')
+
+        tasks.process_batch_chunk.run(str(path), ['a.jpg', 'b.jpg'], 'auto', None, 'v2.0', batch_id='b1')
+        tasks.process_batch_chunk.run(str(path), ['c.jpg'], 'auto', None, 'v2.0', batch_id='b1')
+
+        assert tasks.batch_progress({'batch_id': 'b1', 'total': 6}) == {
+            'processed': 3, 'success': 0, 'failed': 3, 'progress': 50,
+        }
+
+        tasks.finish_batch_upload([], str(path), 6, batch_id='b1')
+        assert tasks.batch_progress({'batch_id': 'b1', 'total': 6})['processed'] == 0
+
+    def test_chunk_ocr_groups_bounded_by_pixels(self, tmp_path, monkeypatch):
+        path = tmp_path / 'cards.zip'
+        _, jpeg = cv2.imencode('.jpg', np.full((100, 100, 3), 255, np.uint8))
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+                archive.writestr(name, jpeg.tobytes())
+
+        calls = []
+
+        class Manager:
+            def recognize_batch(self, images, **kwargs):
+                calls.append(len(images))
+                return [{'text': 'x'} for _ in images]
+
+        saved = []
+
+        def process_card(image_data, filename, *args, **kwargs):
+            saved.append((type(image_data), kwargs['ocr_result']))
+            return {'success': True, 'filename': filename}
+
+        monkeypatch.setattr(tasks.settings, 'OCR_BATCH_SIZE', 8)
+        monkeypatch.setattr(tasks.settings, 'OCR_BATCH_MAX_PIXELS', 15000)
+        monkeypatch.setattr(tasks, 'get_ocr_manager_v2', Manager)
+        monkeypatch.setattr(tasks.result_cache, 'lookup', lambda *args: (None, None))
+        monkeypatch.setattr(tasks.result_cache, 'store', lambda *args, **kwargs: None)
+        monkeypatch.setattr(tasks.qr_utils, 'process_image_with_qr', lambda image: {})
+        monkeypatch.setattr(tasks, '_process_card_sync', process_card)
+
+        result = tasks.process_batch_chunk.run(str(path), ['a.jpg', 'b.jpg', 'c.jpg'], 'auto', None, 'v2.0')
+
+        assert result['success'] == 3
+        assert calls == [2, 1]
+        assert saved == [(bytes, {'text': 'x'})] * 3
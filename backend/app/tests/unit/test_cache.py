@@ -0,0 +1,159 @@
+"""
+Unit tests for the cache codec and the in-process (L1) cache tier
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app import cache
+from app.cache import CacheNamespace, LocalCache, iter_key_batches
+from app.core import cache_codec
+from app.integrations.ocr.providers_v2 import BoundingBox, TextBlock
+
+
+class TestCacheCodec:
+    """Tests for core.cache_codec"""
+
+    def test_round_trip_typed_values(self):
+        value = {
+            'blocks': [TextBlock('ACME', BoundingBox(1, 2, 3.5, 4), np.float32(0.5), block_id=0)],
+            'image_size': (640, 480),
+            'tags': {'a'},
+            'raw': b'\x00\x01',
+            'created': datetime(2025, 1, 2, 3, 4, 5),
+            1: 'int key',
+        }
+
+        decoded = cache_codec.loads(cache_codec.dumps(value))
+
+        assert decoded == {**value, 'blocks': [TextBlock('ACME', BoundingBox(1, 2, 3.5, 4), 0.5, 0)]}
+        assert isinstance(decoded['blocks'][0].bbox, BoundingBox)
+
+    def test_large_values_are_compressed(self):
+        value = {'raw_text': 'business card ' * 500}
+        data = cache_codec.dumps(value)
+
+        assert data[1] != cache_codec.CODEC_NONE
+        assert len(data) < len('business card ' * 500)
+        assert cache_codec.loads(data) == value
+
+    def test_unregistered_type_rejected(self):
+        class Opaque:
+            pass
+
+        with pytest.raises(TypeError):
+            cache_codec.dumps({'x': Opaque()})
+
+    def test_other_schema_version_is_undecodable(self):
+        data = bytearray(cache_codec.dumps({'a': 1}))
+        data[0] = cache_codec.SCHEMA_VERSION + 1
+
+        with pytest.raises(cache_codec.CacheDecodeError):
+            cache_codec.loads(bytes(data))
+        with pytest.raises(cache_codec.CacheDecodeError):
+            cache_codec.loads(b'\x80\x04pickle')
+
+
+class TestLocalCache:
+    """Tests for the L1 LRU"""
+
+    def test_lru_eviction_by_bytes(self):
+        cache = LocalCache(max_bytes=10, ttl=60)
+        cache.set('a', b'xxxx', 60)
+        cache.set('b', b'yyyy', 60)
+        assert cache.get('a') == b'xxxx'  # 'a' becomes most recent
+
+        cache.set('c', b'zzzz', 60)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == b'xxxx'
+        assert cache.stats()['bytes'] == 8
+
+    def test_expiry(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('app.cache.time.monotonic', lambda: now[0])
+        cache = LocalCache(max_bytes=100, ttl=30)
+        cache.set('k', b'v', ttl=3600)  # L1 keeps at most its own TTL
+
+        now[0] += 29
+        assert cache.get('k') == b'v'
+        now[0] += 2
+        assert cache.get('k') is None
+
+    def test_clear_pattern(self):
+        cache = LocalCache(max_bytes=100, ttl=60)
+        cache.set('setting:a', b'1', 60)
+        cache.set('ocr:b', b'2', 60)
+
+        assert cache.clear('setting:*') == 1
+        assert cache.get('ocr:b') == b'2'
+
+
+class FakeScanClient:
+    """Minimal client exposing scan_iter (what iter_key_batches relies on)"""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def scan_iter(self, match, count):
+        return (k for k in self.keys if k.startswith(match.rstrip('*')))
+
+
+class TestInvalidation:
+    """Tests for SCAN batching and generation namespaces"""
+
+    def test_iter_key_batches(self):
+        client = FakeScanClient([f"celery-task-meta-{i}" for i in range(5)] + ["other"])
+
+        batches = list(iter_key_batches('celery-task-meta-*', batch_size=2, client=client))
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_namespace_invalidate_changes_keys(self, monkeypatch):
+        monkeypatch.setattr(cache, 'redis_client', None)
+        monkeypatch.setattr(cache, 'local_cache', LocalCache(max_bytes=1024, ttl=60))
+        settings_ns = CacheNamespace('settings')
+
+        settings_ns.set('ocr_version', 'v2.0')
+        assert settings_ns.get('ocr_version') == 'v2.0'
+        old_key = settings_ns.key('ocr_version')
+
+        settings_ns.invalidate()
+
+        assert settings_ns.key('ocr_version') != old_key
+        assert settings_ns.get('ocr_version') is None
+        assert cache.local_cache.stats()['items'] == 0
+
+    def test_namespace_get_many(self, monkeypatch):
+        monkeypatch.setattr(cache, 'redis_client', None)
+        monkeypatch.setattr(cache, 'local_cache', LocalCache(max_bytes=1024, ttl=60))
+        ns = CacheNamespace('users')
+
+        ns.set_many({'1': {'id': 1}, '2': {'id': 2}})
+
+        assert ns.get_many(['1', '2', '3']) == {'1': {'id': 1}, '2': {'id': 2}}
+
+    def test_namespace_l1_ttl_bounds_staleness(self, monkeypatch):
+        class KeyValueRedis:
+            def __init__(self):
+                self.data = {}
+
+            def get(self, key):
+                return self.data.get(key)
+
+            def setex(self, key, ttl, value):
+                self.data[key] = value
+
+        redis = KeyValueRedis()
+        monkeypatch.setattr(cache, 'redis_client', redis)
+        monkeypatch.setattr(cache, 'local_cache', LocalCache(max_bytes=1024, ttl=60))
+        shared, principals = CacheNamespace('shared'), CacheNamespace('principals', l1_ttl=0)
+        shared.set('alice', {'is_active': True})
+        principals.set('alice', {'is_active': True})
+
+        # Another process drops the entries from Redis
+        redis.data.clear()
+
+        assert shared.get('alice') == {'is_active': True}  # still in this process's L1
+        assert principals.get('alice') is None
@@ -0,0 +1,116 @@
+"""
+Unit tests for the decode-once card image pipeline
+"""
+import cv2
+import numpy as np
+import pytest
+
+from app.core.card_image import CardImage
+from app.integrations.ocr import image_processing
+
+
+def _encode(pixels: np.ndarray) -> bytes:
+    success, encoded = cv2.imencode('.png', pixels)
+    assert success
+    return encoded.tobytes()
+
+
+@pytest.fixture
+def card_on_background():
+    """White card (aspect ~1.75) on a dark background"""
+    img = np.full((600, 800, 3), 30, dtype=np.uint8)
+    cv2.rectangle(img, (100, 150), (450, 350), (255, 255, 255), thickness=-1)
+    return img
+
+
+class TestCardImage:
+    """Tests for CardImage"""
+
+    def test_from_bytes_keeps_source_bytes(self, card_on_background):
+        data = _encode(card_on_background)
+        image = CardImage.from_bytes(data)
+
+        assert image.size == (800, 600)
+        # Unmodified image is never re-encoded
+        assert image.encode() is data
+
+    def test_from_bytes_invalid(self):
+        with pytest.raises(ValueError):
+            CardImage.from_bytes(b"not an image")
+
+    def test_from_file_reads_source_on_encode(self, card_on_background, tmp_path):
+        data = _encode(card_on_background)
+        path = tmp_path / 'card.png'
+        path.write_bytes(data)
+        image = CardImage.from_file(str(path))
+
+        assert image.size == (800, 600)
+        assert image.content_hash() == CardImage.from_bytes(data).content_hash()
+        assert image.encode() == data
+
+    def test_from_file_invalid(self, tmp_path):
+        for content in (b"", b"not an image"):
+            path = tmp_path / 'bad.jpg'
+            path.write_bytes(content)
+            with pytest.raises(ValueError):
+                CardImage.from_file(str(path))
+
+    def test_crop_encodes_once(self, card_on_background):
+        image = CardImage(card_on_background)
+        crop = image.crop(10, 20, 100, 50)
+
+        assert crop.size == (100, 50)
+        first = crop.encode()
+        assert crop.encode() is first
+        assert CardImage.from_bytes(first).size == (100, 50)
+
+    def test_downscale(self, card_on_background):
+        image = CardImage(card_on_background)
+
+        assert image.downscale(1000) is image
+        small = image.downscale(400)
+        assert max(small.size) == 400
+        assert small.size == (400, 300)
+
+    def test_thumbnail_and_views(self, card_on_background):
+        image = CardImage(card_on_background)
+
+        thumb = image.thumbnail((200, 200))
+        assert thumb.size == (200, 150)
+        assert image.gray().shape == (600, 800)
+        assert image.gray() is image.gray()
+        assert image.to_pil().size == (800, 600)
+
+
+class TestProcessCardImage:
+    """Tests for image_processing.process_card_image"""
+
+    def test_single_card_is_cropped(self, card_on_background):
+        image = CardImage(card_on_background)
+        cards = image_processing.process_card_image(image)
+
+        assert len(cards) == 1
+        assert isinstance(cards[0], CardImage)
+        assert cards[0].width < image.width
+        assert cards[0].height < image.height
+
+    def test_no_processing(self, card_on_background):
+        image = CardImage(card_on_background)
+        cards = image_processing.process_card_image(image, auto_crop=False, detect_multi=False)
+
+        assert cards == [image]
+
+
+class TestContentHash:
+    """Tests for CardImage.content_hash"""
+
+    def test_same_pixels_same_hash(self, card_on_background):
+        a = CardImage(card_on_background).crop(10, 20, 100, 50)
+        b = CardImage(card_on_background.copy()).crop(10, 20, 100, 50)
+
+        assert a.content_hash() == b.content_hash()
+
+    def test_different_pixels_different_hash(self, card_on_background):
+        image = CardImage(card_on_background)
+
+        assert image.crop(0, 0, 100, 50).content_hash() != image.crop(0, 0, 50, 100).content_hash()
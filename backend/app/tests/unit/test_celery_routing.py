@@ -0,0 +1,54 @@
+"""
+Unit tests for Celery queue routing, priorities and the beat schedule
+"""
+from celery.beat import ScheduleEntry
+
+from app.celery_app import (
+    PRIORITY_HIGH, PRIORITY_LOW, QUEUE_BULK, QUEUE_INTERACTIVE, QUEUE_MAINTENANCE, QUEUE_TRAINING,
+    _stamp_sent_at, celery_app,
+)
+
+
+def route(task_name):
+    options = celery_app.amqp.router.route({}, task_name)
+    return options['queue'].name, options.get('priority')
+
+
+class TestCeleryRouting:
+    """Tests for task_routes"""
+
+    def test_single_cards_are_interactive_and_first(self):
+        assert route('app.tasks.process_single_card') == (QUEUE_INTERACTIVE, PRIORITY_HIGH)
+
+    def test_background_work_is_isolated(self):
+        assert route('app.tasks.process_batch_upload')[0] == QUEUE_BULK
+        assert route('app.tasks.import_contacts_file')[0] == QUEUE_BULK
+        assert route('app.tasks.train_ocr_models') == (QUEUE_TRAINING, PRIORITY_LOW)
+        assert route('app.tasks.sync_feedback_to_label_studio')[0] == QUEUE_TRAINING
+        assert route('app.tasks.cleanup_old_results')[0] == QUEUE_MAINTENANCE
+
+    def test_unrouted_tasks_never_reach_interactive(self):
+        assert route('app.tasks.something_new')[0] == QUEUE_BULK
+
+    def test_route_priority_not_overridden_by_default(self):
+        # A task_default_priority would be applied before routing and win
+        assert celery_app.conf.task_default_priority is None
+
+    def test_publish_time_stamped(self):
+        headers = {}
+        _stamp_sent_at(headers=headers)
+        assert headers['sent_at'] > 0
+
+
+class TestBeatSchedule:
+    """Tests for beat_schedule"""
+
+    def test_every_entry_loads(self):
+        for name, options in celery_app.conf.beat_schedule.items():
+            entry = ScheduleEntry(name=name, app=celery_app, **options)
+            assert entry.is_due()[1] > 0
+
+    def test_blob_cleanup_is_scheduled_on_maintenance(self):
+        tasks = {options['task'] for options in celery_app.conf.beat_schedule.values()}
+        assert 'app.tasks.cleanup_old_results' in tasks
+        assert route('app.tasks.cleanup_old_results')[0] == QUEUE_MAINTENANCE
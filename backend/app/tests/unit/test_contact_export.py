@@ -0,0 +1,90 @@
+"""
+Unit tests for the streamed CSV/XLSX contact export
+"""
+import csv
+import io
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Contact
+
+try:
+    from app.api import exports
+    EXPORTS_AVAILABLE = True
+except ImportError:  # app.api needs the OCR system libraries (zbar)
+    EXPORTS_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not EXPORTS_AVAILABLE, reason="OCR system libraries not installed")
+
+CONTACTS = 25
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Contact(full_name=f'Contact {i}', company='ACME' if i % 2 else None, email=f'c{i}@example.com')
+        for i in range(1, CONTACTS + 1)
+    ])
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+
+def read_csv(chunks):
+    return list(csv.reader(io.StringIO(''.join(chunks))))
+
+
+class TestCSVExport:
+    """Tests for _iter_export_rows + _iter_csv"""
+
+    def test_header_and_rows(self, engine):
+        rows = read_csv(exports._iter_csv(exports._iter_export_rows(engine)))
+
+        assert rows[0] == exports.EXPORT_FIELDS
+        assert len(rows) == CONTACTS + 1
+        first = dict(zip(rows[0], rows[1]))
+        assert first['full_name'] == 'Contact 1'
+        assert first['company'] == 'ACME'
+        assert first['email'] == 'c1@example.com'
+        # NULL columns become empty cells, not 'None'
+        assert dict(zip(rows[0], rows[2]))['company'] == ''
+
+    def test_ids_filter(self, engine):
+        ids = exports._parse_ids('3, 1,x,7')
+        rows = read_csv(exports._iter_csv(exports._iter_export_rows(engine, ids)))
+
+        assert ids == [3, 1, 7]
+        assert [row[0] for row in rows[1:]] == ['1', '3', '7']
+
+    def test_more_rows_than_one_batch(self, engine, monkeypatch):
+        monkeypatch.setattr(exports, 'EXPORT_BATCH_SIZE', 4)
+        monkeypatch.setattr(exports, 'STREAM_CHUNK_SIZE', 100)
+
+        chunks = list(exports._iter_csv(exports._iter_export_rows(engine)))
+        rows = read_csv(chunks)
+
+        assert len(chunks) > 2
+        assert [int(row[0]) for row in rows[1:]] == list(range(1, CONTACTS + 1))
+
+
+class TestXLSXExport:
+    """Tests for _iter_xlsx"""
+
+    def test_workbook_reopens(self, engine):
+        from openpyxl import load_workbook
+
+        data = b''.join(exports._iter_xlsx(exports._iter_export_rows(engine), chunk_size=1024))
+        sheet = load_workbook(io.BytesIO(data), read_only=True).worksheets[0]
+        rows = list(sheet.iter_rows(values_only=True))
+
+        assert list(rows[0]) == exports.EXPORT_FIELDS
+        assert len(rows) == CONTACTS + 1
+        assert rows[1][2] == 'Contact 1'
+        assert rows[CONTACTS][5] == f'c{CONTACTS}@example.com'
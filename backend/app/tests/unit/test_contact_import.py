@@ -0,0 +1,136 @@
+"""
+Unit tests for the bulk contact importer (SQLite executemany path)
+"""
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import AuditLog, Contact, User
+from app.repositories import contact_events
+
+try:
+    from app.services.import_service import ContactImporter
+    IMPORTER_AVAILABLE = True
+except ImportError:  # app.services needs the OCR system libraries (zbar)
+    IMPORTER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not IMPORTER_AVAILABLE, reason="OCR system libraries not installed")
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        User(username='admin', email='admin@example.com', hashed_password='x'),
+        Contact(full_name='Existing', email='Taken@Acme.com', phone='+7 (999) 000-00-00', uid='u-existing'),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'legacy.csv'
+    pd.DataFrame([
+        {'Full_Name': 'Ivan', 'Email': 'ivan@acme.com', 'Phone': '89991234567', 'Extra': 'x'},
+        {'Full_Name': 'Dup by email', 'Email': 'taken@acme.com', 'Phone': '', 'Extra': ''},
+        {'Full_Name': 'Existing Person', 'Email': '', 'Phone': '8 999 000 00 00', 'Extra': ''},
+        {'Full_Name': '', 'Email': '', 'Phone': '', 'Extra': 'only unknown column'},
+        {'Full_Name': 'Anna', 'Email': 'anna@globex.com', 'Phone': '+1 234 567 8901', 'Extra': ''},
+        {'Full_Name': 'Ivan again', 'Email': 'IVAN@acme.com', 'Phone': '', 'Extra': ''},
+        {'Full_Name': 'No keys', 'Email': '', 'Phone': '', 'Extra': ''},
+        {'Full_Name': 'Reception', 'Email': '', 'Phone': '8 999 000 00 00', 'Extra': 'shared phone'},
+    ]).to_csv(path, index=False)
+    return str(path)
+
+
+class TestContactImporter:
+    """Tests for ContactImporter"""
+
+    def test_import_formats_dedupes_and_audits(self, db, csv_file, monkeypatch):
+        received = []
+        monkeypatch.setattr(contact_events, '_listeners', [received.append])
+        progress = []
+        user = db.query(User).one()
+
+        summary = ContactImporter(db, user=user, filename='legacy.csv', chunk_size=2).run(
+            csv_file, progress=lambda rows, fraction: progress.append((rows, fraction))
+        )
+
+        assert summary == {
+            'total_rows': 8, 'imported': 4, 'skipped_duplicates': 3, 'skipped_empty': 1,
+            'skipped': [
+                {'row': 3, 'reason': 'email', 'value': 'taken@acme.com'},
+                {'row': 4, 'reason': 'phone', 'value': '+7 (999) 000-00-00'},
+                {'row': 7, 'reason': 'email', 'value': 'IVAN@acme.com'},
+            ],
+        }
+        imported = {c.full_name: c for c in db.query(Contact).filter(Contact.uid != 'u-existing')}
+        assert set(imported) == {'Ivan', 'Anna', 'No keys', 'Reception'}
+        assert imported['Ivan'].phone == '+7 (999) 123-45-67'
+        assert imported['Anna'].phone == '+1 (234) 567-8901'
+        assert imported['Ivan'].uid and imported['Ivan'].status == 'active'
+
+        audits = db.query(AuditLog).all()
+        assert sorted(a.contact_id for a in audits) == sorted(c.id for c in imported.values())
+        assert {a.username for a in audits} == {'admin'}
+        assert json.loads(audits[0].changes) == {'source': 'import', 'file': 'legacy.csv'}
+
+        assert sum(change['inserted'] for change in received) == 4
+        assert progress[-1] == (8, 1.0)
+
+    def test_shared_phone_needs_a_common_name_word(self, db, tmp_path):
+        path = tmp_path / 'office.csv'
+        pd.DataFrame([
+            {'full_name': 'Petr Sidorov', 'phone': '+7 495 111 22 33'},
+            {'full_name': 'Olga Smirnova', 'phone': '+7 495 111 22 33'},
+            {'full_name': 'P. Sidorov', 'phone': '+7 495 111 22 33'},
+        ]).to_csv(path, index=False)
+
+        summary = ContactImporter(db).run(str(path))
+
+        assert summary['imported'] == 2
+        assert summary['skipped'] == [{'row': 4, 'reason': 'phone', 'value': '+7 (495) 111-22-33'}]
+
+    def test_phone_duplicates_across_phone_columns(self, db, tmp_path):
+        db.add(Contact(full_name='Maria Kuznetsova', phone_work='+7 (812) 555-44-33'))
+        db.commit()
+        path = tmp_path / 'mobiles.csv'
+        pd.DataFrame([
+            {'full_name': 'Kuznetsova M.', 'phone': '', 'phone_mobile': '8 812 555 44 33'},
+            {'full_name': 'Oleg Orlov', 'phone': '', 'phone_mobile': '+7 921 000 11 22'},
+            {'full_name': 'O. Orlov', 'phone': '+7 921 000 11 22', 'phone_mobile': ''},
+        ]).to_csv(path, index=False)
+
+        summary = ContactImporter(db).run(str(path))
+
+        assert summary['imported'] == 1
+        assert summary['skipped'] == [
+            {'row': 2, 'reason': 'phone', 'value': '+7 (812) 555-44-33'},
+            {'row': 4, 'reason': 'phone', 'value': '+7 (921) 000-11-22'},
+        ]
+
+    def test_xlsx_import(self, db, tmp_path):
+        path = tmp_path / 'legacy.xlsx'
+        pd.DataFrame([{'full_name': 'Boris', 'phone': 9161234567}]).to_excel(path, index=False)
+
+        summary = ContactImporter(db).run(str(path))
+
+        assert summary['imported'] == 1
+        assert db.query(Contact).filter(Contact.full_name == 'Boris').one().phone == '+7 (916) 123-45-67'
+
+    def test_unsupported_format(self, db, tmp_path):
+        path = tmp_path / 'contacts.json'
+        path.write_text('[]')
+
+        with pytest.raises(ValueError):
+            ContactImporter(db).run(str(path))
+
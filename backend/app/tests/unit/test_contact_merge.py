@@ -0,0 +1,110 @@
+"""
+Unit tests for set-based contact merging
+"""
+import json
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import AuditLog, Contact, Group, OCRCorrection, Tag, User
+from app.repositories import contact_events
+from app.repositories.contact_merge import ContactMerger, InvalidMergeError, MergeContactsNotFoundError
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'merge.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    vip, lead = Tag(name='vip'), Tag(name='lead')
+    partners = Group(name='partners')
+    session.add_all([
+        User(username='admin', email='admin@example.com', hashed_password='x'),
+        Contact(id=1, full_name='Ivan Petrov', email='', tags=[vip]),
+        Contact(id=2, full_name='I. Petrov', email='ivan@acme.com', company='Acme', tags=[vip, lead],
+                groups=[partners], qr_data='BEGIN:VCARD', has_qr_code=1),
+        Contact(id=3, company='Other', phone='+7 (999) 123-45-67', photo_path='p.jpg', thumbnail_path='t.jpg'),
+        Contact(id=4, full_name='Anna', company='Globex'),
+        Contact(id=5, full_name='Anna S.', position='CTO', groups=[partners]),
+        Contact(id=6, full_name='Untouched'),
+    ])
+    session.flush()
+    session.add_all([
+        AuditLog(contact_id=2, action='created', entity_type='contact'),
+        OCRCorrection(contact_id=3, original_text='x', original_box='{}', corrected_text='y', corrected_field='full_name'),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestContactMerger:
+    """Tests for ContactMerger"""
+
+    def test_merge_groups(self, db):
+        changes = []
+        contact_events._listeners.append(changes.append)
+        user = db.query(User).one()
+        try:
+            merged = ContactMerger(db, user=user).merge_groups([(1, [3, 2]), (4, [5])])
+        finally:
+            contact_events._listeners.remove(changes.append)
+
+        assert merged == 3
+        assert sorted(c.id for c in db.query(Contact)) == [1, 4, 6]
+
+        db.expire_all()
+        ivan = db.get(Contact, 1)
+        # Empty fields filled from the lowest slave id that has them
+        assert (ivan.full_name, ivan.email, ivan.company, ivan.phone) == (
+            'Ivan Petrov', 'ivan@acme.com', 'Acme', '+7 (999) 123-45-67'
+        )
+        assert (ivan.qr_data, ivan.has_qr_code) == ('BEGIN:VCARD', 1)
+        assert (ivan.photo_path, ivan.thumbnail_path) == ('p.jpg', 't.jpg')
+        assert sorted(t.name for t in ivan.tags) == ['lead', 'vip']
+        assert [g.name for g in ivan.groups] == ['partners']
+
+        anna = db.get(Contact, 4)
+        assert (anna.company, anna.position) == ('Globex', 'CTO')
+        assert [g.name for g in anna.groups] == ['partners']
+
+        # History and corrections follow the master
+        assert {a.action for a in db.query(AuditLog).filter(AuditLog.contact_id == 1)} == {'created', 'merge_contacts'}
+        assert db.query(OCRCorrection).one().contact_id == 1
+        merge_log = db.query(AuditLog).filter(AuditLog.contact_id == 4).one()
+        assert merge_log.username == 'admin'
+        assert json.loads(merge_log.changes) == {'merged_contacts': [5], 'master_id': 4}
+
+        assert changes[0]['deleted'] == 3
+
+    def test_batches_use_constant_statement_count(self, db):
+        statements = []
+        listen = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), 'before_cursor_execute', listen)
+        try:
+            ContactMerger(db).merge_groups([(1, [2, 3]), (4, [5])], batch_size=10)
+        finally:
+            event.remove(db.get_bind(), 'before_cursor_execute', listen)
+
+        # id check, select, update, 2 link copies, 2 repoints, 4 deletes, audit insert
+        assert len([s for s in statements if not s.startswith(('BEGIN', 'COMMIT'))]) == 12
+
+    def test_invalid_groups(self, db):
+        with pytest.raises(InvalidMergeError):
+            ContactMerger(db).merge(1, [1, 2])
+        with pytest.raises(InvalidMergeError):
+            ContactMerger(db).merge_groups([(1, [2]), (3, [2])])
+        with pytest.raises(MergeContactsNotFoundError):
+            ContactMerger(db).merge(1, [99])
+        assert db.query(Contact).count() == 6
+
+    def test_missing_contact_in_later_batch_merges_nothing(self, db):
+        with pytest.raises(MergeContactsNotFoundError):
+            ContactMerger(db).merge_groups([(1, [2]), (4, [99])], batch_size=1)
+
+        assert db.query(Contact).count() == 6
+        assert db.query(AuditLog).filter(AuditLog.action == 'merge_contacts').count() == 0
@@ -0,0 +1,111 @@
+"""
+Unit tests for keyset (cursor) pagination of the contacts list
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Contact
+from app.repositories.pagination import (
+    InvalidCursorError, after_keyset, decode_cursor, encode_cursor, estimate_count, order_keyset
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pagination.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    # Duplicate and NULL companies exercise the (value, id) tie-breaker and NULLS LAST
+    companies = ['Acme', 'Globex', None, 'Acme', 'Initech', None, 'Globex', 'Acme', 'Umbrella', None, 'Hooli']
+    session.add_all([Contact(full_name=f'Contact {i}', company=c) for i, c in enumerate(companies)])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def page(db, sort_by, sort_order, limit, cursor=None):
+    """One keyset page the way ContactService builds it: (rows, next_cursor)"""
+    column, descending = getattr(Contact, sort_by), sort_order == 'desc'
+    query = db.query(Contact)
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        query = after_keyset(query, column, Contact.id, descending, value, last_id)
+    rows = order_keyset(query, column, Contact.id, descending).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(items[-1], sort_by), items[-1].id)
+    return items, next_cursor
+
+
+def walk(db, sort_by, sort_order, limit):
+    """Follow next_cursor to the end, returning ids in page order"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        items, cursor = page(db, sort_by, sort_order, limit, cursor)
+        ids.extend(c.id for c in items)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+class TestKeysetPagination:
+    """Tests for order_keyset/after_keyset"""
+
+    @pytest.mark.parametrize('sort_by', ['id', 'company', 'full_name'])
+    @pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+    def test_walk_visits_every_row_once_in_order(self, db, sort_by, sort_order):
+        full, _ = page(db, sort_by, sort_order, 100)
+
+        ids, pages = walk(db, sort_by, sort_order, 3)
+
+        assert ids == [c.id for c in full]
+        assert len(set(ids)) == 11
+        assert pages == 4
+
+    def test_nulls_sort_last_in_both_directions(self, db):
+        for order in ('asc', 'desc'):
+            ids, _ = walk(db, 'company', order, 4)
+            companies = [db.get(Contact, i).company for i in ids]
+            assert companies[-3:] == [None, None, None]
+            assert None not in companies[:-3]
+
+    def test_rows_inserted_meanwhile_do_not_shift_pages(self, db):
+        first, cursor = page(db, 'id', 'desc', 5)
+        db.add(Contact(full_name='Newest'))
+        db.commit()
+
+        second, _ = page(db, 'id', 'desc', 5, cursor)
+
+        assert second[0].id == first[-1].id - 1
+
+    def test_no_planner_estimate_on_sqlite(self, db):
+        assert estimate_count(db.query(Contact)) is None
+
+
+class TestCursorCodec:
+    """Tests for encode_cursor/decode_cursor"""
+
+    def test_round_trip(self):
+        cursor = encode_cursor('company', 'asc', 'Acme', 42)
+
+        assert decode_cursor(cursor, 'company', 'asc') == ('Acme', 42)
+        assert '=' not in cursor
+
+    def test_datetime_value_round_trip(self):
+        stamp = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor('created_at', 'desc', stamp, 7), 'created_at', 'desc') == (stamp, 7)
+
+    def test_other_sort_and_garbage_rejected(self):
+        cursor = encode_cursor('company', 'asc', 'Acme', 42)
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, 'company', 'desc')
+        with pytest.raises(InvalidCursorError):
+            decode_cursor('not-a-cursor', 'company', 'asc')
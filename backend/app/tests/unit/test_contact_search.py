@@ -0,0 +1,59 @@
+"""
+Unit tests for index-backed contact search (SQLite FTS5 backend)
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Contact
+from app.repositories.contact_search import ContactSearch, ensure_search_index
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    # Rows created before the index exist must be indexed too
+    session.add(Contact(full_name='Ivan Petrov', company='Acme Corp', email='ivan@acme.com'))
+    session.commit()
+    assert ensure_search_index(engine) == 'fts5'
+    session.add_all([
+        Contact(full_name='Anna Smirnova', company='Globex', position='CTO'),
+        Contact(full_name='John Acmeson', company='Initech', address='Acme street 1'),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestContactSearch:
+    """Tests for ContactSearch"""
+
+    def test_substring_match_across_fields(self, db):
+        results = ContactSearch(db).search('acme')
+
+        assert {c.full_name for c in results} == {'Ivan Petrov', 'John Acmeson'}
+
+    def test_case_insensitive_and_updates_indexed(self, db):
+        anna = db.query(Contact).filter(Contact.full_name == 'Anna Smirnova').one()
+        anna.company = 'Umbrella'
+        db.commit()
+
+        assert [c.full_name for c in ContactSearch(db).search('UMBREL')] == ['Anna Smirnova']
+        assert ContactSearch(db).search('globex') == []
+
+    def test_short_query_falls_back_to_like(self, db):
+        results = ContactSearch(db).search('CT')
+
+        assert [c.full_name for c in results] == ['Anna Smirnova']
+
+    def test_filter_keeps_other_conditions(self, db):
+        query = db.query(Contact).filter(Contact.company == 'Initech')
+
+        assert ContactSearch(db).filter(query, 'acme').count() == 1
+
+    def test_special_characters_are_literal(self, db):
+        assert ContactSearch(db).search('"acme" OR x') == []
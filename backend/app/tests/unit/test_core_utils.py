@@ -3,10 +3,24 @@ Unit tests for core utility functions
 """
 import pytest
 from unittest.mock import Mock, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from app.core.utils import create_audit_log, get_setting, set_setting
+from app.database import Base
+from app.models import AppSetting
 import json
 
 
+@pytest.fixture
+def settings_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'settings.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
 class TestAuditLog:
     """Tests for audit log creation"""
     
@@ -82,35 +96,26 @@ class TestAuditLog:
 class TestSettings:
     """Tests for app settings"""
     
-    def test_get_setting_exists(self):
+    def test_get_setting_exists(self, settings_db):
         """Test getting existing setting"""
-        # Mock database
-        mock_db = Mock()
-        mock_setting = Mock()
-        mock_setting.value = "test_value"
-        mock_db.query().filter().first.return_value = mock_setting
+        settings_db.add(AppSetting(key="test_key", value="test_value"))
+        settings_db.commit()
         
         # Get setting
-        result = get_setting(mock_db, "test_key")
+        result = get_setting(settings_db, "test_key")
         
         # Verify
         assert result == "test_value"
     
-    def test_get_setting_not_exists(self):
+    def test_get_setting_not_exists(self, settings_db):
         """Test getting non-existent setting"""
-        mock_db = Mock()
-        mock_db.query().filter().first.return_value = None
-        
-        result = get_setting(mock_db, "nonexistent")
+        result = get_setting(settings_db, "nonexistent")
         
         assert result is None
     
-    def test_get_setting_with_default(self):
+    def test_get_setting_with_default(self, settings_db):
         """Test getting non-existent setting with default"""
-        mock_db = Mock()
-        mock_db.query().filter().first.return_value = None
-        
-        result = get_setting(mock_db, "nonexistent", default="default_value")
+        result = get_setting(settings_db, "nonexistent", default="default_value")
         
         assert result == "default_value"
     
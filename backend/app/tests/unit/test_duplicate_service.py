@@ -0,0 +1,39 @@
+"""
+Unit tests for the duplicate candidate lookup (SQLite)
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Contact
+
+try:
+    from app.services.duplicate_service import DuplicateService
+    SERVICE_AVAILABLE = True
+except ImportError:  # app.services needs the OCR system libraries (zbar)
+    SERVICE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not SERVICE_AVAILABLE, reason="OCR system libraries not installed")
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'duplicates.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_candidates_match_any_phone_column(db):
+    existing = Contact(full_name='Zzz Qqq', phone_work='+7 (495) 111-22-33')
+    unrelated = Contact(full_name='Www Yyy', phone='+7 (495) 999-99-99')
+    new = Contact(full_name='Aaa Bbb', phone_mobile='8 495 111 22 33')
+    db.add_all([existing, unrelated, new])
+    db.commit()
+
+    candidates = DuplicateService(db)._candidate_rows(new)
+
+    assert [row[0] for row in candidates] == [existing.id]
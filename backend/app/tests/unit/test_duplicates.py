@@ -0,0 +1,78 @@
+"""
+Unit tests for duplicate contact matching (blocking keys, MinHash/LSH, scoring)
+"""
+from app.core.duplicates import ContactFingerprint, DuplicateIndex, normalize_tokens, phone_key, similarity
+
+
+def fingerprint(contact_id, **fields):
+    return ContactFingerprint.from_fields(contact_id, fields)
+
+
+class TestNormalization:
+    """Tests for token and phone normalization"""
+
+    def test_transliterates_cyrillic(self):
+        assert normalize_tokens('Иванов Пётр') == ['ivanov', 'petr']
+
+    def test_phone_key_ignores_country_prefix_and_format(self):
+        assert phone_key('+7 (999) 123-45-67') == phone_key('89991234567') == '9991234567'
+        assert phone_key('12-34') is None
+
+    def test_company_legal_form_dropped(self):
+        assert fingerprint(1, company='ООО "Ромашка"').company_key == fingerprint(2, company='Romashka LLC').company_key
+
+
+class TestSimilarity:
+    """Tests for pair scoring"""
+
+    def test_same_person_across_scripts(self):
+        score, matched = similarity(
+            fingerprint(1, full_name='Иван Петров', company='Ромашка', phone='+7 (999) 123-45-67'),
+            fingerprint(2, full_name='Petrov Ivan', company='Romashka', phone_mobile='89991234567'),
+        )
+        assert score == 1.0
+        assert matched == ['name', 'company', 'phone']
+
+    def test_shared_office_phone_is_not_enough(self):
+        score, _ = similarity(
+            fingerprint(1, full_name='Anna Smirnova', company='Acme', phone='+7 495 111 22 33'),
+            fingerprint(2, full_name='Oleg Kuznetsov', company='Acme', phone='+7 495 111 22 33'),
+        )
+        assert score < 0.75
+
+    def test_no_common_fields(self):
+        assert similarity(fingerprint(1, email='a@x.com'), fingerprint(2, full_name='A B')) == (0.0, [])
+
+
+class TestDuplicateIndex:
+    """Tests for candidate generation"""
+
+    def test_sweep_finds_duplicates_only(self):
+        index = DuplicateIndex()
+        index.add_all([
+            fingerprint(1, full_name='Ivan Petrov', company='Acme', email='ivan.petrov@acme.com'),
+            fingerprint(2, full_name='Ivan Petrov', company='Acme Inc', email='IVAN.PETROV@acme.com'),
+            fingerprint(3, full_name='Maria Sidorova', company='Globex', email='maria@globex.com'),
+            fingerprint(4, full_name='Мария Сидорова', company='Globex'),
+            fingerprint(5, full_name='Oleg Kuznetsov', company='Initech'),
+        ])
+
+        pairs = index.find_pairs(threshold=0.75)
+
+        assert [(p.contact_id, p.duplicate_id) for p in pairs] == [(1, 2), (3, 4)]
+        assert pairs[0].matched_fields == ['name', 'company', 'email']
+
+    def test_typo_found_through_lsh(self):
+        index = DuplicateIndex()
+        index.add(fingerprint(1, full_name='Konstantin Voronin', company='Severstal'))
+        index.add(fingerprint(2, full_name='Oleg Kuznetsov', company='Initech'))
+
+        matches = index.find_matches(fingerprint(99, full_name='Konstantin Voronim', company='Severstal'), 0.75)
+
+        assert [m.duplicate_id for m in matches] == [1]
+
+    def test_oversized_blocks_not_expanded(self):
+        index = DuplicateIndex(max_block_size=3)
+        index.add_all(fingerprint(i, phone='+7 495 111 22 33') for i in range(1, 5))
+
+        assert index.candidate_pairs() == set()
@@ -0,0 +1,88 @@
+"""
+Unit tests for LayoutLMv3 batching helpers
+"""
+import threading
+
+import pytest
+
+# Load OCR providers first (same import order as the app: manager -> layoutlm)
+import app.integrations.ocr.providers_v2  # noqa: F401
+from app.integrations.layoutlm.batching import LayoutLMMicroBatcher, bucket_by_length, word_level_predictions
+
+
+class TestBucketByLength:
+    """Tests for padding-aware bucketing"""
+
+    def test_groups_similar_lengths(self):
+        lengths = [500, 20, 480, 30, 25, 510]
+        buckets = bucket_by_length(lengths, batch_size=3)
+
+        assert buckets == [[1, 4, 3], [2, 0, 5]]
+
+    def test_covers_all_items_once(self):
+        lengths = [5, 3, 9, 1, 7]
+        buckets = bucket_by_length(lengths, batch_size=2)
+
+        flat = [i for bucket in buckets for i in bucket]
+        assert sorted(flat) == list(range(len(lengths)))
+        assert all(len(bucket) <= 2 for bucket in buckets)
+
+    def test_empty_and_invalid_batch_size(self):
+        assert bucket_by_length([], batch_size=4) == []
+        assert bucket_by_length([3, 1], batch_size=0) == [[1], [0]]
+
+
+class TestWordLevelPredictions:
+    """Tests for mapping token predictions back to words"""
+
+    def test_first_sub_token_wins(self):
+        word_ids = [None, 0, 0, 1, 2, 2, None]
+        predictions = [9, 1, 2, 3, 5, 6, 9]
+        confidences = [0.0, 0.9, 0.1, 0.8, 0.7, 0.2, 0.0]
+
+        labels, scores = word_level_predictions(word_ids, predictions, 3, confidences=confidences)
+
+        assert labels == [1, 3, 5]
+        assert scores == [0.9, 0.8, 0.7]
+
+    def test_truncated_words_are_outside(self):
+        labels, scores = word_level_predictions([None, 0, None], [0, 4, 0], 3, outside_label=0)
+
+        assert labels == [4, 0, 0]
+        assert scores == [0.0, 0.0, 0.0]
+
+
+class TestLayoutLMMicroBatcher:
+    """Tests for worker-side micro-batching"""
+
+    def test_concurrent_requests_share_a_batch(self):
+        calls = []
+
+        def classify_batch(items):
+            calls.append(len(items))
+            return [{'fields': {}, 'blocks': blocks} for blocks, _ in items]
+
+        batcher = LayoutLMMicroBatcher(classify_batch, max_batch_size=8, max_wait_ms=200)
+        results = {}
+
+        def worker(i):
+            results[i] = batcher.classify([i], None, timeout=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert {i: r['blocks'] for i, r in results.items()} == {i: [i] for i in range(4)}
+        assert sum(calls) == 4
+        assert len(calls) < 4
+
+    def test_errors_propagate_to_callers(self):
+        def classify_batch(items):
+            raise RuntimeError("model failed")
+
+        batcher = LayoutLMMicroBatcher(classify_batch, max_wait_ms=1)
+
+        with pytest.raises(RuntimeError, match="model failed"):
+            batcher.classify([], None, timeout=5)
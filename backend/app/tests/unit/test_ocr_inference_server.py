@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared OCR inference server and its client
+"""
+import multiprocessing
+from multiprocessing.connection import Listener
+
+import numpy as np
+import pytest
+
+from app.core.card_image import CardImage
+from app.integrations.ocr.inference_client import RemoteOCRManager
+from app.integrations.ocr.inference_server import OCRInferenceServer, parse_address, require_authkey
+
+
+class FakeManager:
+    """Stands in for OCRManagerV2 (no models needed)"""
+
+    def recognize(self, image_data, provider_name=None, use_layout=False, filename=None):
+        return {
+            'raw_text': f"{filename}:{image_data.width}x{image_data.height}",
+            'image_data': image_data,
+        }
+
+    def recognize_batch(self, images, provider_name=None, use_layout=False, filenames=None, batch_size=None):
+        results = [self.recognize(image, filename=name) for image, name in zip(images, filenames)]
+        results[-1] = ValueError("bad card")
+        return results
+
+    def get_available_providers(self):
+        return ['PaddleOCR']
+
+    def get_provider_info(self):
+        return [{'name': 'PaddleOCR', 'priority': 0}]
+
+
+@pytest.fixture
+def server(tmp_path):
+    """One forked worker serving FakeManager on a unix socket"""
+    server = OCRInferenceServer(address=str(tmp_path / 'ocr.sock'), workers=1, authkey='test-key')
+    server.manager = FakeManager()
+    server._listener = Listener(server.address, authkey=server.authkey)
+    server._processes = [server._spawn(multiprocessing.get_context('fork'), 0)]
+    yield server
+    server.shutdown()
+
+
+class TestParseAddress:
+    """Tests for OCR_INFERENCE_ADDRESS parsing"""
+
+    def test_tcp(self):
+        assert parse_address('ocr-inference:9010') == ('ocr-inference', 9010)
+
+    def test_unix_socket(self):
+        assert parse_address('/tmp/ocr.sock') == '/tmp/ocr.sock'
+
+
+class TestAccessControl:
+    """Tests for the authkey and listen address checks"""
+
+    @pytest.mark.parametrize('authkey', ['', None, 'change-me-ocr-inference', 'your-secret-key-change-in-production'])
+    def test_missing_or_default_authkey_rejected(self, authkey):
+        with pytest.raises(ValueError):
+            require_authkey(authkey)
+
+    def test_client_refuses_default_authkey(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('app.core.config.settings.OCR_INFERENCE_AUTHKEY', '')
+        with pytest.raises(ValueError):
+            RemoteOCRManager(address=str(tmp_path / 'ocr.sock'))
+        with pytest.raises(ValueError):
+            RemoteOCRManager(address=str(tmp_path / 'ocr.sock'), authkey='change-me-ocr-inference')
+
+    @pytest.mark.parametrize('address', ['0.0.0.0:9010', ':9010', '[::]:9010'])
+    def test_server_refuses_wildcard_address(self, address):
+        with pytest.raises(ValueError):
+            OCRInferenceServer(address=address, workers=1, authkey='test-key')
+
+    def test_server_accepts_unix_socket_and_internal_host(self, tmp_path):
+        socket_path = str(tmp_path / 'ocr.sock')
+
+        assert OCRInferenceServer(address=socket_path, authkey='test-key').address == socket_path
+        assert OCRInferenceServer(address='ocr-inference:9010', authkey='test-key').address == ('ocr-inference', 9010)
+
+
+class TestRemoteOCRManager:
+    """Round trips through a forked server worker"""
+
+    def test_recognize_reattaches_image(self, server):
+        client = RemoteOCRManager(address=server.address, authkey='test-key', timeout=30)
+        image = CardImage(np.zeros((40, 60, 3), dtype=np.uint8))
+
+        result = client.recognize(image, filename='card.jpg')
+
+        assert result['raw_text'] == 'card.jpg:60x40'
+        assert result['image_data'] is image
+
+    def test_recognize_batch_keeps_per_card_errors(self, server):
+        client = RemoteOCRManager(address=server.address, authkey='test-key', timeout=30)
+        images = [CardImage(np.zeros((10, 20 + i, 3), dtype=np.uint8)) for i in range(3)]
+
+        results = client.recognize_batch(images, filenames=['a', 'b', 'c'])
+
+        assert [r['raw_text'] for r in results[:2]] == ['a:20x10', 'b:21x10']
+        assert results[0]['image_data'] is images[0]
+        assert isinstance(results[2], RuntimeError)
+        assert 'bad card' in str(results[2])
+
+    def test_provider_info(self, server):
+        client = RemoteOCRManager(address=server.address, authkey='test-key', timeout=30)
+
+        assert client.get_available_providers() == ['PaddleOCR']
+        assert client.get_provider_info()[0]['name'] == 'PaddleOCR'
+
+    def test_server_unavailable(self, tmp_path):
+        client = RemoteOCRManager(address=str(tmp_path / 'missing.sock'), authkey='test-key')
+
+        with pytest.raises(RuntimeError):
+            client.recognize(b'data')
+        assert client.get_available_providers() == []
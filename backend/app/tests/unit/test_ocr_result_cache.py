@@ -0,0 +1,58 @@
+"""
+Unit tests for the content-addressed OCR result cache
+"""
+import numpy as np
+import pytest
+
+from app.integrations.ocr import result_cache
+from app.core.card_image import CardImage
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Route the result cache to a dict instead of Redis"""
+    store = {}
+    monkeypatch.setattr(result_cache, 'get_from_cache', store.get)
+    monkeypatch.setattr(result_cache, 'set_to_cache', lambda key, value, ttl: store.__setitem__(key, value) or True)
+    monkeypatch.setattr(result_cache, '_pipeline_version', lambda ocr_version: 'model-a')
+    return store
+
+
+@pytest.fixture
+def image():
+    return CardImage(np.full((30, 50, 3), 200, dtype=np.uint8))
+
+
+class TestResultCacheKey:
+    """Tests for result_cache_key"""
+
+    def test_key_changes_with_version_and_model(self, image):
+        key = result_cache.result_cache_key(image, None, 'v2.0', 'model-a')
+
+        assert key != result_cache.result_cache_key(image, None, 'v1.0', 'model-a')
+        assert key != result_cache.result_cache_key(image, None, 'v2.0', 'model-b')
+        assert key != result_cache.result_cache_key(image, 'PaddleOCR', 'v2.0', 'model-a')
+        assert key.endswith(image.content_hash())
+
+
+class TestLookupAndStore:
+    """Round trips through lookup/store"""
+
+    def test_miss_then_hit(self, memory_cache, image):
+        key, entry = result_cache.lookup(image, None, 'v2.0')
+        assert entry is None
+
+        assert result_cache.store(key, ocr_result={'data': {'email': 'a@b.c'}, 'image_data': image})
+
+        same = CardImage(image.pixels.copy())
+        _, entry = result_cache.lookup(same, None, 'v2.0')
+        assert entry['ocr_result'] == {'data': {'email': 'a@b.c'}}
+        assert entry['qr_data'] is None
+
+    def test_failures_are_not_cached(self, memory_cache, image):
+        key, _ = result_cache.lookup(image, None, 'v2.0')
+
+        assert not result_cache.store(key, ocr_result=RuntimeError("boom"))
+        assert not result_cache.store(key, qr_data={'email': None})
+        assert not result_cache.store(None, ocr_result={'data': {}})
+        assert memory_cache == {}
@@ -1,8 +1,9 @@
 """
 Unit tests for phone number formatting utilities
 """
+import pandas as pd
 import pytest
-from ...core.phone import format_phone_number
+from ...core.phone import format_phone_number, format_phone_series
 
 
 class TestPhoneFormatting:
@@ -93,3 +94,13 @@ class TestPhoneFormatting:
         valid = "+7 (900) 123-45-67"
         assert format_phone_number(valid) == valid
 
+
+class TestPhoneSeriesFormatting:
+    """Test the vectorized (pandas) phone formatter"""
+
+    def test_matches_format_phone_number(self):
+        """Every value is formatted exactly as format_phone_number does"""
+        phones = ['89991234567', '+79991234567', '9991234567', '+1234567890', '12345678901',
+                  '+441234567890', '+4412345678901', '123', '+', '', None, '8 (999) 123-45-67']
+
+        assert format_phone_series(pd.Series(phones)).tolist() == [format_phone_number(p) for p in phones]
@@ -0,0 +1,125 @@
+"""
+Unit tests for the principal cache behind get_current_user
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import cache
+from app.cache import LocalCache
+from app.core.security import create_access_token, get_current_user
+from app.database import Base
+from app.models import TwoFactorAuth, User
+from app.repositories.principal_cache import principal_cache
+from app.tests.query_counter import QueryCounter
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'redis_client', None)
+    monkeypatch.setattr(cache, 'local_cache', LocalCache(max_bytes=1024 * 1024, ttl=60))
+    engine = create_engine(f"sqlite:///{tmp_path / 'principals.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add(User(username='alice', email='alice@example.com', hashed_password='hash',
+                         full_name='Alice', is_active=True, is_admin=False))
+        session.commit()
+    yield factory
+    engine.dispose()
+
+
+def current_user(db, username='alice'):
+    return asyncio.run(get_current_user(token=create_access_token({'sub': username}), db=db))
+
+
+class TestPrincipalCache:
+    """Tests for repositories.principal_cache"""
+
+    def test_cached_principal_needs_no_query(self, session_factory):
+        with session_factory() as db:
+            current_user(db)
+
+        with session_factory() as db:
+            with QueryCounter(db.get_bind()) as counter:
+                user = current_user(db)
+                assert (user.username, user.email, user.is_active, user.is_admin) == (
+                    'alice', 'alice@example.com', True, False
+                )
+            assert counter.count == 0
+
+            # Columns left out of the cache are loaded on access
+            assert user.hashed_password == 'hash'
+
+    def test_cached_user_is_attached_to_session(self, session_factory):
+        with session_factory() as db:
+            current_user(db)
+
+        with session_factory() as db:
+            user = current_user(db)
+            user.full_name = 'Alice Smith'
+            db.commit()
+
+        with session_factory() as db:
+            assert db.query(User.full_name).scalar() == 'Alice Smith'
+            assert current_user(db).full_name == 'Alice Smith'
+
+    def test_deactivation_invalidates(self, session_factory):
+        with session_factory() as db:
+            assert current_user(db).is_active is True
+
+        with session_factory() as db:
+            db.query(User).filter_by(username='alice').one().is_active = False
+            db.commit()
+
+        with session_factory() as db:
+            assert current_user(db).is_active is False
+
+    def test_bulk_update_invalidates(self, session_factory):
+        with session_factory() as db:
+            current_user(db)
+
+        with session_factory() as db:
+            db.query(User).update({'is_admin': True}, synchronize_session=False)
+            db.commit()
+
+        with session_factory() as db:
+            assert current_user(db).is_admin is True
+
+    def test_refresh_token_bookkeeping_keeps_entry(self, session_factory):
+        with session_factory() as db:
+            current_user(db)
+
+        with session_factory() as db:
+            db.query(User).filter_by(username='alice').one().refresh_token_hash = 'abc'
+            db.commit()
+
+        with session_factory() as db:
+            with QueryCounter(db.get_bind()) as counter:
+                current_user(db)
+            assert counter.count == 0
+
+    def test_two_factor_state(self, session_factory):
+        with session_factory() as db:
+            assert principal_cache.principal(db, 'alice')['two_factor_enabled'] is False
+
+            user_id = db.query(User.id).scalar()
+            db.add(TwoFactorAuth(user_id=user_id, secret='S' * 32, is_enabled=True))
+            db.commit()
+
+            assert principal_cache.principal(db, 'alice')['two_factor_enabled'] is True
+
+    def test_rolled_back_change_keeps_entry(self, session_factory):
+        with session_factory() as db:
+            current_user(db)
+
+        with session_factory() as db:
+            db.query(User).filter_by(username='alice').one().is_admin = True
+            db.flush()
+            db.rollback()
+
+            with QueryCounter(db.get_bind()) as counter:
+                assert current_user(db).is_admin is False
+            assert counter.count == 0
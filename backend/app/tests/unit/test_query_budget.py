@@ -0,0 +1,113 @@
+"""
+Unit tests for the contact loading policy (eager relations, OCR results
+in a side table) and the query-count guard
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Contact, ContactOCRResult, Group, Tag
+from app.repositories.contact_repository import ContactRepository, contact_list_options
+from app.schemas import ContactResponse
+from app.tests.query_counter import QueryCounter, assert_max_queries
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'budget.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    tag, group = Tag(name='vip'), Group(name='partners')
+    session.add_all([Contact(full_name=f'C{i}', tags=[tag], groups=[group]) for i in range(50)])
+    session.commit()
+    session.expire_all()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def serialize(contacts):
+    return [ContactResponse.model_validate(c).model_dump() for c in contacts]
+
+
+class TestContactLoading:
+    """Tests for eager loading of list views"""
+
+    def test_list_page_takes_three_queries(self, db):
+        with assert_max_queries(db.get_bind(), 3):
+            items = serialize(db.query(Contact).options(*contact_list_options()).limit(50).all())
+
+        assert len(items) == 50
+        assert items[0]['tags'][0]['name'] == 'vip'
+        assert items[0]['groups'][0]['name'] == 'partners'
+
+    def test_repository_eager_load(self, db):
+        with assert_max_queries(db.get_bind(), 3):
+            serialize(ContactRepository(db).find_all(limit=50))
+
+    def test_ocr_results_not_loaded_by_lists(self, db):
+        contact = db.query(Contact).first()
+        contact.ocr_raw = '{"blocks": []}'
+        db.commit()
+        db.expire_all()
+
+        with QueryCounter(db.get_bind()) as counter:
+            db.query(Contact).all()
+            db.query(Contact).options(*contact_list_options()).all()
+        assert not any('contact_ocr_results' in statement for statement in counter.statements)
+        assert 'ocr_raw' not in ContactResponse.model_fields
+
+        # Loaded on access (editor endpoints join it up front)
+        assert db.get(Contact, contact.id).ocr_raw == '{"blocks": []}'
+
+    def test_guard_fails_on_lazy_loads(self, db):
+        with pytest.raises(AssertionError):
+            with assert_max_queries(db.get_bind(), 3):
+                serialize(db.query(Contact).limit(50).all())
+
+        with QueryCounter(db.get_bind()) as counter:
+            db.expire_all()
+            serialize(db.query(Contact).limit(50).all())
+        assert counter.count == 1 + 2 * 50
+
+
+class TestContactOCRResult:
+    """Tests for OCR results stored through Contact.ocr_raw"""
+
+    def test_round_trip_compressed(self, db):
+        raw = '{"blocks": [%s]}' % ', '.join(['{"text": "ООО Ромашка", "box": [1, 2, 3, 4]}'] * 100)
+        contact = db.query(Contact).first()
+        contact.ocr_raw = raw
+        db.commit()
+        db.expire_all()
+
+        result = db.get(ContactOCRResult, contact.id)
+        assert result.format_version == ContactOCRResult.FORMAT_ZLIB_JSON
+        assert result.revision == 1
+        assert len(result.payload) < len(raw.encode('utf-8')) / 10
+        assert result.data['blocks'][0]['text'] == 'ООО Ромашка'
+        assert db.get(Contact, contact.id).ocr_raw == raw
+
+    def test_revision_and_removal(self, db):
+        contact = db.query(Contact).first()
+        contact.ocr_raw = '{"blocks": []}'
+        db.commit()
+        contact.ocr_raw = '{"blocks": [{"text": "x"}]}'
+        db.commit()
+        assert db.get(ContactOCRResult, contact.id).revision == 2
+
+        contact.ocr_raw = None
+        db.commit()
+        assert db.query(ContactOCRResult).count() == 0
+
+    def test_deleted_with_contact(self, db):
+        # ON DELETE CASCADE (SQLite enforces foreign keys only when asked)
+        db.execute(text('PRAGMA foreign_keys=ON'))
+        contact = db.query(Contact).first()
+        contact.ocr_raw = '{"blocks": []}'
+        db.commit()
+
+        db.delete(contact)
+        db.commit()
+        assert db.query(ContactOCRResult).count() == 0
@@ -0,0 +1,88 @@
+"""
+Unit tests for the in-memory settings cache and its invalidation on commit
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import cache
+from app.core.utils import get_setting, get_system_setting, set_setting
+from app.database import Base
+from app.models import AppSetting, SystemSettings
+from app.repositories.settings_cache import SettingsCache, settings_cache
+from app.tests.query_counter import QueryCounter
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'redis_client', None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'settings.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        AppSetting(key='ocr_version', value='v2.0'),
+        SystemSettings(key='ocr.confidence_threshold', value='0.7', category='ocr'),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestSettingsCache:
+    """Tests for repositories.settings_cache"""
+
+    def test_reads_served_from_memory(self, db):
+        assert get_setting(db, 'ocr_version') == 'v2.0'
+
+        with QueryCounter(db.get_bind()) as counter:
+            for _ in range(100):
+                assert get_setting(db, 'ocr_version') == 'v2.0'
+                assert get_setting(db, 'missing', 'fallback') == 'fallback'
+                assert get_system_setting(db, 'ocr.confidence_threshold') == '0.7'
+
+        assert counter.count == 0
+
+    def test_commit_invalidates(self, db):
+        assert get_setting(db, 'ocr_version') == 'v2.0'
+
+        set_setting(db, 'ocr_version', 'v1.0')
+
+        assert get_setting(db, 'ocr_version') == 'v1.0'
+
+    def test_bulk_update_invalidates(self, db):
+        assert get_system_setting(db, 'ocr.confidence_threshold') == '0.7'
+
+        db.query(SystemSettings).filter(SystemSettings.key == 'ocr.confidence_threshold').update(
+            {'value': '0.9'}, synchronize_session=False
+        )
+        db.commit()
+
+        assert get_system_setting(db, 'ocr.confidence_threshold') == '0.9'
+
+    def test_uncommitted_changes_not_cached(self, db):
+        db.query(AppSetting).filter(AppSetting.key == 'ocr_version').one().value = 'v3.0'
+        db.flush()
+
+        assert get_setting(db, 'ocr_version') == 'v2.0'
+
+        db.rollback()
+        assert get_setting(db, 'ocr_version') == 'v2.0'
+
+    def test_generation_change_reloads(self, db):
+        local = SettingsCache('settings_test')
+        assert local.get(db, 'ocr_version') == 'v2.0'
+
+        # Another process changed the value and bumped the generation
+        db.execute(AppSetting.__table__.update().values(value='v9.9'))
+        db.commit()
+        assert local.get(db, 'ocr_version') == 'v2.0'
+
+        local.namespace.invalidate()
+        assert local.get(db, 'ocr_version') == 'v9.9'
+
+    def test_app_settings_is_a_copy(self, db):
+        snapshot = settings_cache.app_settings(db)
+        snapshot['ocr_version'] = 'changed'
+
+        assert settings_cache.app_settings(db)['ocr_version'] == 'v2.0'
@@ -0,0 +1,124 @@
+"""
+Unit tests for the statistics overview, contact change events and contact metrics
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import cache
+from app.cache import LocalCache
+from app.database import Base
+from app.models import Contact, Tag
+from app.repositories import contact_events
+from app.repositories.statistics_repository import StatisticsRepository
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'redis_client', None)
+    monkeypatch.setattr(cache, 'local_cache', LocalCache(max_bytes=1024 * 1024, ttl=60))
+    engine = create_engine(f"sqlite:///{tmp_path / 'statistics.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    now = datetime.utcnow()
+    session.add_all([
+        Contact(full_name='A', company='Acme', position='CTO', email='a@acme.com', phone='', created_at=now),
+        Contact(full_name='B', company='Acme', email='b@acme.com', photo_path='b.jpg', created_at=now),
+        Contact(full_name='C', company='Globex', phone='+1 555', created_at=datetime(2001, 1, 1)),
+        Tag(name='vip'),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def changes(monkeypatch):
+    received = []
+    monkeypatch.setattr(contact_events, '_listeners', [received.append])
+    return received
+
+
+class TestStatisticsOverview:
+    """Tests for StatisticsRepository"""
+
+    def test_overview_values(self, db):
+        overview = StatisticsRepository(db).compute_overview()
+
+        assert overview['totals'] == {'contacts': 3, 'tags': 1, 'groups': 0, 'users': 0}
+        assert overview['completeness']['with_email'] == 2
+        assert overview['completeness']['with_phone'] == 1
+        assert overview['completeness']['with_photo'] == 1
+        assert overview['completeness']['email_percentage'] == 66.7
+        assert overview['top_companies'] == [{'name': 'Acme', 'count': 2}, {'name': 'Globex', 'count': 1}]
+        assert overview['top_positions'] == [{'name': 'CTO', 'count': 1}]
+        # Only the last 12 months
+        assert overview['contacts_by_month'] == [{'month': datetime.utcnow().strftime('%Y-%m'), 'count': 2}]
+
+    def test_overview_cached_until_contacts_change(self, db):
+        repo = StatisticsRepository(db)
+        assert repo.overview()['totals']['contacts'] == 3
+
+        db.add(Tag(name='not a contact change'))
+        db.commit()
+        assert repo.overview()['totals']['tags'] == 1
+
+        db.add(Contact(full_name='D'))
+        db.commit()
+        assert repo.overview()['totals'] == {'contacts': 4, 'tags': 2, 'groups': 0, 'users': 0}
+
+
+class TestContactEvents:
+    """Tests for contact change notifications"""
+
+    def test_notified_once_per_commit(self, db, changes):
+        contact = db.query(Contact).filter(Contact.full_name == 'A').one()
+        contact.company = 'Initech'
+        db.flush()
+        db.add(Contact(full_name='E'))
+        db.commit()
+
+        assert changes == [{'inserted': 1, 'updated': 1, 'deleted': 0, 'bulk': False}]
+
+    def test_bulk_and_delete(self, db, changes):
+        db.query(Contact).filter(Contact.company == 'Acme').update({'company': 'ACME'})
+        db.delete(db.query(Contact).filter(Contact.full_name == 'C').one())
+        db.commit()
+
+        assert changes == [{'inserted': 0, 'updated': 2, 'deleted': 1, 'bulk': True}]
+
+    def test_rollback_and_unrelated_commits_not_notified(self, db, changes):
+        db.add(Contact(full_name='F'))
+        db.flush()
+        db.rollback()
+        db.add(Tag(name='other'))
+        db.commit()
+
+        assert changes == []
+
+
+class TestContactMetrics:
+    """Tests for the incrementally maintained contact metrics"""
+
+    def test_gauge_follows_commits_and_reconciles(self, db):
+        from app.core.metrics import contacts_total, contacts_deleted_counter
+        from app.repositories.contact_metrics import reconcile_contact_metrics
+
+        assert reconcile_contact_metrics(db) == 3
+        deleted_before = contacts_deleted_counter._value.get()
+
+        db.add_all([Contact(full_name='G'), Contact(full_name='H')])
+        db.commit()
+        assert contacts_total._value.get() == 5
+
+        db.query(Contact).filter(Contact.full_name.in_(['A', 'G'])).delete(synchronize_session=False)
+        db.commit()
+        assert contacts_total._value.get() == 3
+        assert contacts_deleted_counter._value.get() == deleted_before + 2
+
+        contacts_total.set(0)
+        assert reconcile_contact_metrics(db) == 3
+        assert contacts_total._value.get() == 3
@@ -0,0 +1,55 @@
+"""
+Unit tests for task blobs (claim check for Celery image payloads)
+"""
+import os
+import time
+
+import pytest
+
+from app.core import task_blobs
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'TASK_BLOB_DIR', str(tmp_path / 'blobs'))
+    return tmp_path / 'blobs'
+
+
+class TestTaskBlobs:
+    """Tests for the content-addressed task blob store"""
+
+    def test_put_is_content_addressed(self):
+        key = task_blobs.put_blob(b'image bytes')
+
+        assert len(key) == 64
+        assert task_blobs.put_blob(b'image bytes') == key
+        assert task_blobs.put_blob(b'other bytes') != key
+        with open(task_blobs.blob_path(key), 'rb') as f:
+            assert f.read() == b'image bytes'
+
+    def test_invalid_keys_rejected(self):
+        for key in ('', '../etc/passwd', 'A' * 64, 'ab' * 31):
+            with pytest.raises(ValueError):
+                task_blobs.blob_path(key)
+
+    def test_expired_blobs_removed(self):
+        old = task_blobs.put_blob(b'old')
+        fresh = task_blobs.put_blob(b'fresh')
+        past = time.time() - 7200
+        os.utime(task_blobs.blob_path(old), (past, past))
+
+        assert task_blobs.delete_expired_blobs(max_age=3600) == 1
+        assert not os.path.exists(task_blobs.blob_path(old))
+        assert os.path.exists(task_blobs.blob_path(fresh))
+
+    def test_reupload_refreshes_age(self):
+        key = task_blobs.put_blob(b'card')
+        past = time.time() - 7200
+        os.utime(task_blobs.blob_path(key), (past, past))
+
+        task_blobs.put_blob(b'card')
+        assert task_blobs.delete_expired_blobs(max_age=3600) == 0
+
+    def test_missing_directory(self):
+        assert task_blobs.delete_expired_blobs() == 0
@@ -0,0 +1,9 @@
+-- Migration: Duplicate lookup indexes for contacts
+-- Description: Index-backed uid/email/phone lookups for bulk import and duplicate detection
+-- (also created automatically on startup by init_db_with_retry in backend/app/main.py)
+
+CREATE INDEX IF NOT EXISTS ix_contacts_phone ON contacts (phone);
+CREATE INDEX IF NOT EXISTS ix_contacts_phone_mobile ON contacts (phone_mobile);
+CREATE INDEX IF NOT EXISTS ix_contacts_phone_work ON contacts (phone_work);
+CREATE INDEX IF NOT EXISTS ix_contacts_phone_additional ON contacts (phone_additional);
+CREATE INDEX IF NOT EXISTS ix_contacts_email_lower ON contacts (lower(email));
@@ -0,0 +1,18 @@
+-- Migration: Trigram search index for contacts
+-- Description: Index-backed substring search for /contacts/search and the list q filter
+-- (also created automatically on startup by repositories/contact_search.py)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- One GIN trigram index over all searchable fields; the expression must match
+-- SEARCH_DOCUMENT_SQL in backend/app/repositories/contact_search.py exactly
+CREATE INDEX IF NOT EXISTS ix_contacts_search_trgm ON contacts
+USING gin ((lower(
+    coalesce(contacts.full_name, '') || chr(31) ||
+    coalesce(contacts.company, '') || chr(31) ||
+    coalesce(contacts.position, '') || chr(31) ||
+    coalesce(contacts.email, '') || chr(31) ||
+    coalesce(contacts.phone, '') || chr(31) ||
+    coalesce(contacts.website, '') || chr(31) ||
+    coalesce(contacts.address, '')
+)) gin_trgm_ops);
@@ -0,0 +1,19 @@
+-- Migration: Move OCR results out of contacts.ocr_raw
+-- Description: OCR blocks/raw text are stored zlib-compressed in contact_ocr_results,
+-- so list and search scans of contacts no longer drag the JSON documents along.
+-- (table and payload storage are also set up by init_db_with_retry in backend/app/main.py;
+-- rows are moved once after deploying with: python -m app.migrate_ocr_results)
+
+CREATE TABLE IF NOT EXISTS contact_ocr_results (
+    contact_id INTEGER PRIMARY KEY REFERENCES contacts (id) ON DELETE CASCADE,
+    format_version INTEGER NOT NULL DEFAULT 1,
+    revision INTEGER NOT NULL DEFAULT 1,
+    payload BYTEA NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- Payloads are already compressed: store out of line without TOAST compression
+ALTER TABLE contact_ocr_results ALTER COLUMN payload SET STORAGE EXTERNAL;
+
+-- After app.migrate_ocr_results has moved every row (no contacts.ocr_raw left):
+-- ALTER TABLE contacts DROP COLUMN ocr_raw;
@@ -46,6 +46,15 @@ const MonitoringDashboard = ({ lang = 'ru' }) => {
       scheduledTasks: 'Scheduled',
       totalPending: 'Total Pending',
       workers: 'Workers',
+      queueName: 'Queue',
+      queueDepth: 'Waiting',
+      queueWait: 'Oldest wait',
+      queueNames: {
+        interactive: 'Single cards',
+        bulk: 'Batches & imports',
+        training: 'Training',
+        maintenance: 'Maintenance'
+      },
       
       // OCR Stats
       totalScans: 'Total Scans',
@@ -89,6 +98,15 @@ const MonitoringDashboard = ({ lang = 'ru' }) => {
       scheduledTasks: 'Запланированные',
       totalPending: 'Всего в очереди',
       workers: 'Воркеры',
+      queueName: 'Очередь',
+      queueDepth: 'Ожидают',
+      queueWait: 'Ждёт дольше всех',
+      queueNames: {
+        interactive: 'Одиночные визитки',
+        bulk: 'Пакеты и импорт',
+        training: 'Обучение',
+        maintenance: 'Обслуживание'
+      },
       
       // OCR Stats
       totalScans: 'Всего сканов',
@@ -165,6 +183,13 @@ const MonitoringDashboard = ({ lang = 'ru' }) => {
     }
   };
 
+  const formatWait = (seconds) => {
+    if (!seconds) return '—';
+    if (seconds < 60) return `${Math.round(seconds)}s`;
+    if (seconds < 3600) return `${Math.floor(seconds / 60)}m ${Math.round(seconds % 60)}s`;
+    return `${Math.floor(seconds / 3600)}h ${Math.floor((seconds % 3600) / 60)}m`;
+  };
+
   const formatTime = (dateString) => {
     if (!dateString) return 'N/A';
     const date = new Date(dateString);
@@ -359,6 +384,29 @@ const MonitoringDashboard = ({ lang = 'ru' }) => {
               </div>
             </div>
           </div>
+          
+          {data.queue?.queues?.length > 0 && (
+            <table style={{ width: '100%', marginTop: '15px', fontSize: '13px', borderCollapse: 'collapse' }}>
+              <thead>
+                <tr style={{ color: '#666', textAlign: 'left' }}>
+                  <th style={{ padding: '6px 0' }}>{t.queueName}</th>
+                  <th style={{ padding: '6px 0', textAlign: 'right' }}>{t.queueDepth}</th>
+                  <th style={{ padding: '6px 0', textAlign: 'right' }}>{t.queueWait}</th>
+                </tr>
+              </thead>
+              <tbody>
+                {data.queue.queues.map((queue) => (
+                  <tr key={queue.name} style={{ borderTop: '1px solid #eee' }}>
+                    <td style={{ padding: '6px 0' }}>{t.queueNames[queue.name] || queue.name}</td>
+                    <td style={{ padding: '6px 0', textAlign: 'right', fontWeight: 'bold' }}>{queue.depth}</td>
+                    <td style={{ padding: '6px 0', textAlign: 'right', color: queue.wait_seconds > 60 ? '#f57c00' : '#333' }}>
+                      {formatWait(queue.wait_seconds)}
+                    </td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          )}
         </motion.div>
 
         {/* OCR Stats */}
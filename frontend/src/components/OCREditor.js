@@ -105,6 +105,17 @@ const OCREditor = ({ contact, onSave, onClose }) => {
   }, [contact]);
 
   const [showRawOCR, setShowRawOCR] = useState(false);
+  const [ocrRaw, setOcrRaw] = useState(contact.ocr_raw);
+
+  // List responses do not include ocr_raw: fetch it when the raw text is first shown
+  useEffect(() => {
+    if (!showRawOCR || ocrRaw !== undefined) return;
+    const token = localStorage.getItem('access_token') || localStorage.getItem('token');
+    fetch(`/api/contacts/${contact.id}`, { headers: { Authorization: `Bearer ${token}` } })
+      .then(res => (res.ok ? res.json() : {}))
+      .then(data => setOcrRaw(data.ocr_raw || null))
+      .catch(() => setOcrRaw(null));
+  }, [showRawOCR, ocrRaw, contact.id]);
 
   const handleFieldChange = (field, value) => {
     setEditedData(prev => ({
@@ -148,13 +159,14 @@ const OCREditor = ({ contact, onSave, onClose }) => {
 
   // Parse OCR raw data for display
   const getRawOCRText = () => {
-    if (!contact.ocr_raw) return 'No OCR data available';
+    if (ocrRaw === undefined) return '...';
+    if (!ocrRaw) return 'No OCR data available';
     
     try {
-      const parsed = JSON.parse(contact.ocr_raw);
+      const parsed = JSON.parse(ocrRaw);
       return parsed.raw_text || parsed.raw_data || JSON.stringify(parsed, null, 2);
     } catch (e) {
-      return contact.ocr_raw;
+      return ocrRaw;
     }
   };
 